@@ -3,6 +3,7 @@ Django settings for furnitureshop project.
 """
 from pathlib import Path
 from datetime import timedelta  # საჭიროა JWT-ისა და Celery-ისთვის
+import importlib.util
 import os  # საჭიროა EMAIL_HOST_USER/PASSWORD-ის განსაზღვრისთვის, თუმცა BASE_DIR-ის Path-ით არ გამოიყენება
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,11 +43,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # view-ების დრო/SQL/ზომის მეტრიკები, Server-Timing (store.profiling) - პირველი, რომ მთელი ჯაჭვი ზომოს
+    'store.profiling.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # ჩაწერის შემდეგ მოთხოვნის დარჩენილი წაკითხვები primary-ზე (store.routers)
+    'store.routers.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -76,9 +81,82 @@ WSGI_APPLICATION = 'furnitureshop.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # DB_PATH - სხვა ფაილი (მაგ. bench_asgi-ის სერვერები დროებით ბაზაზე)
+        'NAME': os.environ.get('DB_PATH', BASE_DIR / 'db.sqlite3'),
+        # კავშირი მოთხოვნებს შორის რჩება (PRAGMA-ები და page cache ხელახლა არ იწყობა)
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # atomic() -> BEGIN IMMEDIATE: ჩაწერის lock-ი ტრანზაქციის დასაწყისშივე (busy_timeout-ით
+            # ელოდება), ნაცვლად deferred read->write upgrade-ისა, რომელიც მაშინვე "database is locked"-ს აგდებს
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
+# Read replica-ები: DB_REPLICA_PATHS="/srv/replica1.sqlite3,/srv/replica2.sqlite3" (მაგ. Litestream-ის ასლები).
+# კატალოგის წაკითხვა round-robin-ით მიდის replica-ებზე (store.routers.ReplicaRouter), Cart/Order - primary-ზე.
+STORE_READ_REPLICAS = []
+for _number, _path in enumerate(filter(None, os.environ.get('DB_REPLICA_PATHS', '').split(',')), start=1):
+    DATABASES[f'replica{_number}'] = {**DATABASES['default'], 'NAME': _path.strip(), 'TEST': {'MIRROR': 'default'}}
+    STORE_READ_REPLICAS.append(f'replica{_number}')
+DATABASE_ROUTERS = ['store.routers.ReplicaRouter']
+STORE_REPLICA_HEALTH_TTL = 30  # წამი
+# კატალოგის ჩაწერიდან ამდენი წამი კითხვა primary-ზეა (replica-ს მაქსიმალური ჩამორჩენა); 0 - გამორთულია
+STORE_REPLICA_MAX_LAG = float(os.environ.get('STORE_REPLICA_MAX_LAG', 5))
+
+# connection_created hook (store.database.apply_sqlite_pragmas) - PRAGMA-ები store.database.DEFAULT_PRAGMAS-შია,
+# SQLITE_PRAGMAS-ით მთლიანად გადაიფარება. ყველა ფაილური ბაზა (ნაგულისხმევი db.sqlite3-იც) WAL-ზე გადადის;
+# journal_mode ფაილის header-ში იწერება, ამიტომ ვისაც git-ში შენახული სადემო ბაზის ხელუხლებლად დატოვება
+# სურს, ჩართავს: SQLITE_KEEP_JOURNAL_MODE="/path/to/db.sqlite3" (მძიმით გამოყოფილი სია).
+SQLITE_KEEP_JOURNAL_MODE = [path.strip() for path in os.environ.get('SQLITE_KEEP_JOURNAL_MODE', '').split(',')
+                            if path.strip()]
+
+# Cache
+# ნაგულისხმევად local-memory; REDIS_CACHE_URL-ის მითითებისას - Redis (საჭიროა redis პაკეტი),
+# FILE_CACHE_DIR-ის მითითებისას - ფაილური ქეში (რამდენიმე worker-ს შორის საერთო)
+
+if os.environ.get('REDIS_CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_CACHE_URL'],
+        }
+    }
+elif os.environ.get('FILE_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['FILE_CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'furnitureshop',
+        }
+    }
+
+# კატალოგის read-through ქეში (store.cache) - ინვალიდაცია ვერსიების მრიცხველებით
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', 300))  # წამი; 0 - ქეში გამორთულია
+
+# პაროლის ჰეშირება: Argon2 (argon2-cffi დაყენებისას) ან scrypt; ძველი PBKDF2 ჰეშები შესვლისას
+# ავტომატურად გადაიჰეშება პირველ hasher-ზე (users.hashing.authenticate_credentials)
+PASSWORD_HASHERS = [
+    'users.hashers.TunableScryptPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+if importlib.util.find_spec('argon2') is not None:
+    PASSWORD_HASHERS.insert(0, 'django.contrib.auth.hashers.Argon2PasswordHasher')
+PASSWORD_SCRYPT_WORK_FACTOR = 2 ** 15  # ~150ms, 32 MiB (ერთ ბირთვზე)
+PASSWORD_SCRYPT_PARALLELISM = 1
+# ჰეშირება შეზღუდულ ნაკადების pool-ში: ერთდროულად მაქსიმუმ WORKERS, რიგში QUEUE, დანარჩენი - 503
+PASSWORD_HASH_WORKERS = 2
+PASSWORD_HASH_QUEUE = 8
+PASSWORD_HASH_TIMEOUT = 5  # წამი
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -122,6 +200,12 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'  # დამატებულია depl
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# სურათების ვარიანტები (store.images): სიგანეები, ფორმატები და ფონური worker-ების რაოდენობა
+# ფორმატები, რომლებსაც Pillow ვერ აკოდირებს (მაგ. AVIF ძველ ვერსიაში), გამოტოვდება
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+IMAGE_VARIANT_FORMATS = ('avif', 'webp', 'jpeg')
+IMAGE_VARIANT_WORKERS = 2
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -133,16 +217,43 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST FRAMEWORK Configuration
 REST_FRAMEWORK = {
+    # request.user - ტოკენის claim-ებიდან (users.authentication.ClaimsTokenUser), SELECT-ის გარეშე
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
-    )
+    ),
+    # login/რეგისტრაციის მცდელობები (users.throttles) - მრიცხველები default ქეშში
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '20/min',
+        'login_username': '5/min',
+        'register_ip': '10/hour',
+    },
+    # JSONRenderer-ის იდენტური გამოსავალი orjson-ით (თუ დაყენებულია)
+    'DEFAULT_RENDERER_CLASSES': (
+        'store.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
+# მოთხოვნების პროფილირება (store.profiling): ყველა მოთხოვნის დრო და ზომა, SAMPLE_RATE წილის - SQL,
+# serialize/render დრო, ნელი query-ების EXPLAIN და N+1. მეტრიკები - /api/metrics/ (Prometheus)
+STORE_PERF_ENABLED = True
+STORE_PERF_SAMPLE_RATE = float(os.environ.get('STORE_PERF_SAMPLE_RATE', 0.01))
+STORE_PERF_SLOW_QUERY_MS = 100
+STORE_PERF_DUPLICATE_THRESHOLD = 5  # ერთი და იგივე SQL ერთ მოთხოვნაში
+STORE_PERF_SERVER_TIMING = True
+# /api/metrics/ - Authorization: Bearer <token>; ტოკენის გარეშე მხოლოდ DEBUG-ში პასუხობს
+STORE_METRICS_TOKEN = os.environ.get('STORE_METRICS_TOKEN', '')
+
+# /api/products/ და /api/orders/ სიები values()-ით, ModelSerializer-ის გარეშე (store.fastpath)
+STORE_FAST_SERIALIZERS = True
+
+# /api/products/?facets=1 - ფასის facet-ის ზღვრები (₾)
+STORE_FACET_PRICE_BUCKETS = [100, 250, 500, 1000]
 
 # JWT Configuration
 SIMPLE_JWT = {
@@ -153,7 +264,10 @@ SIMPLE_JWT = {
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+    'TOKEN_USER_CLASS': 'users.authentication.ClaimsTokenUser',
 }
+# სრული პროფილი (email, phone, ...) - მხოლოდ საჭიროებისას, მოკლევადიანი ქეშით
+USER_PROFILE_CACHE_TIMEOUT = 60
 
 # Email Configuration (Celery-ის Email-ის ფუნქციონალისთვის)
 # კონსოლის ბექენდი გამოიყენება ტესტირებისთვის - იხილეთ ლოგებში
@@ -181,7 +295,27 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'store.tasks.auto_update_order_status',
         'schedule': timedelta(days=1),  # ყოველ 24 საათში
     },
+    # outbox-ის სათადარიგო დამუშავება (ჩვეულებრივ checkout-ის commit-ისთანავე ეშვება)
+    'drain-outbox': {
+        'task': 'store.tasks.drain_outbox',
+        'schedule': timedelta(seconds=30),
+    },
+    # კალათების ვადაგასული მარაგის ჯავშნები (store.reservations)
+    'release-expired-stock-holds': {
+        'task': 'store.tasks.release_expired_holds',
+        'schedule': timedelta(minutes=1),
+    },
 }
+# ლოკალური Task Queue (store.taskqueue) - Redis/Celery-ის გარეშეც მუშაობს:
+#   python manage.py run_scheduled_tasks  - CELERY_BEAT_SCHEDULE-ის ამოცანები
+STORE_TASKS_EAGER = False  # True - task.delay() მაშინვე სრულდება (ტესტები)
+STORE_TASK_WORKERS = 4
+ORDER_STATUS_BATCH_SIZE = 500
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+STOCK_HOLD_SECONDS = 15 * 60  # კალათის ჯავშნის TTL ბოლო ცვლილებიდან
+STOCK_HOLD_SWEEP_BATCH_SIZE = 1000
+
 # furnitureshop_project/settings.py
 
 # ... (დაამატეთ ფაილის ბოლოში)
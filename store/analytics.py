@@ -0,0 +1,171 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Max, Min, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Order, OrderItem, SalesRollup
+
+try:
+    import pandas as pd
+except ImportError:  # pandas არასავალდებულოა - მის გარეშე აგრეგაცია SQL-შია
+    pd = None
+
+# გაყიდვად ითვლება ყველა სტატუსი გაუქმებულის გარდა; status IN (...) + created_at დიაპაზონი
+# Order-ის (status, created_at) ინდექსს იყენებს
+SALE_STATUSES = [value for value, _ in Order.STATUS_CHOICES if value != 'CANCELED']
+INTERVALS = {'day': None, 'week': TruncWeek, 'month': TruncMonth}
+
+
+def _money():
+    return DecimalField(max_digits=14, decimal_places=2)
+
+
+def _day_start(day):
+    """ დღის დასაწყისი TIME_ZONE-ში (aware) - created_at-ის დიაპაზონი ინდექსით იფილტრება """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+# ----------------------------------------------------
+# 1. Bucket-ების აგრეგაცია OrderItem-იდან
+# ----------------------------------------------------
+
+def sold_items(start, end):
+    """ [start, end) დღეების გაყიდული ნივთები (გაუქმებული შეკვეთების გარეშე) """
+    return OrderItem.objects.filter(order__status__in=SALE_STATUSES, order__created_at__gte=_day_start(start),
+                                    order__created_at__lt=_day_start(end))
+
+
+def aggregate_items(items):
+    """ GROUP BY (დღე, პროდუქტი) - ერთი query; კატეგორია პროდუქტის მიმდინარე კატეგორიაა """
+    return (items.order_by()
+            .values(day=TruncDate('order__created_at'), product_ref=F('product_id'),
+                    category_ref=F('product__category_id'))
+            .annotate(sold=Sum('quantity'), order_total=Count('order', distinct=True),
+                      income=Sum(ExpressionWrapper(F('price') * F('quantity'), output_field=_money()))))
+
+
+def _rollup(row):
+    return SalesRollup(date=row['day'], product_id=row['product_ref'], category_id=row['category_ref'],
+                       quantity=row['sold'], revenue=row['income'], order_count=row['order_total'])
+
+
+def aggregate_frame(items):
+    """
+    იგივე bucket-ები pandas-ით: ნივთები ერთი query-ით, დაჯგუფება ვექტორულად (დიდი rebuild-ისთვის
+    GROUP BY-ს SQLite-ის ერთ ნაკადს აღარ ტვირთავს). შემოსავალი თეთრებში (int64) - float-ის ცდომილების გარეშე.
+    """
+    rows = list(items.values_list('order__created_at', 'order_id', 'product_id', 'product__category_id',
+                                  'quantity', 'price'))
+    if not rows:
+        return []
+    frame = pd.DataFrame(rows, columns=['created_at', 'order', 'product', 'category', 'quantity', 'price'])
+    frame['day'] = pd.to_datetime(frame['created_at'], utc=True).dt.tz_convert(
+        timezone.get_current_timezone_name()).dt.date
+    frame['cents'] = frame['price'].map(lambda price: int(price * 100)) * frame['quantity']
+    grouped = (frame.groupby(['day', 'product', 'category'], sort=False)
+               .agg(quantity=('quantity', 'sum'), cents=('cents', 'sum'), orders=('order', 'nunique'))
+               .reset_index())
+    return [SalesRollup(date=row.day, product_id=int(row.product), category_id=int(row.category),
+                        quantity=int(row.quantity), revenue=Decimal(int(row.cents)) / 100,
+                        order_count=int(row.orders))
+            for row in grouped.itertuples(index=False)]
+
+
+# ----------------------------------------------------
+# 2. ინკრემენტული განახლება (outbox handler) და სრული rebuild
+# ----------------------------------------------------
+
+def refresh_rollups(order_ids):
+    """
+    შეკვეთების (დღე, პროდუქტი) bucket-ების ზუსტი გადათვლა - არა += დელტა: outbox-ის
+    at-least-once მიწოდებისას განმეორებული მოვლენა შედეგს არ ცვლის. თითო დღეზე:
+    აგრეგაცია (მხოლოდ შეხებული პროდუქტები), upsert და დაცარიელებული bucket-ების წაშლა.
+    """
+    touched = {}
+    pairs = (OrderItem.objects.filter(order_id__in=order_ids).order_by()
+             .values_list(TruncDate('order__created_at'), 'product_id').distinct())
+    for day, product_id in pairs:
+        touched.setdefault(day, set()).add(product_id)
+
+    refreshed = 0
+    for day, product_ids in touched.items():
+        rows = [_rollup(row) for row in aggregate_items(
+            sold_items(day, day + timedelta(days=1)).filter(product_id__in=product_ids))]
+        with transaction.atomic():
+            SalesRollup.objects.bulk_create(rows, update_conflicts=True, unique_fields=['date', 'product'],
+                                            update_fields=['category', 'quantity', 'revenue', 'order_count'])
+            SalesRollup.objects.filter(date=day, product_id__in=product_ids).exclude(
+                product_id__in=[row.product_id for row in rows]).delete()
+        refreshed += len(rows)
+    return refreshed
+
+
+def rebuild_rollups(start=None, end=None, chunk_days=31, engine='sql', batch_size=5000):
+    """
+    [start, end] დღეების სრული აღდგენა chunk_days-იანი ნაწილებით: თითო chunk ერთ ტრანზაქციაში
+    (DELETE + bulk INSERT), ამიტომ კითხვები ნახევრად აგებულ დღეს ვერ ხედავენ.
+    engine='pandas' - დაჯგუფება aggregate_frame()-ით. აბრუნებს ჩაწერილი bucket-ების რაოდენობას.
+    """
+    if engine == 'pandas' and pd is None:
+        raise RuntimeError('pandas is not installed (pip install pandas)')
+    if start is None or end is None:
+        bounds = Order.objects.filter(status__in=SALE_STATUSES).aggregate(first=Min('created_at'),
+                                                                          last=Max('created_at'))
+        if bounds['first'] is None and start is None and end is None:
+            SalesRollup.objects.all().delete()
+            return 0
+        today = timezone.localdate()
+        start = start or (timezone.localdate(bounds['first']) if bounds['first'] else today)
+        end = end or (timezone.localdate(bounds['last']) if bounds['last'] else today)
+
+    written = 0
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days), end + timedelta(days=1))
+        items = sold_items(chunk_start, chunk_end)
+        rows = aggregate_frame(items) if engine == 'pandas' else [_rollup(row) for row in aggregate_items(items)]
+        with transaction.atomic():
+            SalesRollup.objects.filter(date__gte=chunk_start, date__lt=chunk_end).delete()
+            SalesRollup.objects.bulk_create(rows, batch_size=batch_size)
+        written += len(rows)
+        chunk_start = chunk_end
+    return written
+
+
+# ----------------------------------------------------
+# 3. ანგარიშები (მხოლოდ SalesRollup-იდან)
+# ----------------------------------------------------
+
+def _period(start, end):
+    return SalesRollup.objects.filter(date__gte=start, date__lte=end).order_by()
+
+
+def top_products(start, end, limit=10, metric='revenue'):
+    """ top-N პროდუქტი [start, end] პერიოდში - revenue ან quantity მიხედვით """
+    return list(_period(start, end).values('product_id', name=F('product__name'))
+                .annotate(quantity=Sum('quantity'), revenue=Sum('revenue'), orders=Sum('order_count'))
+                .order_by(f'-{metric}', 'product_id')[:limit])
+
+
+def revenue_by_category(start, end):
+    # order_count პროდუქტის bucket-შია - კატეგორიაზე ჯამი ერთ შეკვეთას რამდენჯერმე დაითვლიდა
+    return list(_period(start, end).values('category_id', name=F('category__name'))
+                .annotate(quantity=Sum('quantity'), revenue=Sum('revenue'))
+                .order_by('-revenue', 'category_id'))
+
+
+def sales_timeseries(start, end, interval='day', product=None, category=None):
+    """ შემოსავალი/რაოდენობა დღეების, კვირების (ორშაბათიდან) ან თვეების მიხედვით """
+    rows = _period(start, end)
+    if product is not None:
+        rows = rows.filter(product_id=product)
+    if category is not None:
+        rows = rows.filter(category_id=category)
+    trunc = INTERVALS[interval]
+    period = trunc('date') if trunc else F('date')
+    return list(rows.values(period=period)
+                .annotate(quantity=Sum('quantity'), revenue=Sum('revenue'))
+                .order_by('period'))
@@ -0,0 +1,24 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+def _ensure_fts(sender, using, **kwargs):
+    from django.db import connections
+    from .search import install_fts
+
+    install_fts(connections[using])
+
+
+class StoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'store'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - receiver-ების რეგისტრაცია
+        from . import handlers  # noqa: F401 - outbox handler-ების რეგისტრაცია
+
+        from .database import apply_sqlite_pragmas
+
+        post_migrate.connect(_ensure_fts, sender=self)
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='store.apply_sqlite_pragmas')
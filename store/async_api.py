@@ -0,0 +1,64 @@
+from contextlib import nullcontext
+
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .renderers import FastJSONRenderer
+from .routers import replica_reads
+
+
+# ----------------------------------------------------
+# 1. Async (ASGI) API View
+# ----------------------------------------------------
+
+class AsyncAPIView(View):
+    """
+    DRF-ის APIView სინქრონულია - ASGI-ზე ყოველი მოთხოვნა sync_to_async-ით ნაკადში გადადის.
+    ეს არის Django-ს async View: DRF Request მხოლოდ query_params-ისა და ავთენტიკაციისთვის,
+    პასუხი - FastJSONRenderer-ით (იგივე ბაიტები, რაც სინქრონულ endpoint-ს). ქვეკლასის
+    get() ORM-ს async API-ით (aget, afirst, aaggregate, async for) კითხულობს.
+
+    ავთენტიკატორები ბაზას არ უნდა მიმართავდნენ (JWTStatelessUserAuthentication - claim-ებიდან),
+    წინააღმდეგ შემთხვევაში event loop-ში SynchronousOnlyOperation ამოვარდება.
+    """
+    http_method_names = ['get', 'head', 'options']
+    authentication_classes = ()
+    requires_authentication = False
+    # კატალოგის მოდელები replica-დან (იხ. store.routers.ReplicaReadMixin)
+    use_replica_reads = True
+    renderer = FastJSONRenderer()
+
+    async def dispatch(self, request, *args, **kwargs):
+        authenticators = [auth() for auth in self.authentication_classes]
+        self.request = Request(request, authenticators=authenticators)
+        try:
+            if self.requires_authentication and not self.request.user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+            with replica_reads() if self.use_replica_reads else nullcontext():
+                return await super().dispatch(self.request, *args, **kwargs)
+        except Http404 as exc:
+            return self.handle_exception(exceptions.NotFound(*exc.args), authenticators)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc, authenticators)
+
+    def handle_exception(self, exc, authenticators):
+        """ rest_framework.views.exception_handler-ის ფორმატი """
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(data, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)) and authenticators:
+            response['WWW-Authenticate'] = authenticators[0].authenticate_header(self.request)
+            response.status_code = status.HTTP_401_UNAUTHORIZED
+        return response
+
+    def render(self, data, status=status.HTTP_200_OK):
+        return HttpResponse(self.renderer.render(data), status=status, content_type='application/json')
+
+
+class AsyncAuthenticatedAPIView(AsyncAPIView):
+    """ მომხმარებლის მონაცემები (კალათა) - ყოველთვის primary-დან, ავტორიზაციით """
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    requires_authentication = True
+    use_replica_reads = False
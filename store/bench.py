@@ -0,0 +1,89 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import connection
+
+from .models import Category, Product
+
+
+# ----------------------------------------------------
+# 1. Benchmark-ის დამხმარე ფუნქციები
+# ----------------------------------------------------
+
+GEORGIAN_WORDS = [
+    'სავარძელი', 'დივანი', 'მაგიდა', 'სკამი', 'კარადა', 'საწოლი', 'თარო', 'კომოდი',
+    'ხის', 'რბილი', 'ტყავის', 'თეთრი', 'შავი', 'მუხის', 'კაკლის', 'ლითონის', 'სამზარეულოს',
+    'საძინებლის', 'მისაღების', 'ოფისის', 'კლასიკური', 'თანამედროვე', 'კუთხის', 'გასაშლელი',
+]
+
+
+@contextmanager
+def scratch_database(verbosity=0, path=None):
+    """
+    Benchmark ეშვება დროებით (ტესტის) ბაზაზე - db.sqlite3 არ ბინძურდება.
+    მიგრაციები სრულად სრულდება, ასე რომ ინდექსები და FTS ცხრილი რეალურია.
+    path - ფაილური ბაზა (მრავალნაკადიანი ტესტებისთვის; in-memory ბაზა ნაკადებს შორის იკეტება).
+    """
+    old_name = connection.settings_dict['NAME']
+    if path is not None:
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = str(path)
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+
+
+def seed_catalog(products, categories=20, batch_size=5000, seed=0):
+    """ N პროდუქტის ჩასმა bulk_create-ით შემთხვევითი ქართული სახელებით """
+    rng = random.Random(seed)
+    cats = Category.objects.bulk_create(
+        Category(name=f'კატეგორია {i}', slug=f'category-{i}') for i in range(categories)
+    )
+    for start in range(0, products, batch_size):
+        Product.objects.bulk_create([
+            Product(
+                category=cats[i % categories],
+                name=' '.join(rng.sample(GEORGIAN_WORDS, 3)),
+                description=' '.join(rng.choices(GEORGIAN_WORDS, k=40)),
+                price=Decimal(rng.randint(1000, 500000)) / 100,
+                stock=rng.randint(0, 50),
+                slug=f'product-{i}',
+                color=rng.choice(['red', 'blue', 'white', 'black']),
+                material=rng.choice(['wood', 'metal', 'leather']),
+            )
+            for i in range(start, min(start + batch_size, products))
+        ], batch_size=batch_size)
+    return cats
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples):
+    """ წამებში გაზომილი ნიმუშები -> ms სტატისტიკა """
+    return {
+        'runs': len(samples),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3),
+        'p50_ms': round(percentile(samples, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 3),
+        'ops_per_sec': round(len(samples) / sum(samples), 1) if sum(samples) else None,
+    }
+
+
+def measure(fn, repeat=50, warmup=3):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
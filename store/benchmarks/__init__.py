@@ -0,0 +1,10 @@
+"""
+განმეორებადი benchmark-ების ნაკრები (ბრძანება: run_benchmarks).
+
+fixtures  - კატეგორიები, პროდუქტები, სურათები, მომხმარებლები, კალათები, შეკვეთები (bulk insert)
+scenarios - browse, search, add_to_cart, checkout, order_history
+transport - in-process WSGI (django.test.Client) ან ლოკალური HTTP სერვერი
+runner    - throughput, p50/p95/p99, query-ები მოთხოვნაზე; JSON რეპორტი და ორი რეპორტის შედარება
+
+დაბალი დონის დამხმარეები (scratch_database, seed_catalog, summarize) - store.bench.
+"""
@@ -0,0 +1,88 @@
+import random
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from ..analytics import rebuild_rollups
+from ..bench import GEORGIAN_WORDS, seed_catalog
+from ..cache import bump_catalog
+from ..listing import rebuild_listings
+from ..models import Cart, CartItem, Order, OrderItem, Product, ProductImage
+from ..order_stats import rebuild_order_stats
+
+# ზომები --scale-ისთვის
+SCALES = {
+    'small': {'categories': 5, 'products': 500, 'users': 20, 'orders_per_user': 3},
+    'medium': {'categories': 20, 'products': 5000, 'users': 200, 'orders_per_user': 10},
+    'large': {'categories': 50, 'products': 50000, 'users': 2000, 'orders_per_user': 20},
+}
+# checkout-ის სცენარი მარაგს არ უნდა ამოწურავდეს
+BENCH_STOCK = 1_000_000
+
+
+# ----------------------------------------------------
+# 1. Fixture-ების გენერატორი (bulk insert-ები)
+# ----------------------------------------------------
+
+def generate_fixtures(categories=5, products=500, images_per_product=2, users=20, cart_items=3,
+                      orders_per_user=3, items_per_order=3, seed=0, batch_size=5000):
+    """
+    დეტერმინისტული (seed) მონაცემები benchmark-ისთვის. ყოველი მოდელი - bulk_create-ით batch-ებად;
+    სიგნალები არ ეშვება, ამიტომ ProductListing, UserOrderStats და SalesRollup ბოლოს ერთიანად აიგება (FTS ინდექსს ტრიგერები ავსებს).
+    აბრუნებს id-ებს, რომლებსაც სცენარები იყენებს.
+    """
+    rng = random.Random(seed)
+    seed_catalog(products, categories=categories, batch_size=batch_size, seed=seed)
+    Product.objects.update(stock=BENCH_STOCK)
+    product_ids = list(Product.objects.order_by('pk').values_list('pk', flat=True))
+    prices = dict(Product.objects.values_list('pk', 'price'))
+
+    images = (ProductImage(product_id=pk, image=f'product_images/bench-{pk}-{n}.jpg')
+              for pk in product_ids for n in range(images_per_product))
+    ProductImage.objects.bulk_create(images, batch_size=batch_size)
+
+    # ერთი ჰეში ყველასთვის - scrypt-ის ღირებულება N-ჯერ არ გადაიხდება
+    password = make_password('bench-password')
+    user_model = get_user_model()
+    user_model.objects.bulk_create(
+        (user_model(username=f'bench-user-{n}', email=f'bench-user-{n}@example.com', password=password)
+         for n in range(users)), batch_size=batch_size)
+    user_ids = list(user_model.objects.filter(username__startswith='bench-user-').order_by('pk')
+                    .values_list('pk', flat=True))
+
+    Cart.objects.bulk_create((Cart(user_id=user_id) for user_id in user_ids), batch_size=batch_size)
+    carts = dict(Cart.objects.filter(user_id__in=user_ids).values_list('user_id', 'pk'))
+    CartItem.objects.bulk_create(
+        (CartItem(cart_id=carts[user_id], product_id=product_id, quantity=rng.randint(1, 3))
+         for user_id in user_ids for product_id in rng.sample(product_ids, min(cart_items, len(product_ids)))),
+        batch_size=batch_size)
+
+    order_lines = []
+    orders = []
+    for user_id in user_ids:
+        for _ in range(orders_per_user):
+            lines = [(product_id, rng.randint(1, 3))
+                     for product_id in rng.sample(product_ids, min(items_per_order, len(product_ids)))]
+            orders.append(Order(user_id=user_id, status=rng.choice(['PENDING', 'PROCESSING', 'SHIPPED', 'DELIVERED']),
+                                total_price=sum((prices[pk] * quantity for pk, quantity in lines), Decimal('0')),
+                                shipping_address='Tbilisi'))
+            order_lines.append(lines)
+    # SQLite-ზე bulk_create pk-ებს აბრუნებს (RETURNING)
+    orders = Order.objects.bulk_create(orders, batch_size=batch_size)
+    OrderItem.objects.bulk_create(
+        (OrderItem(order_id=order.pk, product_id=product_id, quantity=quantity, price=prices[product_id])
+         for order, lines in zip(orders, order_lines) for product_id, quantity in lines),
+        batch_size=batch_size)
+
+    rebuild_listings()
+    rebuild_order_stats()
+    rebuild_rollups()
+    # bulk ჩაწერები სიგნალებს არ აგზავნის - კატალოგის ქეში და სიების ETag-ები ვერსიით ინვალიდირდება
+    bump_catalog()
+    return {
+        'category_ids': sorted(set(Product.objects.values_list('category_id', flat=True))),
+        'product_ids': product_ids,
+        'users': [(user_id, carts[user_id]) for user_id in user_ids],
+        'search_terms': GEORGIAN_WORDS,
+    }
@@ -0,0 +1,131 @@
+import platform
+import statistics
+import subprocess
+import threading
+import time
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from users.tokens import ClaimsRefreshToken
+
+from ..bench import summarize
+from .scenarios import SCENARIOS, Session
+
+
+# ----------------------------------------------------
+# 1. სცენარის გაშვება (concurrency ნაკადი, თითოეულს - საკუთარი მომხმარებელი)
+# ----------------------------------------------------
+
+def issue_tokens(fixtures):
+    """ JWT თითო მომხმარებელზე - login-ის (scrypt) ღირებულება გაზომვაში არ შედის """
+    users = get_user_model().objects.in_bulk([user_id for user_id, _ in fixtures['users']])
+    return {user_id: str(ClaimsRefreshToken.for_user(user).access_token) for user_id, user in users.items()}
+
+
+def run_scenario(name, make_transport, fixtures, tokens, iterations=50, concurrency=1, warmup=2, seed=0):
+    """
+    iterations - სულ (ნაკადებზე თანაბრად). warmup იტერაციები თითო ნაკადზე ტარდება, მაგრამ არ იწერება
+    (კავშირები, PRAGMA-ები, ქეშები). აბრუნებს სცენარის და მისი ნაბიჯების სტატისტიკას.
+    """
+    scenario = SCENARIOS[name]
+    users = fixtures['users']
+    sessions = []
+
+    def worker(number):
+        transport = make_transport()
+        user = users[number % len(users)]
+        session = Session(transport, fixtures, user, tokens[user[0]], seed=seed + number)
+        sessions.append(session)
+        try:
+            session.recording = False
+            for _ in range(warmup):
+                scenario(session)
+            session.recording = True
+            for _ in range(iterations // concurrency + (number < iterations % concurrency)):
+                scenario(session)
+        finally:
+            transport.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = [sample for session in sessions for sample in session.samples]
+    result = _stats(samples, elapsed)
+    result['iterations'] = iterations
+    result['steps'] = {step: _stats([sample for sample in samples if sample[0] == step], elapsed)
+                       for step in dict.fromkeys(sample[0] for sample in samples)}
+    return result
+
+
+def _stats(samples, elapsed):
+    """ latency (ms) - summarize(); throughput - მოთხოვნები/წამი ყველა ნაკადზე ერთად """
+    durations = [seconds for _, _, seconds, _ in samples]
+    queries = [count for _, _, _, count in samples if count is not None]
+    result = summarize(durations) if durations else {'runs': 0}
+    # summarize()-ის ops_per_sec ერთ ნაკადზეა
+    result.pop('ops_per_sec', None)
+    result['errors'] = sum(1 for _, ok, _, _ in samples if not ok)
+    result['requests_per_sec'] = round(len(samples) / elapsed, 1) if elapsed else None
+    result['queries_per_request'] = round(statistics.fmean(queries), 2) if queries else None
+    return result
+
+
+# ----------------------------------------------------
+# 2. რეპორტი (JSON) და ორი რეპორტის შედარება
+# ----------------------------------------------------
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def build_report(results, transport, sizes, options):
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'transport': transport,
+            'fixtures': sizes,
+            'iterations': options['iterations'],
+            'concurrency': options['concurrency'],
+        },
+        'scenarios': results,
+    }
+
+
+def compare_reports(baseline, current, threshold=0.10):
+    """
+    ნაბიჯების რეგრესიები: p95 ან requests/sec threshold-ზე მეტით გაუარესდა, ან query-ების
+    რაოდენობა მოთხოვნაზე გაიზარდა (N+1 - დროზე სტაბილური სიგნალი).
+    """
+    regressions = []
+    for scenario, result in current['scenarios'].items():
+        old_steps = baseline.get('scenarios', {}).get(scenario, {}).get('steps', {})
+        for step, new in result['steps'].items():
+            old = old_steps.get(step)
+            if not old or not new.get('runs') or not old.get('runs'):
+                continue
+            name = f'{scenario}.{step}'
+            if new['p95_ms'] > old['p95_ms'] * (1 + threshold):
+                regressions.append({'step': name, 'metric': 'p95_ms', 'baseline': old['p95_ms'], 'current': new['p95_ms']})
+            if new['requests_per_sec'] < old['requests_per_sec'] * (1 - threshold):
+                regressions.append({'step': name, 'metric': 'requests_per_sec',
+                                    'baseline': old['requests_per_sec'], 'current': new['requests_per_sec']})
+            if None not in (old['queries_per_request'], new['queries_per_request']) \
+                    and new['queries_per_request'] > old['queries_per_request']:
+                regressions.append({'step': name, 'metric': 'queries_per_request',
+                                    'baseline': old['queries_per_request'], 'current': new['queries_per_request']})
+    return regressions
@@ -0,0 +1,76 @@
+import random
+from urllib.parse import urlencode
+
+
+# ----------------------------------------------------
+# 1. სესია (ერთი ვირტუალური მომხმარებელი)
+# ----------------------------------------------------
+
+class Session:
+    """ ერთი მომხმარებლის მოთხოვნები; ყოველი ნაბიჯი იწერება (ნაბიჯი, წარმატება, წამები, query-ები) """
+
+    def __init__(self, transport, fixtures, user, token, seed=0):
+        self.transport = transport
+        self.fixtures = fixtures
+        self.user_id, self.cart_id = user
+        self.token = token
+        self.rng = random.Random(seed)
+        self.samples = []
+        self.recording = True
+
+    def call(self, step, method, path, data=None, expect=200):
+        status, seconds, queries, body = self.transport.request(method, path, data=data, token=self.token)
+        if self.recording:
+            self.samples.append((step, status == expect, seconds, queries))
+        return body if status == expect else None
+
+    def random_product(self):
+        return self.rng.choice(self.fixtures['product_ids'])
+
+
+# ----------------------------------------------------
+# 2. სცენარები
+# ----------------------------------------------------
+
+def browse(session):
+    """ კატეგორიები -> კატეგორიის პროდუქტები -> პროდუქტის დეტალები """
+    session.call('category_list', 'GET', '/api/categories/')
+    category = session.rng.choice(session.fixtures['category_ids'])
+    page = session.call('product_list', 'GET', f'/api/products/?category={category}')
+    results = (page or {}).get('results') or []
+    product = session.rng.choice(results)['id'] if results else session.random_product()
+    session.call('product_detail', 'GET', f'/api/products/{product}/')
+
+
+def search(session):
+    term = session.rng.choice(session.fixtures['search_terms'])
+    session.call('search', 'GET', '/api/products/?' + urlencode({'search': term}))
+
+
+def add_to_cart(session):
+    session.call('add_item', 'POST', f'/api/carts/{session.cart_id}/items/',
+                 {'product': session.random_product(), 'quantity': 1}, expect=201)
+    session.call('cart_retrieve', 'GET', f'/api/carts/{session.cart_id}/')
+
+
+def checkout(session):
+    """ checkout კალათას ცლის - ყოველ იტერაციაში ჯერ ერთი პროდუქტი ემატება """
+    session.call('add_item', 'POST', f'/api/carts/{session.cart_id}/items/',
+                 {'product': session.random_product(), 'quantity': 1}, expect=201)
+    session.call('place_order', 'POST', '/api/orders/', {'shipping_address': 'Tbilisi'}, expect=201)
+
+
+def order_history(session):
+    page = session.call('order_list', 'GET', '/api/orders/')
+    results = (page or {}).get('results') or []
+    if results:
+        session.call('order_detail', 'GET', f"/api/orders/{session.rng.choice(results)['id']}/")
+
+
+SCENARIOS = {
+    'browse': browse,
+    'search': search,
+    'add_to_cart': add_to_cart,
+    'checkout': checkout,
+    'order_history': order_history,
+}
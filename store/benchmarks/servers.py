@@ -0,0 +1,80 @@
+import http.client
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+HOST = '127.0.0.1'
+SERVERS = ('wsgi', 'uvicorn')
+
+
+# ----------------------------------------------------
+# 1. ლოკალური სერვერი დროებით ბაზაზე (subprocess)
+# ----------------------------------------------------
+
+def server_command(server, port, workers):
+    """ gunicorn/uvicorn, თუ დაყენებულია; WSGI-ს სარეზერვო ვარიანტი - runserver (threaded). None - არ არის დაყენებული """
+    if server == 'uvicorn':
+        if importlib.util.find_spec('uvicorn') is None:
+            return None
+        return [sys.executable, '-m', 'uvicorn', 'furnitureshop.asgi:application', '--host', HOST,
+                '--port', str(port), '--workers', str(workers), '--log-level', 'warning', '--no-access-log']
+    if importlib.util.find_spec('gunicorn') is not None:
+        return [sys.executable, '-m', 'gunicorn', 'furnitureshop.wsgi:application', '--bind', f'{HOST}:{port}',
+                '--workers', str(workers), '--threads', '4', '--log-level', 'warning']
+    return [sys.executable, 'manage.py', 'runserver', f'{HOST}:{port}', '--noreload', '--skip-checks']
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'server exited with code {process.returncode}')
+        try:
+            connection = http.client.HTTPConnection(HOST, port, timeout=1)
+            connection.request('GET', '/api/categories/')
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('server did not start in time')
+
+
+@contextmanager
+def local_server(server, db_path, workers=1, with_cache=False, env=None):
+    """
+    სერვერის პროცესი db_path ბაზაზე (DB_PATH), replica-ების გარეშე; with_cache=False - კატალოგის
+    ქეში გამორთულია. აბრუნებს პორტს; უცნობი/დაუყენებელი სერვერი - RuntimeError.
+    """
+    port = free_port()
+    command = server_command(server, port, workers)
+    if command is None:
+        raise RuntimeError(f'{server} is not installed (pip install {server})')
+    environment = {**os.environ, 'DB_PATH': str(db_path), 'DB_REPLICA_PATHS': '',
+                   'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'furnitureshop.settings'),
+                   **(env or {})}
+    if not with_cache:
+        environment['CATALOG_CACHE_TIMEOUT'] = '0'
+    process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=environment,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port, process)
+        yield port
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
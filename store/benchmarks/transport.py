@@ -0,0 +1,77 @@
+import http.client
+import json
+import re
+import time
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .servers import HOST
+
+# store.profiling-ის Server-Timing: sql;dur=1.23;desc="4 queries"
+SQL_TIMING = re.compile(r'sql;dur=[\d.]+;desc="(\d+) queries"')
+
+
+# ----------------------------------------------------
+# 1. Transport-ები: (status, წამები, query-ები, JSON) ერთ მოთხოვნაზე
+# ----------------------------------------------------
+
+class InProcessTransport:
+    """ WSGI აპლიკაცია იმავე პროცესში (django.test.Client); query-ები CaptureQueriesContext-ით """
+    name = 'inprocess'
+
+    def __init__(self):
+        self.client = Client()
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        body = json.dumps(data) if data is not None else ''
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = self.client.generic(method, path, body, content_type='application/json', headers=headers)
+            elapsed = time.perf_counter() - started
+        return response.status_code, elapsed, len(ctx.captured_queries), _json(response.content)
+
+    def close(self):
+        connection.close()
+
+
+class HTTPTransport:
+    """
+    ლოკალური სერვერი keep-alive კავშირით. query-ების რაოდენობა Server-Timing-იდან მოდის
+    (X-Store-Profile: 1 - სერვერი DEBUG რეჟიმში ყველა მოთხოვნას ზომავს), სხვაგვარად None.
+    """
+    name = 'http'
+
+    def __init__(self, port):
+        self.port = port
+        self.connection = http.client.HTTPConnection(HOST, port, timeout=30)
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'X-Store-Profile': '1', 'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        body = json.dumps(data) if data is not None else None
+        started = time.perf_counter()
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            content = response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = http.client.HTTPConnection(HOST, self.port, timeout=30)
+            return None, time.perf_counter() - started, None, None
+        elapsed = time.perf_counter() - started
+        match = SQL_TIMING.search(response.getheader('Server-Timing') or '')
+        return response.status, elapsed, int(match.group(1)) if match else None, _json(content)
+
+    def close(self):
+        self.connection.close()
+
+
+def _json(content):
+    try:
+        return json.loads(content) if content else None
+    except ValueError:
+        return None
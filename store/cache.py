@@ -0,0 +1,142 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+
+# ----------------------------------------------------
+# 1. ვერსიის მრიცხველები (key scan-ის გარეშე ინვალიდაცია)
+# ----------------------------------------------------
+
+KEY_PREFIX = 'catalog'
+GLOBAL_VERSION_KEY = f'{KEY_PREFIX}:v:global'
+# ბოლო ჩაწერის დრო (unix, წამი) - store.routers replica-ს ჩამორჩენის ფანჯარას ამით ითვლის
+LAST_WRITE_KEY = f'{KEY_PREFIX}:last_write'
+STATS_KEYS = {'hit': f'{KEY_PREFIX}:stats:hits', 'miss': f'{KEY_PREFIX}:stats:misses'}
+
+
+def get_cache():
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+
+def category_version_key(category_id):
+    return f'{KEY_PREFIX}:v:category:{category_id}'
+
+
+def _incr(cache, key):
+    # add() არაფერს აკეთებს, თუ გასაღები უკვე არსებობს; incr() ატომურია (locmem/redis)
+    cache.add(key, 1, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # გასაღები add()-სა და incr()-ს შორის გაქრა (eviction)
+        cache.set(key, 2, timeout=None)
+        return 2
+
+
+def bump_catalog(category_ids=()):
+    """
+    კატალოგის ყველა ძველი გასაღების ინვალიდაცია: ვერსია გასაღების ნაწილია, ამიტომ
+    ახალი ვერსიის შემდეგ ძველი ჩანაწერები აღარ იკითხება და TTL-ით ქრება.
+    """
+    cache = get_cache()
+    _incr(cache, GLOBAL_VERSION_KEY)
+    for category_id in {category_id for category_id in category_ids if category_id is not None}:
+        _incr(cache, category_version_key(category_id))
+    cache.set(LAST_WRITE_KEY, time.time(), timeout=None)
+
+
+def last_catalog_write():
+    return get_cache().get(LAST_WRITE_KEY)
+
+
+def record(outcome):
+    _incr(get_cache(), STATS_KEYS[outcome])
+
+
+def cache_stats():
+    cache = get_cache()
+    values = cache.get_many(STATS_KEYS.values())
+    hits, misses = values.get(STATS_KEYS['hit'], 0), values.get(STATS_KEYS['miss'], 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else None,
+        'global_version': cache.get(GLOBAL_VERSION_KEY, 1),
+    }
+
+
+# ----------------------------------------------------
+# 2. გასაღები ნორმალიზებული query პარამეტრებიდან
+# ----------------------------------------------------
+
+def catalog_versions(version_keys):
+    """ version_keys-ის მიმდინარე მნიშვნელობები (სტრიქონებად); აკლია - 1 """
+    cache = get_cache()
+    versions = cache.get_many(version_keys)
+    for key in version_keys:
+        if key not in versions:
+            cache.add(key, 1, timeout=None)
+    return [str(versions.get(key, 1)) for key in version_keys]
+
+
+def build_cache_key(request, scope, version_keys):
+    """
+    გასაღები = scope + მიმდინარე ვერსიები + sha1(host, path, დალაგებული პარამეტრები).
+    host შედის, რადგან სურათების URL-ები აბსოლუტურია (build_absolute_uri).
+    """
+    parts = catalog_versions(version_keys)
+    params = sorted((name, sorted(request.query_params.getlist(name))) for name in request.query_params)
+    raw = repr((request.scheme, request.get_host(), request.path, params))
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f"{KEY_PREFIX}:{scope}:{'.'.join(parts)}:{digest}"
+
+
+# ----------------------------------------------------
+# 3. View Mixin (list/retrieve read-through cache)
+# ----------------------------------------------------
+
+class CatalogCacheMixin:
+    """
+    GET list/retrieve პასუხის (response.data) ქეშირება. ფილტრი ?category=<id> ან
+    კატეგორიის detail იყენებს მხოლოდ ამ კატეგორიის ვერსიას, დანარჩენი - გლობალურს.
+    """
+    cache_scope = None
+    cache_category_kwarg = None
+
+    def get_cache_version_keys(self, request):
+        category_id = None
+        if self.cache_category_kwarg:
+            category_id = self.kwargs.get(self.cache_category_kwarg)
+        elif len(request.query_params.getlist('category')) == 1:
+            category_id = request.query_params['category']
+        if category_id is not None and str(category_id).isdigit():
+            return [category_version_key(int(category_id))]
+        return [GLOBAL_VERSION_KEY]
+
+    def cached_response(self, request, render):
+        key = build_cache_key(request, self.cache_scope, self.get_cache_version_keys(request))
+        cache = get_cache()
+        data = cache.get(key)
+        if data is not None:
+            record('hit')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        record('miss')
+        response = render()
+        if response.status_code == 200:
+            cache.set(key, response.data, timeout=getattr(settings, 'CATALOG_CACHE_TIMEOUT', 300))
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(CatalogCacheMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(CatalogCacheMixin, self).retrieve(request, *args, **kwargs))
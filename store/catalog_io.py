@@ -0,0 +1,194 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .cache import bump_catalog
+from .listing import refresh_listings
+from .models import Category, Product
+
+
+# ----------------------------------------------------
+# 1. სვეტები და ფორმატები
+# ----------------------------------------------------
+
+FORMATS = ('csv', 'jsonl')
+EXPORT_COLUMNS = ['slug', 'name', 'category', 'description', 'price', 'stock',
+                  'is_available', 'featured', 'color', 'material']
+# slug - upsert-ის გასაღები, ამიტომ სავალდებულოა იმპორტისას
+IMPORT_FIELDS = ['slug', 'name', 'description', 'price', 'stock', 'is_available', 'featured', 'color', 'material']
+UPDATE_FIELDS = ['name', 'category', 'description', 'price', 'stock', 'is_available', 'featured',
+                 'color', 'material', 'updated_at']
+# upsert-ისას ყოველთვის ახლდება; დანარჩენი - მხოლოდ ფაილში არსებული სვეტები
+ALWAYS_UPDATED = ('category', 'updated_at')
+MAX_REPORTED_ERRORS = 1000
+
+
+def read_rows(stream, fmt):
+    """ ტექსტური ნაკადი -> (ხაზის ნომერი, dict) წყვილები; ფაილი მთლიანად მეხსიერებაში არ იკითხება """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_number, exc
+                continue
+            yield line_number, row
+    else:
+        raise ValueError(f'Unsupported format: {fmt}')
+
+
+# ----------------------------------------------------
+# 2. იმპორტი (chunk-ებად, bulk upsert slug-ით)
+# ----------------------------------------------------
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.upserted = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': line, 'errors': errors})
+
+    def as_dict(self):
+        return {'rows': self.rows, 'upserted': self.upserted,
+                'error_count': self.error_count, 'errors': self.errors}
+
+
+def _normalize(field, value):
+    if isinstance(value, str):
+        value = value.strip()
+        if field.get_internal_type() == 'BooleanField':
+            value = {'true': True, 'yes': True, '1': True,
+                     'false': False, 'no': False, '0': False, '': field.default}.get(value.lower(), value)
+    text_field = field.get_internal_type() in ('CharField', 'TextField', 'SlugField')
+    if (value is None or (value == '' and not text_field)) and field.has_default():
+        value = field.get_default()
+    return value
+
+
+def build_product(row, categories):
+    """ ერთი ჩანაწერის ვალიდაცია მოდელის ველების clean()-ით -> (Product, None) ან (None, errors) """
+    if not isinstance(row, dict):
+        return None, {'__all__': [str(row)]}
+
+    errors, values = {}, {}
+    for name in IMPORT_FIELDS:
+        field = Product._meta.get_field(name)
+        value = _normalize(field, row.get(name, field.get_default() if field.has_default() else None))
+        if value in (None, '') and name == 'slug':
+            errors[name] = ['This field is required.']
+            continue
+        if value is None and field.blank:
+            value = ''
+        try:
+            values[name] = field.clean(value, None)
+        except ValidationError as exc:
+            errors[name] = exc.messages
+
+    category_id = categories.get(str(row.get('category', '')).strip())
+    if category_id is None:
+        errors['category'] = [f"Unknown category: {row.get('category')!r}"]
+
+    if errors:
+        return None, errors
+    return Product(category_id=category_id, **values), None
+
+
+def update_fields_for(row):
+    """ upsert-ის update_fields: ჩანაწერში არმყოფი სვეტი არსებულ მნიშვნელობას default-ით არ ცვლის """
+    return tuple(name for name in UPDATE_FIELDS if name in row or name in ALWAYS_UPDATED)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_products(rows, chunk_size=1000):
+    """
+    rows - read_rows()-ის შედეგი. ყოველი chunk: ვალიდაცია + INSERT ... ON CONFLICT(slug) DO UPDATE
+    ცალკე ტრანზაქციაში (თითო query სვეტების ერთ ნაკრებზე - CSV-ში ყოველთვის ერთი). არსებულ
+    პროდუქტში მხოლოდ ფაილში არსებული სვეტები იცვლება. ცუდი ჩანაწერი იმპორტს არ აჩერებს -
+    რეპორტში ხვდება ხაზის ნომრით.
+    """
+    categories = dict(Category.objects.values_list('name', 'id'))
+    report = ImportReport()
+
+    for chunk in _chunks(rows, chunk_size):
+        products = {}
+        for line, row in chunk:
+            report.rows += 1
+            product, errors = build_product(row, categories)
+            if errors:
+                report.add_error(line, errors)
+            else:
+                # ერთი და იგივე slug ერთ chunk-ში - ბოლო ჩანაწერი იგებს
+                products[product.slug] = (product, update_fields_for(row))
+        if not products:
+            continue
+        groups = {}
+        for product, fields in products.values():
+            groups.setdefault(fields, []).append(product)
+        with transaction.atomic():
+            for fields, group in groups.items():
+                Product.objects.bulk_create(group, update_conflicts=True,
+                                            unique_fields=['slug'], update_fields=list(fields))
+            # bulk upsert სიგნალებს არ აგზავნის - სიის ბარათები აქვე ახლდება
+            refresh_listings(Product.objects.filter(slug__in=products), chunk_size=chunk_size)
+        report.upserted += len(products)
+
+    if report.upserted:
+        # bulk_create სიგნალებს არ აგზავნის
+        bump_catalog(categories.values())
+    return report
+
+
+# ----------------------------------------------------
+# 3. ექსპორტი (ნაკადად, მუდმივი მეხსიერებით)
+# ----------------------------------------------------
+
+class _Echo:
+    """ csv.writer-ისთვის: write() სტრიქონს პირდაპირ აბრუნებს """
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset=None, fmt='csv', chunk_size=2000):
+    """ ტექსტის ნაწილების გენერატორი StreamingHttpResponse-ისთვის ან ფაილისთვის """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unsupported format: {fmt}')
+    queryset = Product.objects.all() if queryset is None else queryset
+    columns = [('category__name' if column == 'category' else column) for column in EXPORT_COLUMNS]
+    rows = queryset.order_by('pk').values_list(*columns).iterator(chunk_size=chunk_size)
+
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(EXPORT_COLUMNS)
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        for row in rows:
+            record = dict(zip(EXPORT_COLUMNS, row))
+            record['price'] = str(record['price'])
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def open_text(binary, encoding='utf-8-sig'):
+    """ ატვირთული ფაილი (ბაიტები) -> ტექსტური ნაკადი; BOM-იანი CSV-იც (Excel) იკითხება """
+    return io.TextIOWrapper(binary, encoding=encoding, newline='')
@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from .cache import bump_catalog
+from .outbox import publish
+from .models import Cart, CartItem, Order, OrderItem, Product, StockHold
+from .reservations import active_holds
+
+
+# ----------------------------------------------------
+# 1. Checkout-ის შეცდომები
+# ----------------------------------------------------
+
+class CheckoutError(Exception):
+    """ checkout-ის საბაზო შეცდომა """
+
+
+class CartNotFound(CheckoutError):
+    pass
+
+
+class EmptyCart(CheckoutError):
+    pass
+
+
+class InsufficientStock(CheckoutError):
+    def __init__(self, product_ids):
+        super().__init__(f'Insufficient stock for products: {product_ids}')
+        self.product_ids = product_ids
+
+
+# ----------------------------------------------------
+# 2. შეკვეთის განთავსება (მუდმივი რაოდენობის query)
+# ----------------------------------------------------
+
+def _quantity_case(quantities):
+    """ CASE id WHEN 1 THEN 2 WHEN 5 THEN 1 ... END - ერთი UPDATE ყველა პროდუქტისთვის """
+    return Case(*[When(pk=product_id, then=Value(quantity)) for product_id, quantity in quantities.items()],
+                output_field=IntegerField())
+
+
+def place_order(user, shipping_address=''):
+    """
+    ქმნის შეკვეთას მომხმარებლის კალათიდან ერთ ტრანზაქციაში:
+      1. კალათის ნივთები (1 query)
+      2. პროდუქტების ჩაკეტვა id-ის ზრდადობით - დეტერმინისტული რიგი, deadlock-ის გარეშე (1 query)
+      3. მარაგის პირობითი ჩამოჭრა: UPDATE ... SET stock = stock - q WHERE stock - სხვისი ჯავშნები >= q
+         (1 query; საკუთარი ჯავშანი ამ კალათისთვისაა დაკავებული - იხ. store.reservations)
+      4. Order + OrderItem-ები bulk_create-ით, კალათის დაცლა და ჯავშნების მოხსნა, outbox მოვლენა
+    თუ რომელიმე პროდუქტს მარაგი არ ყოფნის - InsufficientStock და მთელი ტრანზაქცია უქმდება.
+    """
+    cart_id = Cart.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+    if cart_id is None:
+        raise CartNotFound()
+
+    try:
+        with transaction.atomic():
+            quantities = dict(CartItem.objects.filter(cart_id=cart_id)
+                              .order_by('product_id').values_list('product_id', 'quantity'))
+            if not quantities:
+                raise EmptyCart()
+
+            locked = list(Product.objects.select_for_update()
+                          .filter(pk__in=quantities, is_available=True)
+                          .order_by('pk').values_list('pk', 'price', 'category_id'))
+            prices = {product_id: price for product_id, price, _ in locked}
+
+            delta = _quantity_case(quantities)
+            reserved = (Product.objects
+                        .filter(pk__in=prices, stock__gte=delta + active_holds(exclude_cart=cart_id))
+                        .update(stock=F('stock') - delta, updated_at=timezone.now()))
+            if len(prices) != len(quantities) or reserved != len(quantities):
+                # rollback - მარაგის ნაწილობრივი ჩამოჭრა არ რჩება
+                raise InsufficientStock([])
+
+            total_price = sum((prices[product_id] * quantity for product_id, quantity in quantities.items()),
+                              Decimal(0))
+            order = Order.objects.create(user_id=user.pk, total_price=total_price,
+                                         shipping_address=shipping_address)
+            OrderItem.objects.bulk_create(
+                OrderItem(order=order, product_id=product_id, quantity=quantity, price=prices[product_id])
+                for product_id, quantity in quantities.items()
+            )
+            CartItem.objects.filter(cart_id=cart_id).delete()
+            StockHold.objects.filter(cart_id=cart_id).delete()
+
+            # email/ანალიტიკა - outbox-ში, იმავე ტრანზაქციაში (checkout SMTP-ს არ ელოდება)
+            publish('order.created', {'order_id': order.pk, 'user_id': user.pk, 'total_price': str(total_price)})
+
+            # მარაგი კატალოგის პასუხშია - ქეშის ვერსიები commit-ის შემდეგ იზრდება
+            category_ids = {category_id for _, _, category_id in locked}
+            transaction.on_commit(lambda: bump_catalog(category_ids))
+    except InsufficientStock:
+        # ტრანზაქციის გარეთ - უკვე rollback-ის შემდეგ, რეალური მარაგით
+        raise InsufficientStock(_short_products(quantities, cart_id)) from None
+
+    return order
+
+
+def _short_products(quantities, cart_id):
+    """ რომელ პროდუქტებს არ ეყო მარაგი (მხოლოდ შეცდომის შემთხვევაში ეშვება) """
+    delta = _quantity_case(quantities)
+    available = set(Product.objects.filter(pk__in=quantities, is_available=True,
+                                           stock__gte=delta + active_holds(exclude_cart=cart_id))
+                    .values_list('pk', flat=True))
+    return sorted(set(quantities) - available)
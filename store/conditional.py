@@ -0,0 +1,75 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import GLOBAL_VERSION_KEY, catalog_versions
+
+
+# ----------------------------------------------------
+# 1. ETag / Last-Modified (სერიალიზაციამდე 304)
+# ----------------------------------------------------
+
+class ConditionalGetMixin:
+    """
+    list: ETag = hash(კატალოგის ვერსიები (store.cache), host, path + query პარამეტრები) - query-ს
+    გარეშე, ამიტომ 304 ქეშის hit-ზე იაფია. კატალოგის ყოველი ჩაწერა (სიგნალები, bulk UPDATE-ები,
+    checkout-ის მარაგი) bump_catalog-ს იძახებს, ვერსია კი ქეშის გასაღების ნაწილიცაა.
+    სიას Last-Modified არ აქვს: წაშლა ან is_available=False MAX(updated_at)-ს ვერ ცვლის.
+    retrieve: ერთი ჩანაწერის updated_at (+ ვერსიები). If-None-Match / If-Modified-Since-ის
+    დამთხვევისას view 304-ს აბრუნებს სერიალიზაციამდე (და ქეშამდე).
+    timestamp_fields - ველები, რომელთა ცვლილებაც პასუხში ჩანს (მაგ. category__updated_at).
+    """
+    timestamp_fields = ('updated_at',)
+
+    def get_validator_versions(self, request):
+        # CatalogCacheMixin-თან ერთად - იგივე ვერსიები, რაც ქეშის გასაღებში
+        get_keys = getattr(self, 'get_cache_version_keys', None)
+        return catalog_versions(get_keys(request) if get_keys else [GLOBAL_VERSION_KEY])
+
+    def _validators(self, request, stamps):
+        stamps = [stamp for stamp in stamps if stamp is not None]
+        last_modified = max(stamps) if stamps else None
+        params = sorted((name, sorted(request.query_params.getlist(name))) for name in request.query_params)
+        # host - სურათების URL-ები აბსოლუტურია (იგივე, რაც build_cache_key-ში)
+        raw = repr((request.get_host(), request.path, params, [stamp.isoformat() for stamp in stamps],
+                    self.get_validator_versions(request)))
+        etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        return 'W/' + etag, last_modified
+
+    def get_list_validators(self, request):
+        return self._validators(request, ())
+
+    def get_detail_validators(self, request):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        row = (queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+               .values_list(*self.timestamp_fields).first())
+        if row is None:
+            return None, None
+        return self._validators(request, row)
+
+    def conditional_response(self, request, validators, render):
+        etag, last_modified = validators(request)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        if etag is not None:
+            not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if not_modified is not None:
+                return not_modified
+
+        response = render()
+        if etag is not None and response.status_code == 200:
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, self.get_list_validators,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, self.get_detail_validators,
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs))
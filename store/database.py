@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from django.conf import settings
+
+
+# ----------------------------------------------------
+# 1. SQLite PRAGMA-ები (connection_created hook)
+# ----------------------------------------------------
+
+# WAL: მკითხველები ჩამწერს არ ბლოკავენ; synchronous=NORMAL WAL-ში უსაფრთხოა (commit-ი
+# ელექტროენერგიის გათიშვისას შეიძლება დაიკარგოს, ბაზა კი არ ზიანდება)
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,        # ms - ჩაკეტილ ბაზაზე მაშინვე "database is locked" აღარ ვარდება
+    'cache_size': -64000,         # უარყოფითი - KiB (~64 MB page cache თითო კავშირზე)
+    'mmap_size': 268435456,       # 256 MB memory-mapped I/O
+    'temp_store': 'MEMORY',
+}
+
+
+def sqlite_pragmas():
+    return getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_PRAGMAS)
+
+
+def keeps_journal_mode(connection):
+    """
+    SQLITE_KEEP_JOURNAL_MODE-ის ფაილები (opt-in, ნაგულისხმევად ცარიელი): WAL ფაილის header-ში
+    იწერება, ამიტომ ნებისმიერი management ბრძანება ასეთ ფაილს (მაგ. git-ში შენახულ ბაზას) შეცვლიდა.
+    """
+    name = str(connection.settings_dict['NAME'])
+    keep = {Path(path).resolve() for path in getattr(settings, 'SQLITE_KEEP_JOURNAL_MODE', ())}
+    return bool(keep) and not name.startswith('file:') and name != ':memory:' and Path(name).resolve() in keep
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """ ყოველ ახალ SQLite კავშირზე ერთხელ (CONN_MAX_AGE-ით კავშირი მოთხოვნებს შორის რჩება) """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = dict(sqlite_pragmas())
+    if keeps_journal_mode(connection):
+        pragmas.pop('journal_mode', None)
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def read_pragmas(connection, names=None):
+    """ {'journal_mode': 'wal', 'synchronous': 1, ...} - შემოწმებისა და benchmark-ისთვის """
+    values = {}
+    with connection.cursor() as cursor:
+        for name in names or sqlite_pragmas():
+            cursor.execute(f'PRAGMA {name}')
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+    return values
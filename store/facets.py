@@ -0,0 +1,124 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Case, Count, IntegerField, Value, When
+from django_filters.rest_framework import DjangoFilterBackend
+
+from .fastpath import decimal_str
+
+# ველები, რომლებიც ერთდროულად ფილტრიცაა და facet-იც (store.filters.ProductFilter)
+FACET_FIELDS = ('category', 'color', 'material')
+# ფასის დიაპაზონის ფილტრები - ფასის bucket-ების facet-ი მათ გარეშე ითვლება
+PRICE_FIELDS = ('price_min', 'price_max')
+# ფასის ზღვრები (₾): [0, 100), [100, 250), ..., [1000, ∞)
+DEFAULT_PRICE_BUCKETS = [100, 250, 500, 1000]
+
+
+def price_bounds():
+    edges = [Decimal(str(edge)) for edge in getattr(settings, 'STORE_FACET_PRICE_BUCKETS', DEFAULT_PRICE_BUCKETS)]
+    return list(zip([Decimal('0'), *edges], [*edges, None]))
+
+
+# ----------------------------------------------------
+# 1. Facet-ების დათვლა (ერთი GROUP BY)
+# ----------------------------------------------------
+
+def facet_counts(queryset, selected, price_range=(None, None)):
+    """
+    queryset - პროდუქტები facet-ის და ფასის ფილტრების გარეშე (ძებნა და სხვა ფილტრები უკვე
+    გამოყენებულია); selected - {'color': 'red', ...} მიმდინარე facet-ის ფილტრები;
+    price_range - (price_min, price_max), None - საზღვრის გარეშე.
+    ერთი query: GROUP BY (category, color, material, ფასის bucket, დიაპაზონშია თუ არა) -
+    კომბინაციების რაოდენობა კატალოგის ზომაზე არ არის დამოკიდებული. facet-ის მრიცხველი
+    დანარჩენი ფილტრებით ითვლება (disjunctive): არჩეული ფერის გვერდით სხვა ფერების რაოდენობაც
+    ჩანს, ფასის bucket-ები კი ფასის დიაპაზონის გარეშე ითვლება.
+    """
+    bounds = price_bounds()
+    bucket = Case(*[When(price__gte=low, price__lt=high, then=Value(n))
+                    for n, (low, high) in enumerate(bounds[:-1])],
+                  default=Value(len(bounds) - 1), output_field=IntegerField())
+    price_min, price_max = price_range
+    in_range = {f'price__{lookup}': value for lookup, value in (('gte', price_min), ('lte', price_max))
+                if value is not None}
+    in_price = (Case(When(then=Value(1), **in_range), default=Value(0), output_field=IntegerField())
+                if in_range else Value(1, output_field=IntegerField()))
+    rows = list(queryset.select_related(None).prefetch_related(None).order_by()
+                .values('category_id', 'category__name', 'color', 'material', bucket=bucket, in_price=in_price)
+                .annotate(count=Count('pk')))
+
+    def matches(row, skip):
+        return (skip == 'price' or row['in_price']) and all(
+            str(row['category_id' if name == 'category' else name]) == value
+            for name, value in selected.items() if name != skip)
+
+    def tally(field, skip):
+        counts = {}
+        for row in rows:
+            if row[field] != '' and matches(row, skip):
+                counts[row[field]] = counts.get(row[field], 0) + row['count']
+        return counts
+
+    names = {row['category_id']: row['category__name'] for row in rows}
+    categories = tally('category_id', 'category')
+    buckets = tally('bucket', 'price')
+    return {
+        'category': [{'value': pk, 'label': names[pk], 'count': count}
+                     for pk, count in sorted(categories.items(), key=lambda item: (-item[1], names[item[0]]))],
+        'color': _options(tally('color', 'color')),
+        'material': _options(tally('material', 'material')),
+        'price': [{'min': decimal_str(low), 'max': decimal_str(high) if high is not None else None,
+                   'count': buckets.get(n, 0)} for n, (low, high) in enumerate(bounds)],
+    }
+
+
+def _options(counts):
+    return [{'value': value, 'count': count}
+            for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
+
+
+# ----------------------------------------------------
+# 2. ?facets=1 სიის პასუხზე
+# ----------------------------------------------------
+
+class FacetedListMixin:
+    """
+    list(): ?facets=1-ზე პაგინირებულ პასუხს ემატება "facets" - მიმდინარე ფილტრებით.
+    CatalogCacheMixin-ის შემდეგ (MRO-ში) დგას, ამიტომ facet-ები გვერდთან ერთად ქეშირდება.
+    """
+    facets_query_param = 'facets'
+
+    def wants_facets(self, request):
+        return request.query_params.get(self.facets_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def facet_queryset(self, request):
+        """
+        filter_backends ყველა ფილტრით, გარდა FACET_FIELDS-ისა და ფასის დიაპაზონისა;
+        აბრუნებს (queryset, (price_min, price_max)) - დიაპაზონი facet_counts-ში ცალკე ითვლება.
+        """
+        queryset = self.get_queryset()
+        price_range = (None, None)
+        for backend_class in self.filter_backends:
+            backend = backend_class()
+            if isinstance(backend, DjangoFilterBackend):
+                filterset_class = backend.get_filterset_class(self, queryset)
+                if filterset_class is None:
+                    continue
+                # სიამ ფილტრები უკვე გაიარა (არასწორზე 400) - აქ მხოლოდ გასუფთავებული მნიშვნელობებია
+                form = filterset_class(request.query_params, queryset=queryset, request=request).form
+                if form.is_valid():
+                    price_range = tuple(form.cleaned_data.get(name) for name in PRICE_FIELDS)
+                data = request.query_params.copy()
+                for name in (*FACET_FIELDS, *PRICE_FIELDS):
+                    data.pop(name, None)
+                queryset = filterset_class(data, queryset=queryset, request=request).qs
+            else:
+                queryset = backend.filter_queryset(request, queryset, self)
+        return queryset, price_range
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if self.wants_facets(request) and response.status_code == 200 and isinstance(response.data, dict):
+            selected = {name: request.query_params[name] for name in FACET_FIELDS if request.query_params.get(name)}
+            queryset, price_range = self.facet_queryset(request)
+            response.data['facets'] = facet_counts(queryset, selected, price_range)
+        return response
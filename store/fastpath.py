@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .profiling import phase
+
+
+# ----------------------------------------------------
+# 1. ველების გარდაქმნა (DRF-ის ფორმატის ზუსტი ასლი)
+# ----------------------------------------------------
+
+def decimal_str(value):
+    """ DecimalField(decimal_places=2): ბაზიდან უკვე 2 ათწილადით მოდის - quantize საჭირო არაა """
+    return f'{value:.2f}'
+
+
+def datetime_str(value):
+    """ DateTimeField.to_representation: მიმდინარე TIME_ZONE-ში, UTC - 'Z' სუფიქსით """
+    if settings.USE_TZ and timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+    representation = value.isoformat()
+    if representation.endswith('+00:00'):
+        representation = representation[:-6] + 'Z'
+    return representation
+
+
+# ----------------------------------------------------
+# 2. View Mixin (values() -> dict-ები, ModelSerializer-ის გარეშე)
+# ----------------------------------------------------
+
+class FastListMixin:
+    """
+    list()-ის read-only რეჟიმი: queryset.values()-ის ჩანაწერები პირდაპირ dict-ებად ეწყობა
+    fast_fields-ის მიხედვით - (გასაღები, values() lookup, გარდამქმნელი). lookup=None ნიშნავს
+    ჩადგმულ სიას, რომელსაც fast_loaders[გასაღები] მეთოდი - (parent_ids, request) - ერთი query-ით
+    აბრუნებს {მშობლის id: [...]}; loader-ის არქონა კლასის განსაზღვრისას მოწმდება.
+    შედეგი სერიალიზატორის გამოსავლის ბაიტ-იდენტურია (იხ. ტესტები); STORE_FAST_SERIALIZERS=False
+    ჩვეულებრივ სერიალიზატორს აბრუნებს.
+    """
+    fast_fields = ()
+    fast_loaders = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        missing = [name for name, lookup, _ in cls.fast_fields
+                   if lookup is None and not callable(getattr(cls, cls.fast_loaders.get(name, ''), None))]
+        if missing:
+            raise ImproperlyConfigured(f'{cls.__name__}.fast_loaders has no loader for nested fields {missing}')
+
+    def get_fast_fields(self, request):
+        requested_fields = getattr(self.get_serializer_class(), 'requested_fields', None)
+        requested = requested_fields(request) if requested_fields else None
+        return [field for field in self.fast_fields if requested is None or field[0] in requested]
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, 'STORE_FAST_SERIALIZERS', True):
+            return super().list(request, *args, **kwargs)
+
+        fields = self.get_fast_fields(request)
+        queryset = self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(None)
+        columns = ['id'] + [lookup for _, lookup, _ in fields if lookup]
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            # keyset კურსორს სორტირების ველები სჭირდება
+            columns += [name.lstrip('-') for name in self.paginator.get_ordering(queryset)]
+        rows = queryset.values(*dict.fromkeys(columns))
+
+        page = self.paginate_queryset(rows)
+        with phase('serialize'):
+            data = self.fast_serialize(list(rows) if page is None else page, fields, request)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def fast_serialize(self, rows, fields, request):
+        parent_ids = [row['id'] for row in rows]
+        related = {name: getattr(self, self.fast_loaders[name])(parent_ids, request) if parent_ids else {}
+                   for name, lookup, _ in fields if lookup is None}
+        results = []
+        for row in rows:
+            record = {}
+            for name, lookup, convert in fields:
+                if lookup is None:
+                    record[name] = related[name].get(row['id'], [])
+                    continue
+                value = row[lookup]
+                record[name] = convert(value) if convert is not None and value is not None else value
+            results.append(record)
+        return results
@@ -0,0 +1,26 @@
+from django_filters import rest_framework as filters
+
+from .models import Product
+
+
+# ----------------------------------------------------
+# 1. Product FilterSet (ფასის დიაპაზონი, მარაგი, გამორჩეული)
+# ----------------------------------------------------
+
+class ProductFilter(filters.FilterSet):
+    """
+    /api/products/?price_min=100&price_max=500&in_stock=true&featured=true&category=1&color=red
+    ფილტრი + სორტირების ყოველ გავრცელებულ კომბინაციას Product.Meta.indexes-ში შესაბამისი
+    (ნაწილობრივი, WHERE is_available) ინდექსი აქვს - SQLite ORDER BY-ს temp B-tree-ით არ ალაგებს.
+    """
+    price_min = filters.NumberFilter(field_name='price', lookup_expr='gte')
+    price_max = filters.NumberFilter(field_name='price', lookup_expr='lte')
+    in_stock = filters.BooleanFilter(method='filter_in_stock')
+    featured = filters.BooleanFilter()
+
+    class Meta:
+        model = Product
+        fields = ['category', 'color', 'material', 'price_min', 'price_max', 'in_stock', 'featured']
+
+    def filter_in_stock(self, queryset, name, value):
+        return queryset.filter(stock__gt=0) if value else queryset.filter(stock__lte=0)
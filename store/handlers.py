@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from .analytics import refresh_rollups
+from .models import Order
+from .outbox import handles
+
+
+# ----------------------------------------------------
+# 1. Outbox Handler-ები: order.created
+# ----------------------------------------------------
+
+@handles('order.created')
+def send_order_confirmations(events):
+    """
+    შეკვეთების დადასტურების email-ები ერთი batch-ით: შეკვეთები ერთი query-ით,
+    ყველა წერილი ერთ SMTP კავშირში (get_connection() + send_messages()).
+    """
+    order_ids = [event.payload['order_id'] for event in events]
+    orders = Order.objects.select_related('user').filter(pk__in=order_ids)
+    messages = [
+        EmailMessage(
+            subject=f'შეკვეთა #{order.pk} მიღებულია',
+            body=f'გმადლობთ, {order.user.username}! შეკვეთის ჯამი: {order.total_price} ₾.',
+            from_email=settings.EMAIL_HOST_USER,
+            to=[order.user.email],
+        )
+        for order in orders if order.user.email
+    ]
+    if messages:
+        with get_connection() as connection:
+            connection.send_messages(messages)
+    return ()
+
+
+# ----------------------------------------------------
+# 2. გაყიდვების rollup-ები (order.created, order.updated)
+# ----------------------------------------------------
+
+@handles('order.created')
+@handles('order.updated')
+def update_sales_rollups(events):
+    """ შეხებული (დღე, პროდუქტი) bucket-ები თავიდან ითვლება - განმეორებული მიწოდება უსაფრთხოა """
+    refresh_rollups({event.payload['order_id'] for event in events})
+    return ()
@@ -0,0 +1,164 @@
+import hashlib
+import io
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .cache import bump_catalog
+from .listing import refresh_listings
+from .models import Category, Product, ProductImage
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------
+# 1. სურათის ვარიანტები (thumbnail + WebP/AVIF)
+# ----------------------------------------------------
+
+DEFAULT_WIDTHS = (320, 640, 1280)
+DEFAULT_FORMATS = ('avif', 'webp', 'jpeg')
+EXTENSIONS = {'jpeg': 'jpg', 'webp': 'webp', 'avif': 'avif'}
+SAVE_OPTIONS = {
+    'jpeg': {'quality': 82, 'optimize': True, 'progressive': True},
+    'webp': {'quality': 80, 'method': 4},
+    'avif': {'quality': 60},
+}
+
+
+def variant_widths():
+    return tuple(getattr(settings, 'IMAGE_VARIANT_WIDTHS', DEFAULT_WIDTHS))
+
+
+def variant_formats():
+    """ მხოლოდ ის ფორმატები, რომლებსაც დაყენებული Pillow აკოდირებს """
+    from PIL import features
+
+    formats = getattr(settings, 'IMAGE_VARIANT_FORMATS', DEFAULT_FORMATS)
+    return tuple(fmt for fmt in formats if fmt == 'jpeg' or features.check(fmt))
+
+
+def render_variants(source_name, storage=None):
+    """
+    აგენერირებს ვარიანტებს ერთი ორიგინალისთვის და აბრუნებს
+    {'source': ..., 'formats': {'webp': {'320': 'product_images/derived/<sha1>-320w.webp', ...}}}.
+    ფაილის სახელი შიგთავსის ჰეშია, ამიტომ ის უცვლელია (Cache-Control: immutable) და
+    განმეორებით გაშვებისას უკვე არსებული ფაილები აღარ იწერება.
+    მხოლოდ ფაილებთან მუშაობს (ბაზასთან არა) - უსაფრთხოა ProcessPool-ისთვის.
+    """
+    from PIL import Image, ImageOps
+
+    storage = storage or default_storage
+    with storage.open(source_name, 'rb') as handle:
+        payload = handle.read()
+    digest = hashlib.sha1(payload).hexdigest()[:20]
+    directory = posixpath.join(posixpath.dirname(source_name), 'derived')
+
+    with Image.open(io.BytesIO(payload)) as original:
+        original = ImageOps.exif_transpose(original)
+        original.load()
+
+    result = {'source': source_name, 'formats': {}}
+    widths = [width for width in variant_widths() if width < original.width] or [original.width]
+    for width in widths:
+        height = max(1, round(original.height * width / original.width))
+        resized = None
+        for fmt in variant_formats():
+            name = posixpath.join(directory, f'{digest}-{width}w.{EXTENSIONS[fmt]}')
+            if not storage.exists(name):
+                if resized is None:
+                    resized = original.resize((width, height), Image.LANCZOS)
+                image = resized.convert('RGB') if fmt == 'jpeg' and resized.mode != 'RGB' else resized
+                buffer = io.BytesIO()
+                image.save(buffer, format=fmt.upper(), **SAVE_OPTIONS[fmt])
+                storage.save(name, ContentFile(buffer.getvalue()))
+            result['formats'].setdefault(fmt, {})[str(width)] = name
+    return result
+
+
+def needs_variants(instance, field_name='image'):
+    image = getattr(instance, field_name)
+    return bool(image) and instance.variants.get('source') != image.name
+
+
+def save_variants(model, pk, variants, field_name='image'):
+    """
+    ვარიანტების შენახვა update()-ით (post_save სიგნალი თავიდან არ ეშვება). srcset პასუხის
+    ნაწილია, ამიტომ იმავე ტრანზაქციაში: მფლობელის updated_at (ETag/Last-Modified), პროდუქტის
+    ბარათი და commit-ის შემდეგ კატალოგის ვერსია. აბრუნებს განახლებული ჩანაწერების რაოდენობას.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # შუალედში სურათი შეიძლება შეიცვალა - ვინახავთ მხოლოდ იმავე წყაროსთვის
+        saved = model.objects.filter(pk=pk, **{field_name: variants['source']}).update(variants=variants)
+        if not saved:
+            return 0
+        if model is ProductImage:
+            products = Product.objects.filter(images__pk=pk)
+            category_ids = list(products.values_list('category_id', flat=True))
+            products.update(updated_at=now)
+            refresh_listings(Product.objects.filter(images__pk=pk))
+        elif model is Category:
+            model.objects.filter(pk=pk).update(updated_at=now)
+            category_ids = [pk]
+        else:
+            category_ids = []
+        transaction.on_commit(lambda: bump_catalog(category_ids))
+    return saved
+
+
+def generate_variants(model, pk, field_name='image'):
+    """ ვარიანტების აგება და შენახვა (save_variants) """
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or not needs_variants(instance, field_name):
+        return None
+    variants = render_variants(getattr(instance, field_name).name)
+    save_variants(model, pk, variants, field_name)
+    return variants
+
+
+# ----------------------------------------------------
+# 2. ფონური worker pool (ატვირთვისას)
+# ----------------------------------------------------
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=getattr(settings, 'IMAGE_VARIANT_WORKERS', 2),
+                                       thread_name_prefix='image-variants')
+    return _executor
+
+
+def _run(model, pk, field_name):
+    close_old_connections()
+    try:
+        generate_variants(model, pk, field_name)
+    except Exception:
+        logger.exception('Image variant generation failed for %s #%s', model.__name__, pk)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(instance, field_name='image'):
+    """ commit-ის შემდეგ ვარიანტების აგება ფონურ ნაკადში - მოთხოვნა არ ელოდება """
+    if not needs_variants(instance, field_name):
+        return
+    model, pk = type(instance), instance.pk
+    transaction.on_commit(lambda: _get_executor().submit(_run, model, pk, field_name))
+
+
+def build_srcset(variants, url_builder):
+    """ {'webp': 'https://.../a-320w.webp 320w, https://.../a-640w.webp 640w', ...} """
+    return {
+        fmt: ', '.join(f'{url_builder(default_storage.url(name))} {width}w'
+                       for width, name in sorted(by_width.items(), key=lambda item: int(item[0])))
+        for fmt, by_width in (variants or {}).get('formats', {}).items()
+    }
@@ -0,0 +1,91 @@
+import json
+from itertools import islice
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from rest_framework.fields import DateTimeField
+
+from .models import Product, ProductImage, ProductListing
+
+
+# ----------------------------------------------------
+# 1. ბარათის აგება (Product + Category.name + პირველი სურათი)
+# ----------------------------------------------------
+
+# DRF-ის ფორმატი (TIME_ZONE-ში) - იგივე, რასაც ProductSerializer აბრუნებს
+_datetime = DateTimeField()
+
+
+def listing_payload(product, category_name, image_name):
+    """
+    ProductSerializer-ის სიის ველების კომპაქტური ასლი. მარაგი (stock) აქ არ ინახება -
+    checkout მას UPDATE-ით ცვლის სიგნალების გარეშე; სურათის URL ფარდობითია (MEDIA_URL).
+    """
+    record = {
+        'id': product.pk,
+        'name': product.name,
+        'slug': product.slug,
+        'category': product.category_id,
+        'category_name': category_name,
+        'price': f'{product.price:.2f}',
+        'is_available': product.is_available,
+        'featured': product.featured,
+        'color': product.color,
+        'material': product.material,
+        'image': default_storage.url(image_name) if image_name else None,
+        'created_at': _datetime.to_representation(product.created_at),
+    }
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def refresh_listings(products=None, chunk_size=1000):
+    """
+    products - Product queryset (None - ყველა). ყოველ chunk-ზე: პროდუქტები კატეგორიის
+    სახელით (1 query), პირველი სურათები (1 query), ერთი INSERT ... ON CONFLICT DO UPDATE.
+    აბრუნებს განახლებული ბარათების რაოდენობას.
+    """
+    products = Product.objects.all() if products is None else products
+    products = (products.order_by('pk').select_related('category')
+                .only('id', 'name', 'slug', 'category_id', 'price', 'is_available', 'featured',
+                      'color', 'material', 'created_at', 'category__name'))
+    refreshed = 0
+    for chunk in _chunks(products.iterator(chunk_size=chunk_size), chunk_size):
+        first_images = {}
+        images = (ProductImage.objects.filter(product_id__in=[product.pk for product in chunk])
+                  .order_by('product_id', 'pk').values_list('product_id', 'image'))
+        for product_id, image in images:
+            first_images.setdefault(product_id, image)
+
+        listings = [
+            ProductListing(product_id=product.pk, category_id=product.category_id,
+                           is_available=product.is_available, created_at=product.created_at,
+                           payload=listing_payload(product, product.category.name, first_images.get(product.pk)))
+            for product in chunk
+        ]
+        with transaction.atomic():
+            ProductListing.objects.bulk_create(listings, update_conflicts=True, unique_fields=['product'],
+                                               update_fields=['category', 'is_available', 'created_at', 'payload'])
+        refreshed += len(listings)
+    return refreshed
+
+
+def rebuild_listings(chunk_size=1000):
+    """ სრული აღდგენა: ობოლი ბარათების წაშლა + ყველა პროდუქტის upsert """
+    ProductListing.objects.exclude(product_id__in=Product.objects.values('pk')).delete()
+    return refresh_listings(chunk_size=chunk_size)
+
+
+# ----------------------------------------------------
+# 2. სიის პასუხი (payload-ების შეერთება)
+# ----------------------------------------------------
+
+def render_page(payloads, next_link=None, previous_link=None):
+    """ {"next": ..., "previous": ..., "results": [...]} - payload-ები თავიდან არ იშლება """
+    return '{"next":%s,"previous":%s,"results":[%s]}' % (
+        json.dumps(next_link), json.dumps(previous_link), ','.join(payloads))
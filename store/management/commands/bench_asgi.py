@@ -0,0 +1,120 @@
+import http.client
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from store.bench import scratch_database, seed_catalog, summarize
+from store.benchmarks.servers import HOST, SERVERS, local_server, server_command
+from store.models import Cart, CartItem, Product, ProductImage
+from users.tokens import ClaimsRefreshToken
+
+# (სახელი, სინქრონული DRF endpoint, async endpoint) - {product}/{cart} ივსება seed-ის შემდეგ
+ENDPOINTS = [
+    ('product_list', '/api/products/', '/api/async/products/'),
+    ('product_detail', '/api/products/{product}/', '/api/async/products/{product}/'),
+    ('category_list', '/api/categories/', '/api/async/categories/'),
+    ('cart_retrieve', '/api/carts/{cart}/', '/api/async/carts/{cart}/'),
+]
+
+
+class Command(BaseCommand):
+    help = ('Load test: uvicorn (ASGI) vs WSGI სერვერი - სინქრონული და async endpoint-ები '
+            '(requests/sec, p50/p95/p99, დროებით ბაზაზე)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', nargs='+', default=list(SERVERS), choices=SERVERS)
+        parser.add_argument('--products', type=int, default=2000)
+        parser.add_argument('--seconds', type=float, default=5.0, help='ხანგრძლივობა თითო endpoint-ზე')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--workers', type=int, default=1, help='სერვერის პროცესები')
+        parser.add_argument('--with-cache', action='store_true',
+                            help='კატალოგის ქეში ჩართული (ნაგულისხმევად გამორთულია - ორივე გზა ბაზიდან კითხულობს)')
+
+    def handle(self, *args, **options):
+        report = {'products': options['products'], 'concurrency': options['concurrency'],
+                  'workers': options['workers'], 'servers': {}}
+        with tempfile.TemporaryDirectory() as tmp, scratch_database(path=Path(tmp) / 'bench.sqlite3') as connection:
+            targets, token = self.seed(options['products'])
+            db_path = connection.settings_dict['NAME']
+            # სერვერის პროცესი იმავე ფაილს ხსნის - აქედან კავშირი აღარ გვჭირდება
+            connections.close_all()
+            for server in options['servers']:
+                report['servers'][server] = self.run_server(server, db_path, targets, token, options)
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def seed(self, products):
+        self.stderr.write(f'Seeding {products} products...')
+        seed_catalog(products)
+        product_ids = list(Product.objects.values_list('pk', flat=True))
+        ProductImage.objects.bulk_create(
+            ProductImage(product_id=pk, image=f'product_images/p{pk}-{n}.jpg') for pk in product_ids for n in range(2))
+        user = get_user_model().objects.create_user(username='bench-asgi')
+        cart = Cart.objects.create(user=user)
+        CartItem.objects.bulk_create(CartItem(cart=cart, product_id=pk, quantity=2) for pk in product_ids[:10])
+        values = {'product': product_ids[len(product_ids) // 2], 'cart': cart.pk}
+        targets = [(name, sync_path.format(**values), async_path.format(**values))
+                   for name, sync_path, async_path in ENDPOINTS]
+        return targets, str(ClaimsRefreshToken.for_user(user).access_token)
+
+    def run_server(self, server, db_path, targets, token, options):
+        if server_command(server, 0, options['workers']) is None:
+            return {'skipped': f'{server} is not installed (pip install {server})'}
+        self.stderr.write(f'Starting {server}...')
+        with local_server(server, db_path, workers=options['workers'], with_cache=options['with_cache']) as port:
+            result = {'command': ' '.join(server_command(server, port, options['workers'])[1:3])}
+            for name, sync_path, async_path in targets:
+                result[name] = {
+                    'sync': self.load(port, sync_path, token, options),
+                    'async': self.load(port, async_path, token, options),
+                }
+        return result
+
+    def load(self, port, path, token, options):
+        """ concurrency ნაკადი, თითოეული keep-alive კავშირით, seconds წამის განმავლობაში """
+        headers = {'Authorization': f'Bearer {token}'}
+        samples, errors, lock = [], [], threading.Lock()
+        deadline = time.monotonic() + options['seconds']
+
+        def worker():
+            connection = http.client.HTTPConnection(HOST, port, timeout=30)
+            local_samples, local_errors = [], 0
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status != 200:
+                        local_errors += 1
+                        continue
+                except (OSError, http.client.HTTPException):
+                    local_errors += 1
+                    connection.close()
+                    connection = http.client.HTTPConnection(HOST, port, timeout=30)
+                    continue
+                local_samples.append(time.perf_counter() - started)
+            connection.close()
+            with lock:
+                samples.extend(local_samples)
+                errors.append(local_errors)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        result = summarize(samples) if samples else {'runs': 0}
+        # summarize()-ის ops_per_sec ერთ ნაკადზეა - აქ სერვერის გამტარუნარიანობა
+        result.pop('ops_per_sec', None)
+        result['requests_per_sec'] = round(len(samples) / elapsed, 1)
+        result['errors'] = sum(errors)
+        return result
@@ -0,0 +1,100 @@
+import json
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+from django.db.models import Sum
+from django.test.utils import override_settings
+
+from store.bench import scratch_database
+from store.checkout import InsufficientStock, place_order
+from store.models import Cart, CartItem, Category, OrderItem, Product
+from store.taskqueue import wait_for_tasks
+
+
+class Command(BaseCommand):
+    help = 'მრავალნაკადიანი checkout stress-ტესტი: ამოწმებს overselling-ს და ზომავს checkouts/sec'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--buyers', type=int, default=200)
+        parser.add_argument('--stock', type=int, default=50, help='საწყისი მარაგი თითო პროდუქტზე')
+        parser.add_argument('--products', type=int, default=5)
+        parser.add_argument('--items', type=int, default=3, help='პროდუქტი თითო კალათაში')
+
+    def handle(self, *args, **options):
+        # checkout-ის outbox email-ები ფონურად იგზავნება - benchmark-ში dummy backend
+        with tempfile.TemporaryDirectory() as tmp, \
+                override_settings(EMAIL_BACKEND='django.core.mail.backends.dummy.EmailBackend'), \
+                scratch_database(path=Path(tmp) / 'bench.sqlite3'):
+            report = self.run(options)
+            wait_for_tasks()
+        self.stdout.write(json.dumps(report, indent=2))
+        if report['oversold']:
+            raise SystemExit(1)
+
+    def run(self, options):
+        category = Category.objects.create(name='Bench', slug='bench')
+        products = Product.objects.bulk_create(
+            Product(category=category, name=f'Scarce {i}', slug=f'scarce-{i}', description='',
+                    price=Decimal('10.00'), stock=options['stock'])
+            for i in range(options['products'])
+        )
+        User = get_user_model()
+        users = User.objects.bulk_create(User(username=f'buyer{i}') for i in range(options['buyers']))
+        carts = Cart.objects.bulk_create(Cart(user=user) for user in users)
+        CartItem.objects.bulk_create(
+            CartItem(cart=cart, product=products[(n + k) % len(products)], quantity=1)
+            for n, cart in enumerate(carts) for k in range(min(options['items'], len(products)))
+        )
+
+        queue = list(users)
+        lock = threading.Lock()
+        outcome = {'placed': 0, 'insufficient': 0, 'locked': 0}
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        if not queue:
+                            return
+                        user = queue.pop()
+                    try:
+                        place_order(user)
+                        result = 'placed'
+                    except InsufficientStock:
+                        result = 'insufficient'
+                    except OperationalError:
+                        result = 'locked'
+                    with lock:
+                        outcome[result] += 1
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        initial = options['stock'] * len(products)
+        remaining = Product.objects.aggregate(total=Sum('stock'))['total']
+        sold = OrderItem.objects.aggregate(total=Sum('quantity'))['total'] or 0
+        negative = Product.objects.filter(stock__lt=0).count()
+        return {
+            **outcome,
+            'threads': options['threads'],
+            'seconds': round(elapsed, 3),
+            'checkouts_per_sec': round((outcome['placed'] + outcome['insufficient']) / elapsed, 1),
+            'initial_stock': initial,
+            'sold': sold,
+            'remaining_stock': remaining,
+            'oversold': negative > 0 or sold + remaining != initial or sold > initial,
+        }
@@ -0,0 +1,47 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+
+from store.bench import measure, scratch_database, seed_catalog
+from store.listing import rebuild_listings
+from store.models import Product, ProductImage
+
+
+class Command(BaseCommand):
+    help = 'ადარებს /api/catalog/listing/-ს ProductViewSet.list-თან (requests/sec, დროებით ბაზაზე)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument('--page-size', type=int, default=20)
+
+    def handle(self, *args, **options):
+        # ქეში გამორთულია - ორივე გზა ყოველ ჯერზე ბაზიდან იკითხება
+        with scratch_database(), override_settings(
+                ALLOWED_HOSTS=['*'],
+                CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            self.stderr.write(f"Seeding {options['products']} products...")
+            seed_catalog(options['products'])
+            ProductImage.objects.bulk_create(
+                ProductImage(product_id=pk, image=f'product_images/p{pk}-{n}.jpg')
+                for pk in Product.objects.values_list('pk', flat=True) for n in range(2))
+            rebuild_listings()
+
+            client = Client()
+            query = f"?page_size={options['page_size']}"
+
+            def get(path):
+                def run():
+                    response = client.get(path + query)
+                    assert response.status_code == 200, response.status_code
+                return run
+
+            report = {
+                'products': options['products'],
+                'page_size': options['page_size'],
+                'product_viewset_list': measure(get('/api/products/'), repeat=options['repeat']),
+                'product_listing': measure(get('/api/catalog/listing/'), repeat=options['repeat']),
+            }
+        self.stdout.write(json.dumps(report, indent=2))
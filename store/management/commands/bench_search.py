@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from store.bench import measure, scratch_database, seed_catalog
+from store.models import Product
+from store.search import FullTextSearchFilter
+
+
+class Command(BaseCommand):
+    help = 'ადარებს FTS5 ძებნას icontains SearchFilter-თან დროებით ბაზაზე (ნაგულისხმევად 100k პროდუქტი)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=30)
+        parser.add_argument('--terms', nargs='+', default=['სავარძ', 'ტყავის დივანი', 'მუხის მაგიდა'])
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            self.stderr.write(f"Seeding {options['products']} products...")
+            seed_catalog(options['products'])
+            base = Product.objects.filter(is_available=True)
+            fts = FullTextSearchFilter()
+            report = {'products': options['products'], 'terms': {}}
+
+            for term in options['terms']:
+                def run_fts():
+                    request = _FakeRequest(term)
+                    return list(fts.filter_queryset(request, base, view=None)[:20])
+
+                def run_icontains():
+                    query = Q()
+                    for word in term.split():
+                        query &= Q(name__icontains=word) | Q(description__icontains=word)
+                    return list(base.filter(query)[:20])
+
+                report['terms'][term] = {
+                    'fts5': measure(run_fts, repeat=options['repeat']),
+                    'icontains': measure(run_icontains, repeat=options['repeat']),
+                }
+
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+class _FakeRequest:
+    """ filter_queryset-ს მხოლოდ query_params სჭირდება """
+
+    def __init__(self, term):
+        self.query_params = {'search': term}
@@ -0,0 +1,137 @@
+import json
+import random
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+from django.test.utils import override_settings
+
+from store.bench import percentile, scratch_database
+from store.checkout import place_order
+from store.database import read_pragmas, sqlite_pragmas
+from store.models import Cart, CartItem, Category, Product
+from store.taskqueue import wait_for_tasks
+
+DUMMY_EMAIL_BACKEND = 'django.core.mail.backends.dummy.EmailBackend'
+# ძველი პროფილი: rollback journal, deferred ტრანზაქციები, ახალი კავშირი ყოველ ოპერაციაზე
+PROFILES = {
+    'baseline': {'options': {}, 'pragmas': {'journal_mode': 'DELETE'}, 'reconnect': True},
+    'tuned': {'options': None, 'pragmas': None, 'reconnect': False},  # None - მიმდინარე პროფილი (settings/DEFAULT_PRAGMAS)
+}
+
+
+class Command(BaseCommand):
+    help = 'SQLite-ის კონკურენტული read/write benchmark: baseline vs WAL + PRAGMA-ები + BEGIN IMMEDIATE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5.0)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--products', type=int, default=2000)
+        parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+
+    def handle(self, *args, **options):
+        report = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in options['profiles']:
+                profile = PROFILES[name]
+                pragmas = sqlite_pragmas() if profile['pragmas'] is None else profile['pragmas']
+                # checkout-ის outbox email-ები ფონურად იგზავნება - benchmark-ში dummy backend
+                with override_settings(SQLITE_PRAGMAS=pragmas, EMAIL_BACKEND=DUMMY_EMAIL_BACKEND), \
+                        scratch_database(path=Path(tmp) / f'{name}.sqlite3'):
+                    report[name] = self.run_profile(profile, options)
+                    wait_for_tasks()
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def run_profile(self, profile, options):
+        saved_options = connection.settings_dict['OPTIONS']
+        if profile['options'] is not None:
+            connection.settings_dict['OPTIONS'] = profile['options']
+        connections.close_all()
+        try:
+            product_ids, users = self.seed(options)
+            result = self.run_load(product_ids, users, profile['reconnect'], options)
+            result['pragmas'] = read_pragmas(connection, ['journal_mode', 'synchronous', 'busy_timeout'])
+            return result
+        finally:
+            connection.settings_dict['OPTIONS'] = saved_options
+            connections.close_all()
+
+    def seed(self, options):
+        category = Category.objects.create(name='Bench', slug='bench')
+        products = Product.objects.bulk_create(
+            Product(category=category, name=f'Product {i}', slug=f'product-{i}', description='',
+                    price=Decimal('10.00'), stock=10 ** 6)
+            for i in range(options['products'])
+        )
+        User = get_user_model()
+        users = User.objects.bulk_create(User(username=f'writer{i}') for i in range(options['writers']))
+        Cart.objects.bulk_create(Cart(user=user) for user in users)
+        return [product.pk for product in products], users
+
+    def run_load(self, product_ids, users, reconnect, options):
+        deadline = time.perf_counter() + options['seconds']
+        lock = threading.Lock()
+        stats = {kind: {'ok': 0, 'locked': 0, 'latencies': []} for kind in ('read', 'write')}
+
+        def record(kind, started, ok):
+            with lock:
+                stats[kind]['ok' if ok else 'locked'] += 1
+                stats[kind]['latencies'].append(time.perf_counter() - started)
+
+        def loop(kind, operation):
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        operation()
+                        ok = True
+                    except OperationalError:
+                        ok = False
+                    record(kind, started, ok)
+                    if reconnect:
+                        connection.close()
+            finally:
+                connections.close_all()
+
+        def reader(seed):
+            rng = random.Random(seed)
+
+            def operation():
+                list(Product.objects.filter(is_available=True).select_related('category')
+                     .order_by('-created_at')[:20])
+                Product.objects.filter(pk=rng.choice(product_ids)).first()
+            loop('read', operation)
+
+        def writer(user, seed):
+            rng = random.Random(seed)
+            cart_id = Cart.objects.filter(user=user).values_list('pk', flat=True).first()
+
+            def operation():
+                CartItem.objects.apply_deltas(cart_id, {pk: 1 for pk in rng.sample(product_ids, 3)})
+                place_order(user)
+            loop('write', operation)
+
+        threads = [threading.Thread(target=reader, args=(n,)) for n in range(options['readers'])]
+        threads += [threading.Thread(target=writer, args=(user, n)) for n, user in enumerate(users)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            kind: {
+                'ok': values['ok'],
+                'locked_errors': values['locked'],
+                'ops_per_sec': round(values['ok'] / elapsed, 1),
+                'p95_ms': round(percentile(values['latencies'], 0.95) * 1000, 2) if values['latencies'] else None,
+            }
+            for kind, values in stats.items()
+        }
@@ -0,0 +1,46 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from store.images import render_variants, save_variants
+from store.models import Category, ProductImage
+
+
+class Command(BaseCommand):
+    help = 'არსებული სურათების ვარიანტების (thumbnail/WebP/AVIF) აგება პარალელურად ყველა ბირთვზე'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--force', action='store_true', help='ვარიანტების თავიდან ჩაწერა ბაზაში')
+
+    def handle(self, *args, **options):
+        jobs = []
+        for model in (ProductImage, Category):
+            for pk, name, variants in model.objects.exclude(image='').exclude(image__isnull=True) \
+                    .values_list('pk', 'image', 'variants').iterator(chunk_size=500):
+                if options['force'] or (variants or {}).get('source') != name:
+                    jobs.append((model, pk, name))
+
+        if not jobs:
+            self.stdout.write('Nothing to do.')
+            return
+
+        # fork-მდე კავშირები იხურება - შვილობილი პროცესები ბაზას არ ეხებიან
+        connections.close_all()
+        done = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {pool.submit(render_variants, name): (model, pk, name) for model, pk, name in jobs}
+            for future in as_completed(futures):
+                model, pk, name = futures[future]
+                try:
+                    variants = future.result()
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'{model.__name__} #{pk} ({name}): {exc}')
+                    continue
+                save_variants(model, pk, variants)
+                done += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Built variants for {done} images ({failed} failed).'))
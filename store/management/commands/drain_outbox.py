@@ -0,0 +1,43 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from store.outbox import drain
+
+
+class Command(BaseCommand):
+    help = 'outbox-ის მოვლენების დამუშავება worker ნაკადების pool-ით'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'OUTBOX_BATCH_SIZE', 100))
+        parser.add_argument('--loop', action='store_true', help='განუწყვეტლივ მუშაობა')
+        parser.add_argument('--idle-sleep', type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        totals = {'processed': 0, 'failed': 0}
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    result = drain(options['batch_size'])
+                    with lock:
+                        for key, value in result.items():
+                            totals[key] += value
+                    if not options['loop']:
+                        return
+                    if not any(result.values()):
+                        time.sleep(options['idle_sleep'])
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(options['workers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.stdout.write(f"processed={totals['processed']} failed={totals['failed']}")
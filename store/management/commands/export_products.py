@@ -0,0 +1,24 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from store.catalog_io import FORMATS, export_rows
+
+
+class Command(BaseCommand):
+    help = 'პროდუქტების ექსპორტი CSV/JSONL-ში ნაკადად (მუდმივი მეხსიერებით)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help="ფაილის მისამართი ან '-' (stdout)")
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        stream = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8', newline='')
+        try:
+            for part in export_rows(fmt=options['format'], chunk_size=options['chunk_size']):
+                stream.write(part)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
@@ -0,0 +1,29 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from store.catalog_io import FORMATS, import_products, read_rows
+
+
+class Command(BaseCommand):
+    help = 'პროდუქტების მასიური იმპორტი CSV/JSONL ფაილიდან (upsert slug-ით)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="ფაილის მისამართი ან '-' (stdin)")
+        parser.add_argument('--format', choices=FORMATS, default=None,
+                            help='ნაგულისხმევად ფაილის გაფართოებიდან')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+        try:
+            stream = sys.stdin if path == '-' else open(path, encoding='utf-8-sig', newline='')
+        except OSError as exc:
+            raise CommandError(exc)
+
+        with stream:
+            report = import_products(read_rows(stream, fmt), chunk_size=options['chunk_size'])
+
+        self.stdout.write(json.dumps(report.as_dict(), ensure_ascii=False, indent=2))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from store.order_stats import rebuild_order_stats
+
+
+class Command(BaseCommand):
+    help = 'UserOrderStats-ის reconciliation Order-იდან (მომხმარებლების chunk-ებად, aggregate query-ებით)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        refreshed = rebuild_order_stats(chunk_size=options['chunk_size'])
+        self.stdout.write(f'Rebuilt order stats for {refreshed} users')
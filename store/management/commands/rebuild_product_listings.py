@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from store.listing import rebuild_listings
+
+
+class Command(BaseCommand):
+    help = 'ProductListing read model-ის სრული აღდგენა (chunk-ებად upsert)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        refreshed = rebuild_listings(chunk_size=options['chunk_size'])
+        self.stdout.write(f'Rebuilt {refreshed} product listings')
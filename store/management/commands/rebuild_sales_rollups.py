@@ -0,0 +1,24 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from store.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'SalesRollup-ის (დღე, პროდუქტი) bucket-ების აღდგენა OrderItem-იდან, დღეების chunk-ებად'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, help='YYYY-MM-DD (ნაგულისხმევად - პირველი შეკვეთა)')
+        parser.add_argument('--end', type=date.fromisoformat, help='YYYY-MM-DD (ნაგულისხმევად - ბოლო შეკვეთა)')
+        parser.add_argument('--chunk-days', type=int, default=31)
+        parser.add_argument('--engine', default='sql', choices=['sql', 'pandas'],
+                            help='pandas - ვექტორული დაჯგუფება (pip install pandas)')
+
+    def handle(self, *args, **options):
+        try:
+            written = rebuild_rollups(start=options['start'], end=options['end'],
+                                      chunk_days=options['chunk_days'], engine=options['engine'])
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(f'Rebuilt {written} sales rollup buckets')
@@ -0,0 +1,81 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+
+from store.bench import scratch_database
+from store.benchmarks.fixtures import SCALES, generate_fixtures
+from store.benchmarks.runner import build_report, compare_reports, issue_tokens, run_scenario
+from store.benchmarks.scenarios import SCENARIOS
+from store.benchmarks.servers import SERVERS, local_server
+from store.benchmarks.transport import HTTPTransport, InProcessTransport
+from store.taskqueue import wait_for_tasks
+
+
+class Command(BaseCommand):
+    help = ('Benchmark-ების ნაკრები დროებით ბაზაზე: browse, search, add_to_cart, checkout, order_history '
+            '(throughput, p50/p95/p99, query-ები მოთხოვნაზე) -> JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+        parser.add_argument('--scale', default='small', choices=list(SCALES))
+        parser.add_argument('--iterations', type=int, default=50, help='იტერაციები სცენარზე')
+        parser.add_argument('--concurrency', type=int, default=1)
+        parser.add_argument('--server', default='inprocess', choices=['inprocess', *SERVERS],
+                            help='inprocess - django.test.Client; wsgi/uvicorn - ლოკალური სერვერი')
+        parser.add_argument('--with-cache', action='store_true', help='კატალოგის ქეში ჩართული')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='JSON რეპორტის ფაილი')
+        parser.add_argument('--compare', help='წინა რეპორტი (JSON) - რეგრესიები stderr-ში')
+        parser.add_argument('--threshold', type=float, default=0.10, help='დასაშვები გაუარესება (0.10 = 10%%)')
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        sizes = SCALES[options['scale']]
+        overrides = {'EMAIL_BACKEND': 'django.core.mail.backends.dummy.EmailBackend', 'ALLOWED_HOSTS': ['*']}
+        if not options['with_cache']:
+            overrides['CATALOG_CACHE_TIMEOUT'] = 0
+        # ფაილური ბაზა - ნაკადები და სერვერის პროცესი ერთსა და იმავე მონაცემებს ხედავენ
+        with tempfile.TemporaryDirectory() as tmp, override_settings(**overrides), \
+                scratch_database(path=Path(tmp) / 'bench.sqlite3') as connection:
+            self.stderr.write(f"Generating fixtures ({options['scale']}: {sizes})...")
+            fixtures = generate_fixtures(seed=options['seed'], **sizes)
+            tokens = issue_tokens(fixtures)
+            db_path = connection.settings_dict['NAME']
+            connections.close_all()
+
+            if options['server'] == 'inprocess':
+                results = self.run_all(InProcessTransport, fixtures, tokens, options)
+            else:
+                try:
+                    with local_server(options['server'], db_path, with_cache=options['with_cache']) as port:
+                        results = self.run_all(lambda: HTTPTransport(port), fixtures, tokens, options)
+                except RuntimeError as exc:
+                    raise CommandError(str(exc))
+            wait_for_tasks()
+
+        report = build_report(results, options['server'], sizes, options)
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            Path(options['output']).write_text(output + '\n', encoding='utf-8')
+        self.stdout.write(output)
+
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text(encoding='utf-8'))
+            regressions = compare_reports(baseline, report, threshold=options['threshold'])
+            for regression in regressions:
+                self.stderr.write(self.style.WARNING(
+                    f"{regression['step']}: {regression['metric']} {regression['baseline']} -> {regression['current']}"))
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'{len(regressions)} regression(s) against {options["compare"]}')
+
+    def run_all(self, make_transport, fixtures, tokens, options):
+        results = {}
+        for name in options['scenarios']:
+            self.stderr.write(f'Running {name}...')
+            results[name] = run_scenario(name, make_transport, fixtures, tokens, iterations=options['iterations'],
+                                         concurrency=options['concurrency'], seed=options['seed'])
+        return results
@@ -0,0 +1,43 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from store.taskqueue import get_task
+
+
+class Command(BaseCommand):
+    help = 'CELERY_BEAT_SCHEDULE-ის პერიოდული ამოცანების გაშვება broker-ის (Redis/Celery) გარეშე'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='ყველა ამოცანის ერთხელ გაშვება და გასვლა')
+        parser.add_argument('--tick', type=float, default=30.0, help='შემოწმების ინტერვალი (წამი)')
+
+    def load_schedule(self):
+        entries = []
+        for label, entry in getattr(settings, 'CELERY_BEAT_SCHEDULE', {}).items():
+            interval = entry['schedule']
+            if isinstance(interval, (int, float)):
+                interval = timedelta(seconds=interval)
+            if not isinstance(interval, timedelta):
+                raise CommandError(f'{label}: only timedelta/seconds schedules are supported')
+            entries.append((label, get_task(entry['task']), interval,
+                            entry.get('args', ()), entry.get('kwargs', {})))
+        return entries
+
+    def handle(self, *args, **options):
+        entries = self.load_schedule()
+        next_run = {label: 0.0 for label, *_ in entries}
+        while True:
+            now = time.monotonic()
+            for label, task, interval, task_args, task_kwargs in entries:
+                if now < next_run[label]:
+                    continue
+                next_run[label] = now + interval.total_seconds()
+                started = time.perf_counter()
+                result = task(*task_args, **task_kwargs)
+                self.stdout.write(f'{label}: {result} ({time.perf_counter() - started:.3f}s)')
+            if options['once']:
+                return
+            time.sleep(options['tick'])
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='store_order_user_id_435f58_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['is_available', '-created_at', '-id'], name='store_produ_is_avai_f4f892_idx'),
+        ),
+    ]
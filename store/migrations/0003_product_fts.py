@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_fts(apps, schema_editor):
+    from store.search import install_fts
+
+    install_fts(schema_editor.connection, rebuild=True)
+
+
+def drop_fts(apps, schema_editor):
+    from store.search import FTS_TABLE
+
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for suffix in ('ai', 'ad', 'au'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:09
+
+import django.db.models.deletion
+import store.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0003_product_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSearchIndex',
+            fields=[
+                ('product', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='store.product')),
+                ('document', store.search.FTSDocumentField(db_column='store_product_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'store_product_fts',
+                'managed': False,
+            },
+        ),
+    ]
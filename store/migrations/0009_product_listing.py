@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0008_outbox_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductListing',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='listing', serialize=False, to='store.product')),
+                ('is_available', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+                ('payload', models.TextField()),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='store.category')),
+            ],
+            options={
+                'ordering': ['-created_at', '-product_id'],
+                'indexes': [models.Index(fields=['is_available', '-created_at', '-product'], name='store_produ_is_avai_bbd2ad_idx'), models.Index(fields=['category', 'is_available', '-created_at', '-product'], name='store_produ_categor_f0d7ff_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0009_product_listing'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserOrderStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('order_count', models.IntegerField(default=0)),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('last_order_at', models.DateTimeField(blank=True, null=True)),
+                ('pending_count', models.IntegerField(default=0)),
+                ('processing_count', models.IntegerField(default=0)),
+                ('shipped_count', models.IntegerField(default=0)),
+                ('delivered_count', models.IntegerField(default=0)),
+                ('canceled_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0010_user_order_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('quantity', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='store.category')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='store.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'date'], name='store_sales_product_ac5e84_idx'), models.Index(fields=['category', 'date'], name='store_sales_categor_c25f8e_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'product'), name='store_salesrollup_date_product_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0011_sales_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['color'], name='store_produ_color_4b4fa3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['material'], name='store_produ_materia_4f16dc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['price'], name='store_produ_price_2d55a6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['category', 'color', 'material', 'price', 'is_available'], name='store_product_facets_idx'),
+        ),
+    ]
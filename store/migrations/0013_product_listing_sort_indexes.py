@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0012_product_facet_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='store_produ_is_avai_f4f892_idx',
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['-created_at', '-id'], name='store_product_newest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['category', '-created_at', '-id'], name='store_product_cat_newest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['category', 'price', 'id'], name='store_product_cat_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('featured', True), ('is_available', True)), fields=['-created_at', '-id'], name='store_product_featured_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0013_product_listing_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField()),
+                ('expires_at', models.DateTimeField()),
+                ('cart', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='holds', to='store.cart')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='store.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['expires_at'], name='store_stockhold_expiry_idx'), models.Index(fields=['product', 'expires_at', 'cart', 'quantity'], name='store_stockhold_active_idx')],
+                'constraints': [models.UniqueConstraint(fields=('cart', 'product'), name='store_stockhold_cart_product_uniq')],
+            },
+        ),
+    ]
@@ -1,7 +1,11 @@
 from django.db import models
+from django.db.models import F, Sum
 from django.conf import settings # ⭐ CORRECTED: settings-ის იმპორტი
 from django.utils import timezone
 
+from .querysets import CartItemQuerySet, CartQuerySet, money_field
+from .search import FTS_TABLE, FTSDocumentField
+
 
 # ====================================================
 # 1. Category Model
@@ -14,7 +18,10 @@ class Category(models.Model):
     is_active = models.BooleanField(default=True)
 
     image = models.ImageField(upload_to='category_images/', blank=True, null=True)
+    # thumbnail/WebP/AVIF ვარიანტები (store.images.render_variants)
+    variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Categories"
@@ -47,13 +54,79 @@ class Product(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['category']),
+            # ?ordering=name; ?price_min=/?price_max= და ?ordering=price (rowid = id tie-breaker-ი)
             models.Index(fields=['name']),
+            models.Index(fields=['price']),
+            # ?color= / ?material= ფილტრები
+            models.Index(fields=['color']),
+            models.Index(fields=['material']),
+            # სიის ინდექსები ნაწილობრივია (WHERE is_available): Django is_available=True-ს
+            # "WHERE is_available"-ად წერს, რასაც SQLite (is_available, ...) ინდექსის ტოლობად ვერ
+            # იყენებს და ORDER BY-ს temp B-tree-ით ალაგებს; იგივე WHERE-იანი ინდექსი კი ემთხვევა.
+            # keyset პაგინაცია: ORDER BY created_at DESC, id DESC (in_stock - იმავე რიგით სკანირება)
+            models.Index(fields=['-created_at', '-id'], name='store_product_newest_idx',
+                         condition=models.Q(is_available=True)),
+            models.Index(fields=['category', '-created_at', '-id'], name='store_product_cat_newest_idx',
+                         condition=models.Q(is_available=True)),
+            models.Index(fields=['category', 'price', 'id'], name='store_product_cat_price_idx',
+                         condition=models.Q(is_available=True)),
+            # ?featured=true - პატარა ინდექსი მხოლოდ გამორჩეულ პროდუქტებზე
+            models.Index(fields=['-created_at', '-id'], name='store_product_featured_idx',
+                         condition=models.Q(is_available=True, featured=True)),
+            # facet-ების GROUP BY (store.facets) მხოლოდ ინდექსიდან იკითხება - ცხრილს არ ეხება.
+            # is_available ბოლოშიცაა - SQLite მხოლოდ WHERE-ში ნახსენებ სვეტს ინდექსიდან არ კითხულობს
+            models.Index(fields=['category', 'color', 'material', 'price', 'is_available'],
+                         name='store_product_facets_idx',
+                         condition=models.Q(is_available=True)),
         ]
 
     def __str__(self):
         return self.name
 
 
+# ====================================================
+# 2.1 ProductSearchIndex (SQLite FTS5 ვირტუალური ცხრილი)
+# ====================================================
+
+class ProductSearchIndex(models.Model):
+    """
+    FTS5 ინდექსის unmanaged ასახვა: ცხრილს და ტრიგერებს store.search.install_fts ქმნის,
+    მოდელი კი მხოლოდ JOIN-ისთვის (Product.search_index) და rank-ისთვის არსებობს.
+    """
+    product = models.OneToOneField(Product, on_delete=models.DO_NOTHING, primary_key=True,
+                                   db_column='rowid', related_name='search_index')
+    document = FTSDocumentField(db_column=FTS_TABLE)
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = FTS_TABLE
+
+
+# ====================================================
+# 2.2 ProductListing (კატალოგის სიის read model)
+# ====================================================
+
+class ProductListing(models.Model):
+    """
+    პროდუქტის სიის ბარათი წინასწარ სერიალიზებული JSON-ით (store.listing). სიის endpoint
+    payload-ებს პირდაპირ აერთებს - JOIN-ებისა და ველ-ველ სერიალიზაციის გარეშე.
+    ფილტრაციისა და keyset პაგინაციის ველები ცალკე სვეტებადაა.
+    """
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='listing')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='+')
+    is_available = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    payload = models.TextField()
+
+    class Meta:
+        ordering = ['-created_at', '-product_id']
+        indexes = [
+            models.Index(fields=['is_available', '-created_at', '-product']),
+            models.Index(fields=['category', 'is_available', '-created_at', '-product']),
+        ]
+
+
 # ====================================================
 # 3. ProductImage Model (Galery)
 # ====================================================
@@ -61,6 +134,8 @@ class Product(models.Model):
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='product_images/')
+    # thumbnail/WebP/AVIF ვარიანტები (store.images.render_variants)
+    variants = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return f"Image for {self.product.name}"
@@ -76,12 +151,19 @@ class Cart(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CartQuerySet.as_manager()
+
     def __str__(self):
         return f"Cart of {self.user.username}"
 
     @property
     def total_price(self):
-        return sum(item.sub_total for item in self.items.all())
+        # Cart.objects.with_totals()-ის ანოტაცია, წინააღმდეგ შემთხვევაში - ერთი aggregate query
+        if hasattr(self, 'items_total'):
+            return self.items_total
+        return self.items.aggregate(
+            total=Sum(F('quantity') * F('product__price'), output_field=money_field()),
+        )['total'] or 0
 
 
 # ====================================================
@@ -93,6 +175,8 @@ class CartItem(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)
 
+    objects = CartItemQuerySet.as_manager()
+
     class Meta:
         unique_together = ('cart', 'product')
 
@@ -101,6 +185,8 @@ class CartItem(models.Model):
 
     @property
     def sub_total(self):
+        if hasattr(self, 'line_total'):
+            return self.line_total
         return self.quantity * self.product.price
 
 
@@ -129,6 +215,12 @@ class Order(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # შეკვეთების ისტორია: WHERE user_id ORDER BY created_at DESC, id DESC
+            models.Index(fields=['user', '-created_at', '-id']),
+            # store.tasks.auto_update_order_status: WHERE status = ? AND created_at < ?
+            models.Index(fields=['status', 'created_at']),
+        ]
 
     def __str__(self):
         return f"Order {self.id} by {self.user.username}"
@@ -145,4 +237,127 @@ class OrderItem(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
 
     def __str__(self):
-        return f"{self.quantity} x {self.product.name} in Order {self.order.id}"
\ No newline at end of file
+        return f"{self.quantity} x {self.product.name} in Order {self.order.id}"
+
+
+# ====================================================
+# 8. OutboxEvent (ტრანზაქციული outbox)
+# ====================================================
+
+class OutboxEvent(models.Model):
+    """
+    გვერდითი ეფექტი (email, ანალიტიკა), რომელიც იმავე ტრანზაქციაში იწერება, რაც შეკვეთა.
+    თითო ჩანაწერი თითო handler-ზე - წარუმატებელი handler-ი სხვებს თავიდან არ უშვებს.
+    """
+    topic = models.CharField(max_length=100)
+    handler = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # claim/retry: ჩანაწერი ხელმისაწვდომია available_at-დან (lease ან backoff)
+    available_at = models.DateTimeField(default=timezone.now)
+    claim = models.CharField(max_length=32, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # მხოლოდ დაუმუშავებელი ჩანაწერები - ინდექსი პატარა რჩება
+            models.Index(fields=['available_at', 'id'], name='store_outbox_pending_idx',
+                         condition=models.Q(processed_at__isnull=True)),
+            models.Index(fields=['claim'], name='store_outbox_claim_idx',
+                         condition=models.Q(processed_at__isnull=True)),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} -> {self.handler} #{self.pk}"
+
+
+# ====================================================
+# 9. UserOrderStats (შეკვეთების ისტორიის აგრეგატები)
+# ====================================================
+
+class UserOrderStats(models.Model):
+    """
+    მომხმარებლის შეკვეთების შეჯამება - /api/orders/summary/ ერთი ჩანაწერის წაკითხვაა.
+    ინკრემენტულად ახლდება იმავე ტრანზაქციაში, რაც შეკვეთა (იხ. store.order_stats);
+    rebuild_order_stats ბრძანება Order-იდან თავიდან აგებს. total_spent გაუქმებულ შეკვეთებს არ ითვლის.
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True,
+                                related_name='order_stats')
+    order_count = models.IntegerField(default=0)
+    total_spent = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    last_order_at = models.DateTimeField(null=True, blank=True)
+    # სტატუსების მრიცხველები - სახელები: <status>_count (Order.STATUS_CHOICES)
+    pending_count = models.IntegerField(default=0)
+    processing_count = models.IntegerField(default=0)
+    shipped_count = models.IntegerField(default=0)
+    delivered_count = models.IntegerField(default=0)
+    canceled_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Order stats for user {self.user_id}"
+
+
+# ====================================================
+# 10. SalesRollup (დღიური გაყიდვების აგრეგატები)
+# ====================================================
+
+class SalesRollup(models.Model):
+    """
+    (დღე, პროდუქტი) bucket-ი: გაყიდული რაოდენობა, შემოსავალი და შეკვეთების რაოდენობა.
+    დღე - შეკვეთის created_at TIME_ZONE-ში; გაუქმებული შეკვეთები არ ითვლება. ანალიტიკის
+    endpoint-ები მხოლოდ ამ ცხრილს კითხულობენ (იხ. store.analytics).
+    """
+    date = models.DateField()
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    # დენორმალიზებული - შემოსავალი კატეგორიებით JOIN-ის გარეშე
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='+')
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    order_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # WHERE date BETWEEN ? AND ? (top-N, კატეგორიები) - ეს ინდექსი ემსახურება
+            models.UniqueConstraint(fields=['date', 'product'], name='store_salesrollup_date_product_uniq'),
+        ]
+        indexes = [
+            # დროითი მწკრივი ერთი პროდუქტის ან კატეგორიის ფილტრით
+            models.Index(fields=['product', 'date']),
+            models.Index(fields=['category', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.date}: product {self.product_id} x {self.quantity}"
+
+
+# ====================================================
+# 11. StockHold (კალათის დროებითი რეზერვაცია)
+# ====================================================
+
+class StockHold(models.Model):
+    """
+    კალათაში დამატებისას მარაგის დროებითი დაკავება (TTL). გასაყიდად ხელმისაწვდომი =
+    stock - აქტიური (expires_at > now) ჯავშნები; ვადაგასულებს release_expired_holds შლის.
+    ერთი ჩანაწერი კალათის ხაზზე - quantity კალათის რაოდენობის ტოლია.
+    """
+    cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name='holds')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    quantity = models.PositiveIntegerField()
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['cart', 'product'], name='store_stockhold_cart_product_uniq'),
+        ]
+        indexes = [
+            # sweeper: WHERE expires_at <= now LIMIT n
+            models.Index(fields=['expires_at'], name='store_stockhold_expiry_idx'),
+            # SUM(quantity) WHERE product_id = ? AND expires_at > now AND cart_id <> ? - მხოლოდ ინდექსიდან
+            models.Index(fields=['product', 'expires_at', 'cart', 'quantity'], name='store_stockhold_active_idx'),
+        ]
+
+    def __str__(self):
+        return f"Hold {self.quantity} x product {self.product_id} for cart {self.cart_id}"
@@ -0,0 +1,118 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, F, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Order, UserOrderStats
+
+# სტატუსი -> მრიცხველის ველი (PENDING -> pending_count)
+STATUS_FIELDS = {value: f'{value.lower()}_count' for value, _ in Order.STATUS_CHOICES}
+# გაუქმებული შეკვეთა total_spent-ში არ ითვლება
+CANCELED = 'CANCELED'
+
+
+def _spent(status, amount):
+    return Decimal('0') if status == CANCELED else amount
+
+
+# ----------------------------------------------------
+# 1. ინკრემენტული განახლება (შეკვეთის შექმნა, სტატუსის ცვლილება)
+# ----------------------------------------------------
+
+def record_order(order):
+    """
+    ახალი შეკვეთა -> ერთი INSERT ... ON CONFLICT (user_id) DO UPDATE ზრდით. ერთდროული
+    checkout-ები ერთმანეთის ცვლილებას არ კარგავენ (read-modify-write არ არის).
+    bulk_create(update_conflicts=True) F() ზრდას ვერ გამოხატავს - იხ. CartItemQuerySet.apply_deltas.
+    """
+    meta = UserOrderStats._meta
+    qn = connection.ops.quote_name
+    table = qn(meta.db_table)
+    user, count, spent, last, updated = (qn(meta.get_field(name).column) for name in
+                                         ('user', 'order_count', 'total_spent', 'last_order_at', 'updated_at'))
+    # ყველა მრიცხველი ჩამოთვლილია - ველების default-ი Python-შია, ბაზაში არა
+    counters = [qn(field) for field in STATUS_FIELDS.values()]
+    status = qn(STATUS_FIELDS[order.status])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} ({user}, {count}, {spent}, {last}, {updated}, {", ".join(counters)}) '
+            f'VALUES (%s, 1, %s, %s, %s, {", ".join(["%s"] * len(counters))}) '
+            f'ON CONFLICT ({user}) DO UPDATE SET {count} = {table}.{count} + 1, '
+            f'{spent} = {table}.{spent} + excluded.{spent}, {status} = {table}.{status} + 1, '
+            f'{last} = CASE WHEN {table}.{last} IS NULL OR {table}.{last} < excluded.{last} '
+            f'THEN excluded.{last} ELSE {table}.{last} END, {updated} = excluded.{updated}',
+            [order.user_id, _spent(order.status, order.total_price), order.created_at, timezone.now(),
+             *(int(counter == status) for counter in counters)],
+        )
+
+
+def shift_status(order_ids, source, target):
+    """
+    order_ids - შეკვეთების pk-ები (სია ან values('pk') ქვე-query), რომლებიც source-დან target-ში გადადის.
+    ერთი set-based UPDATE: source_count -= n, target_count += n, სადაც n კორელირებული COUNT-ია
+    მომხმარებელზე; total_spent იცვლება მხოლოდ CANCELED-ში შესვლისას ან გამოსვლისას.
+    ქვე-query სტატუსს არ ამოწმებს - შეიძლება გამოიძახო Order-ის UPDATE-მდეც და შემდეგაც.
+    """
+    if source == target:
+        return 0
+    moved = Order.objects.filter(pk__in=order_ids, user_id=OuterRef('user_id')).order_by().values('user_id')
+    count = Subquery(moved.annotate(n=Count('pk')).values('n'), output_field=IntegerField())
+    changes = {STATUS_FIELDS[source]: F(STATUS_FIELDS[source]) - count,
+               STATUS_FIELDS[target]: F(STATUS_FIELDS[target]) + count,
+               'updated_at': timezone.now()}
+    if CANCELED in (source, target):
+        amount = Subquery(moved.annotate(total=Sum('total_price')).values('total'),
+                          output_field=DecimalField(max_digits=14, decimal_places=2))
+        changes['total_spent'] = F('total_spent') + amount if source == CANCELED else F('total_spent') - amount
+    users = Order.objects.filter(pk__in=order_ids).values('user_id')
+    return UserOrderStats.objects.filter(user_id__in=users).update(**changes)
+
+
+# ----------------------------------------------------
+# 2. ზუსტი გადათვლა Order-იდან (chunk-ებად)
+# ----------------------------------------------------
+
+def aggregate_orders(user_ids):
+    """ ერთი GROUP BY user_id query: რაოდენობა, თანხა, ბოლო თარიღი და სტატუსების მრიცხველები """
+    counters = {field: Count('pk', filter=Q(status=value)) for value, field in STATUS_FIELDS.items()}
+    return (Order.objects.filter(user_id__in=user_ids).order_by().values('user_id')
+            .annotate(order_count=Count('pk'), last_order_at=Max('created_at'),
+                      total_spent=Coalesce(Sum('total_price', filter=~Q(status=CANCELED)), Value(Decimal('0')),
+                                           output_field=DecimalField(max_digits=14, decimal_places=2)),
+                      **counters))
+
+
+def refresh_user_stats(user_ids):
+    """
+    user_ids-ის სტატისტიკა თავიდან: aggregate query + bulk upsert; შეკვეთების გარეშე
+    დარჩენილი მომხმარებლების ჩანაწერები იშლება. აბრუნებს განახლებული ჩანაწერების რაოდენობას.
+    """
+    user_ids = [user_id for user_id in set(user_ids) if user_id is not None]
+    if not user_ids:
+        return 0
+    now = timezone.now()
+    rows = [UserOrderStats(updated_at=now, **row) for row in aggregate_orders(user_ids)]
+    fields = ['order_count', 'total_spent', 'last_order_at', *STATUS_FIELDS.values(), 'updated_at']
+    with transaction.atomic():
+        UserOrderStats.objects.bulk_create(rows, update_conflicts=True, unique_fields=['user'], update_fields=fields)
+        UserOrderStats.objects.filter(user_id__in=user_ids).exclude(
+            user_id__in=[row.user_id for row in rows]).delete()
+    return len(rows)
+
+
+def rebuild_order_stats(chunk_size=1000):
+    """
+    სრული reconciliation: მომხმარებლები pk-ის მიხედვით chunk-ებად (keyset), თითო chunk-ზე ერთი
+    aggregate query და ერთი upsert - ინკრემენტული განახლებების შესაძლო drift-ი სწორდება.
+    """
+    users = get_user_model().objects.order_by('pk').values_list('pk', flat=True)
+    refreshed, last_pk = 0, None
+    while True:
+        chunk = list((users if last_pk is None else users.filter(pk__gt=last_pk))[:chunk_size])
+        if not chunk:
+            return refreshed
+        refreshed += refresh_user_stats(chunk)
+        last_pk = chunk[-1]
@@ -0,0 +1,126 @@
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Subquery
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------
+# 1. Handler-ების რეესტრი და გამოქვეყნება
+# ----------------------------------------------------
+
+_handlers = {}
+
+
+def handles(topic):
+    """
+    @handles('order.created') - handler იღებს OutboxEvent-ების სიას (batch) და აბრუნებს
+    წარუმატებელი ჩანაწერების id-ებს (ან აგდებს exception-ს - მაშინ მთელი batch წარუმატებელია).
+    """
+    def decorator(func):
+        name = f'{func.__module__}.{func.__name__}'
+        _handlers.setdefault(topic, {})[name] = func
+        return func
+
+    return decorator
+
+
+def _resolve(name):
+    for handlers in _handlers.values():
+        if name in handlers:
+            return handlers[name]
+    return None
+
+
+def publish(topic, payload):
+    """
+    ჩაწერა მიმდინარე ტრანზაქციაში (bulk_create - ერთი INSERT ყველა handler-ისთვის).
+    commit-ის შემდეგ drain_outbox ფონურად ეშვება, რომ მოვლენა დაყოვნების გარეშე დამუშავდეს.
+    """
+    events = OutboxEvent.objects.bulk_create(
+        OutboxEvent(topic=topic, handler=name, payload=payload) for name in _handlers.get(topic, {})
+    )
+    if events:
+        from .tasks import drain_outbox
+
+        drain_outbox.delay()
+    return events
+
+
+# ----------------------------------------------------
+# 2. დამუშავება batch-ებად
+# ----------------------------------------------------
+
+def _claim(batch_size, lease):
+    """ UPDATE ... SET claim = token WHERE id IN (SELECT ... LIMIT n) - პარალელური worker-ები ერთმანეთს არ ეჯახებიან """
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    pending = (OutboxEvent.objects
+               .filter(processed_at__isnull=True, available_at__lte=now,
+                       attempts__lt=getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5))
+               .order_by('available_at', 'id').values('pk')[:batch_size])
+    claimed = OutboxEvent.objects.filter(pk__in=Subquery(pending), processed_at__isnull=True).update(
+        claim=token, available_at=now + lease, attempts=F('attempts') + 1)
+    if not claimed:
+        return []
+    return list(OutboxEvent.objects.filter(claim=token, processed_at__isnull=True).order_by('id'))
+
+
+def process_batch(batch_size=100, lease=timedelta(minutes=5)):
+    """ ერთი batch: claim -> handler-ები -> processed_at / backoff. აბრუნებს (processed, failed) """
+    events = _claim(batch_size, lease)
+    if not events:
+        return 0, 0
+
+    by_handler = {}
+    for event in events:
+        by_handler.setdefault(event.handler, []).append(event)
+
+    failed, errors = set(), {}
+    for name, batch in by_handler.items():
+        handler = _resolve(name)
+        if handler is None:
+            logger.error('No outbox handler registered as %s', name)
+            continue
+        try:
+            failed.update(handler(batch) or ())
+        except Exception as exc:
+            logger.exception('Outbox handler %s failed', name)
+            ids = {event.pk for event in batch}
+            failed.update(ids)
+            errors.update(dict.fromkeys(ids, repr(exc)))
+
+    now = timezone.now()
+    done = [event.pk for event in events if event.pk not in failed]
+    with transaction.atomic():
+        if done:
+            OutboxEvent.objects.filter(pk__in=done).update(processed_at=now, claim='')
+        if failed:
+            # ექსპონენციალური backoff: 30s, 60s, 120s, ...
+            for event in events:
+                if event.pk in failed:
+                    OutboxEvent.objects.filter(pk=event.pk).update(
+                        claim='', last_error=errors.get(event.pk, 'handler reported failure'),
+                        available_at=now + timedelta(seconds=30 * 2 ** (event.attempts - 1)))
+    return len(done), len(failed)
+
+
+def drain(batch_size=100, max_batches=None):
+    """ ამუშავებს batch-ებს, სანამ ხელმისაწვდომი ჩანაწერები არ ამოიწურება """
+    totals = {'processed': 0, 'failed': 0}
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        processed, failed = process_batch(batch_size)
+        if not processed and not failed:
+            break
+        totals['processed'] += processed
+        totals['failed'] += failed
+        batches += 1
+    return totals
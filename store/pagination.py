@@ -0,0 +1,190 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# ----------------------------------------------------
+# 1. Keyset (Cursor) Pagination
+# ----------------------------------------------------
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Keyset პაგინაცია: შემდეგი გვერდი ირჩევა (created_at, id) < (...) პირობით
+    და არა OFFSET-ით, ამიტომ ღრმა გვერდებიც ინდექსით იკითხება და ახალი ჩანაწერები
+    უკვე ნანახ გვერდებს არ ანაცვლებს. კურსორი გამჭვირვალე base64 სტრიქონია.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    tie_breaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """ OrderingFilter-ის ან Meta.ordering-ის სორტირება + id როგორც tie-breaker """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or [])
+        ordering = [field for field in ordering if isinstance(field, str) and field.lstrip('-') != 'pk']
+        names = [field.lstrip('-') for field in ordering]
+        if self.tie_breaker not in names:
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append(('-' if descending else '') + self.tie_breaker)
+        return ordering
+
+    # --- კურსორის კოდირება ---
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'p': position, 'r': int(reverse), 'o': self.ordering},
+                             separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(raw + '=' * (-len(raw) % 4)))
+            position, reverse = payload['p'], bool(payload['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if payload.get('o') != self.ordering or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [self._field(name).to_python(value) for name, value in zip(self.ordering, position)]
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _field(self, ordering_name):
+        name = ordering_name.lstrip('-')
+        if name in self.annotations:
+            # annotate()-ით დამატებული სორტირება (მაგ. search_rank)
+            return self.annotations[name].output_field
+        return self.model._meta.get_field(name)
+
+    def _position_of(self, instance):
+        position = []
+        for name in self.ordering:
+            name = name.lstrip('-')
+            if isinstance(instance, dict):
+                # values() ჩანაწერები (store.fastpath.FastListMixin)
+                value = instance[name]
+            elif name in self.annotations:
+                value = getattr(instance, name)
+            else:
+                value = self._field(name).value_from_object(instance)
+            position.append(value if isinstance(value, (int, float, str)) else (
+                value.isoformat() if hasattr(value, 'isoformat') else str(value)))
+        return position
+
+    # --- ფილტრი ---
+
+    def _keyset_filter(self, position, reverse):
+        """
+        (a, b) < (x, y) -> a <= x AND (a < x OR (a = x AND b < y)), თითოეული ველის მიმართულებით.
+        წინა a <= x საზღვარი OR-ჯაჭვისგან დამოუკიდებელია: მის გარეშე SQLite ინდექსს
+        თავიდან სკანირებს (SCAN), მასთან კი კურსორის პოზიციაზე ხტება (SEARCH ... a<?).
+        """
+        condition = Q()
+        equal = {}
+        for name, value in zip(self.ordering, position):
+            descending = name.startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            condition |= Q(**equal, **{f'{name.lstrip("-")}__{lookup}': value})
+            equal[name.lstrip('-')] = value
+        first, value = self.ordering[0], position[0]
+        bound = 'lte' if first.startswith('-') != reverse else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{bound}': value}) & condition
+
+    def _page_queryset(self, queryset, request):
+        """ გვერდის queryset (page_size + 1 ჩანაწერი) + კურსორის პოზიცია და მიმართულება """
+        self.request = request
+        self.model = queryset.model
+        self.annotations = queryset.query.annotations
+        self.ordering = self.get_ordering(queryset)
+        self.page_size_value = self.get_page_size(request)
+
+        position, reverse = self.decode_cursor(request)
+        ordering = self.ordering
+        if reverse:
+            ordering = [name[1:] if name.startswith('-') else '-' + name for name in ordering]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._keyset_filter(position, reverse))
+
+        # ერთი დამატებითი ჩანაწერი - ვიცოდეთ, არის თუ არა შემდეგი გვერდი
+        return queryset[:self.page_size_value + 1], position, reverse
+
+    def _finish_page(self, results, position, reverse):
+        has_more = len(results) > self.page_size_value
+        results = results[:self.page_size_value]
+        if reverse:
+            results.reverse()
+
+        self.page = results
+        if reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return results
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, position, reverse = self._page_queryset(queryset, request)
+        return self._finish_page(list(queryset), position, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """ async view-ებისთვის (store.async_api) - იგივე გვერდი `async for`-ით """
+        queryset, position, reverse = self._page_queryset(queryset, request)
+        return self._finish_page([row async for row in queryset], position, reverse)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = self.encode_cursor(self._position_of(self.page[-1]), reverse=False)
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        url = self.request.build_absolute_uri()
+        if not self.page:
+            return remove_query_param(url, self.cursor_query_param)
+        cursor = self.encode_cursor(self._position_of(self.page[0]), reverse=True)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class ListingCursorPagination(KeysetCursorPagination):
+    """ ProductListing-ის პირველადი გასაღები product_id-ია """
+    tie_breaker = 'product_id'
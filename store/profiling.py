@@ -0,0 +1,330 @@
+import bisect
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------
+# 1. Histogram-ები და მრიცხველები (Prometheus text format)
+# ----------------------------------------------------
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}  # labels (tuple) -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series.setdefault(labels, [0] * (len(self.buckets) + 2))
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def exposition(self):
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} histogram'
+        for labels, series in sorted(self.series.items()):
+            label_text = _labels(labels)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), series):
+                cumulative += count
+                yield f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}'
+            yield f'{self.name}_sum{{{label_text}}} {series[-1]:.10g}'
+            yield f'{self.name}_count{{{label_text}}} {cumulative}'
+
+
+class CounterMetric:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.series = Counter()
+
+    def inc(self, labels, amount=1):
+        self.series[labels] += amount
+
+    def exposition(self):
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} counter'
+        for labels, value in sorted(self.series.items()):
+            yield f'{self.name}{{{_labels(labels)}}} {value}'
+
+
+def _labels(labels):
+    method, view = labels
+    view = view.replace('\\', '\\\\').replace('"', '\\"')
+    return f'method="{method}",view="{view}"'
+
+
+# მეტრიკები პროცესის მეხსიერებაშია (locmem ქეშის მსგავსად) - რამდენიმე worker-ისას თითოეულს ცალკე scrape
+REQUEST_DURATION = Histogram('store_request_duration_seconds', 'Wall time per request.', DURATION_BUCKETS)
+RESPONSE_SIZE = Histogram('store_response_size_bytes', 'Response body size.', SIZE_BUCKETS)
+SQL_QUERIES = Histogram('store_request_sql_queries', 'SQL queries per sampled request.', QUERY_COUNT_BUCKETS)
+SQL_DURATION = Histogram('store_request_sql_duration_seconds', 'SQL time per sampled request.', DURATION_BUCKETS)
+SERIALIZE_DURATION = Histogram('store_request_serialize_duration_seconds', 'Serializer time per sampled request.',
+                               DURATION_BUCKETS)
+RENDER_DURATION = Histogram('store_request_render_duration_seconds', 'Renderer time per sampled request.',
+                            DURATION_BUCKETS)
+SAMPLED_REQUESTS = CounterMetric('store_sampled_requests_total', 'Requests profiled in detail.')
+SLOW_QUERIES = CounterMetric('store_slow_queries_total', 'Queries slower than STORE_PERF_SLOW_QUERY_MS.')
+DUPLICATE_QUERIES = CounterMetric('store_duplicate_query_requests_total',
+                                  'Sampled requests that repeated one SQL statement (N+1).')
+METRICS = (REQUEST_DURATION, RESPONSE_SIZE, SQL_QUERIES, SQL_DURATION, SERIALIZE_DURATION, RENDER_DURATION,
+           SAMPLED_REQUESTS, SLOW_QUERIES, DUPLICATE_QUERIES)
+
+_metrics_lock = threading.Lock()
+# ბოლო შემთხვევები ანალიზისთვის (/api/metrics/slow-queries/)
+recent_slow_queries = deque(maxlen=50)
+recent_duplicates = deque(maxlen=50)
+
+
+def render_metrics():
+    with _metrics_lock:
+        lines = [line for metric in METRICS for line in metric.exposition()]
+    return '\n'.join(lines) + '\n'
+
+
+def reset_metrics():
+    with _metrics_lock:
+        for metric in METRICS:
+            metric.series.clear()
+        recent_slow_queries.clear()
+        recent_duplicates.clear()
+
+
+# ----------------------------------------------------
+# 2. მოთხოვნის პროფილი (SQL wrapper, ფაზები)
+# ----------------------------------------------------
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = []  # (alias, sql, params, seconds)
+        self.phases = Counter()
+        self.active_phase = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """ connection.execute_wrapper - ყოველი query-ის დრო """
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((context['connection'].alias, sql, params, time.perf_counter() - started))
+
+    @property
+    def sql_time(self):
+        return sum(query[3] for query in self.queries)
+
+
+_profile = ContextVar('store_request_profile', default=None)
+
+
+@contextmanager
+def phase(name):
+    """ serialize/render ფაზის დრო შერჩეულ მოთხოვნაში; ჩადგმული ფაზა (nested serializer) ცალკე არ ითვლება """
+    profile = _profile.get()
+    if profile is None or profile.active_phase is not None:
+        yield
+        return
+    profile.active_phase = name
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.phases[name] += time.perf_counter() - started
+        profile.active_phase = None
+
+
+class ProfiledSerializerMixin:
+    """ ზედა დონის სერიალიზატორების to_representation -> 'serialize' ფაზა """
+
+    def to_representation(self, instance):
+        with phase('serialize'):
+            return super().to_representation(instance)
+
+
+def _install_wrappers(profile):
+    stack = ExitStack()
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(profile))
+    return stack
+
+
+# ----------------------------------------------------
+# 3. Middleware (sampling, Server-Timing)
+# ----------------------------------------------------
+
+def _should_sample(request):
+    # DEBUG-ში X-Store-Profile: 1 ყოველთვის ზომავს (benchmark-ები, ლოკალური ანალიზი)
+    if settings.DEBUG and request.headers.get('X-Store-Profile') == '1':
+        return True
+    rate = getattr(settings, 'STORE_PERF_SAMPLE_RATE', 0.01)
+    return rate > 0 and (rate >= 1 or random.random() < rate)
+
+
+def _view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match._func_path
+
+
+class PerformanceMiddleware:
+    """
+    ყველა მოთხოვნა: wall time და პასუხის ზომა (view + method მიხედვით). STORE_PERF_SAMPLE_RATE
+    წილი დამატებით: SQL რაოდენობა/დრო (execute_wrapper), serialize/render დრო, ნელი query-ების
+    EXPLAIN და განმეორებული query-ები (N+1). შეურჩეველი მოთხოვნის ფასი - ორი perf_counter და
+    histogram-ის ჩანაწერი, ამიტომ overhead 1%-ს ქვემოთ რჩება.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not getattr(settings, 'STORE_PERF_ENABLED', True):
+            return self.get_response(request)
+        started = time.perf_counter()
+        if not _should_sample(request):
+            response = self.get_response(request)
+            return self.finish(request, response, started, None)
+
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        try:
+            with _install_wrappers(profile):
+                response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+        return self.finish(request, response, started, profile)
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'STORE_PERF_ENABLED', True):
+            return await self.get_response(request)
+        started = time.perf_counter()
+        if not _should_sample(request):
+            response = await self.get_response(request)
+            return self.finish(request, response, started, None)
+
+        # async ORM-ის query-ები thread-sensitive ნაკადში სრულდება - wrapper-ებიც იქ ეყენება
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        stack = await sync_to_async(_install_wrappers)(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _profile.reset(token)
+        return await sync_to_async(self.finish)(request, response, started, profile)
+
+    def finish(self, request, response, started, profile):
+        elapsed = time.perf_counter() - started
+        labels = (request.method, _view_label(request))
+        size = None if response.streaming else len(response.content)
+        with _metrics_lock:
+            REQUEST_DURATION.observe(labels, elapsed)
+            if size is not None:
+                RESPONSE_SIZE.observe(labels, size)
+            if profile is not None:
+                SAMPLED_REQUESTS.inc(labels)
+                SQL_QUERIES.observe(labels, len(profile.queries))
+                SQL_DURATION.observe(labels, profile.sql_time)
+                SERIALIZE_DURATION.observe(labels, profile.phases['serialize'])
+                RENDER_DURATION.observe(labels, profile.phases['render'])
+        if profile is not None:
+            analyze_queries(labels, profile)
+        if getattr(settings, 'STORE_PERF_SERVER_TIMING', True):
+            response['Server-Timing'] = server_timing(elapsed, profile)
+        return response
+
+
+def server_timing(elapsed, profile):
+    """ Server-Timing: sql;dur=4.1;desc="6 queries", serialize;dur=..., render;dur=..., total;dur=... """
+    parts = []
+    if profile is not None:
+        parts.append(f'sql;dur={profile.sql_time * 1000:.2f};desc="{len(profile.queries)} queries"')
+        for name in ('serialize', 'render'):
+            parts.append(f'{name};dur={profile.phases[name] * 1000:.2f}')
+    parts.append(f'total;dur={elapsed * 1000:.2f}')
+    return ', '.join(parts)
+
+
+# ----------------------------------------------------
+# 4. ნელი query-ები (EXPLAIN) და N+1
+# ----------------------------------------------------
+
+def explain(alias, sql, params):
+    """ EXPLAIN QUERY PLAN (SQLite) / EXPLAIN - მხოლოდ SELECT-ებისთვის """
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return [' '.join(str(column) for column in row) for row in cursor.fetchall()]
+    except Exception as exc:  # EXPLAIN დიაგნოსტიკაა - მოთხოვნას არ უნდა აფერხებდეს
+        return [f'EXPLAIN failed: {exc}']
+
+
+def analyze_queries(labels, profile):
+    threshold = getattr(settings, 'STORE_PERF_SLOW_QUERY_MS', 100) / 1000
+    view = f'{labels[0]} {labels[1]}'
+    for alias, sql, params, seconds in profile.queries:
+        if seconds < threshold:
+            continue
+        plan = explain(alias, sql, params)
+        logger.warning('Slow query (%.1f ms) in %s: %s | plan: %s', seconds * 1000, view, sql, plan)
+        with _metrics_lock:
+            SLOW_QUERIES.inc(labels)
+            recent_slow_queries.append({'view': view, 'ms': round(seconds * 1000, 3), 'sql': sql, 'plan': plan})
+
+    # იგივე SQL შაბლონი (პარამეტრების გარეშე) ბევრჯერ ერთ მოთხოვნაში - ციკლში შესრულებული query
+    repeated = Counter(sql for _, sql, _, _ in profile.queries)
+    duplicates = {sql: count for sql, count in repeated.items()
+                  if count >= getattr(settings, 'STORE_PERF_DUPLICATE_THRESHOLD', 5)}
+    if duplicates:
+        logger.warning('Possible N+1 in %s: %s', view,
+                       '; '.join(f'{count}x {sql}' for sql, count in duplicates.items()))
+        with _metrics_lock:
+            DUPLICATE_QUERIES.inc(labels)
+            recent_duplicates.append({'view': view, 'queries': [
+                {'sql': sql, 'count': count} for sql, count in duplicates.items()]})
+
+
+# ----------------------------------------------------
+# 5. /api/metrics/ (Prometheus scrape)
+# ----------------------------------------------------
+
+def metrics_view(request):
+    """
+    საჭიროა Authorization: Bearer <STORE_METRICS_TOKEN>. ტოკენის გარეშე endpoint დაკეტილია
+    (მარშრუტების დროები და query-ების რაოდენობა საჯარო არ უნდა იყოს) - მხოლოდ DEBUG-ში იხსნება.
+    """
+    token = getattr(settings, 'STORE_METRICS_TOKEN', '')
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
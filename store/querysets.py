@@ -0,0 +1,143 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, models, transaction
+from django.db.models import Case, DecimalField, F, IntegerField, Prefetch, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from rest_framework import serializers
+
+
+# ----------------------------------------------------
+# 1. Serializer-ზე დაფუძნებული Queryset-ის ოპტიმიზაცია
+# ----------------------------------------------------
+
+def _relation_path(model, source_attrs):
+    """
+    აბრუნებს (select_related ბილიკი, ბოლო მოდელი) წყვილს source-ის იმ ნაწილისთვის,
+    რომელიც პირდაპირ (ForeignKey / OneToOne) კავშირებს მიჰყვება.
+    """
+    path = []
+    for attr in source_attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation or field.many_to_many or field.one_to_many:
+            break
+        path.append(attr)
+        model = field.related_model
+    return '__'.join(path), model
+
+
+def optimize_for_serializer(queryset, serializer_class, fields=None):
+    """
+    ამატებს select_related / prefetch_related-ს იმ ველების მიხედვით, რომლებსაც
+    სერიალიზატორი რეალურად გამოიტანს. fields - sparse პასუხის ველების სია (ან None).
+    """
+    model = queryset.model
+    serializer = serializer_class()
+    select, prefetch = set(), []
+
+    for name, field in serializer.fields.items():
+        if fields is not None and name not in fields:
+            continue
+        if field.write_only or field.source == '*':
+            continue
+
+        source_attrs = field.source.split('.')
+
+        # nested many=True სერიალიზატორი (მაგ. images) -> ცალკე prefetch
+        if isinstance(field, serializers.ListSerializer):
+            join, owner = _relation_path(model, source_attrs[:-1])
+            try:
+                relation = owner._meta.get_field(source_attrs[-1])
+            except FieldDoesNotExist:
+                relation = None
+            if relation is None:
+                # reverse კავშირი related_name-ით (მაგ. 'images')
+                relation = next((rel for rel in owner._meta.related_objects
+                                 if rel.get_accessor_name() == source_attrs[-1]), None)
+            if relation is None:
+                continue
+            child_qs = optimize_for_serializer(relation.related_model._default_manager.all(),
+                                               type(field.child))
+            lookup = '__'.join(filter(None, [join, source_attrs[-1]]))
+            prefetch.append(Prefetch(lookup, queryset=child_qs))
+            continue
+
+        # nested ერთეული სერიალიზატორი -> JOIN
+        if isinstance(field, serializers.BaseSerializer):
+            join, _ = _relation_path(model, source_attrs)
+        else:
+            # dotted source (მაგ. 'category.name') -> JOIN ბოლო ატრიბუტამდე
+            join, _ = _relation_path(model, source_attrs[:-1])
+        if join:
+            select.add(join)
+
+    if select:
+        queryset = queryset.select_related(*sorted(select))
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+# ----------------------------------------------------
+# 2. Cart / CartItem QuerySet-ები (ჯამები SQL-ში)
+# ----------------------------------------------------
+
+def money_field():
+    return DecimalField(max_digits=12, decimal_places=2)
+
+
+class CartItemQuerySet(models.QuerySet):
+    def with_subtotals(self):
+        """ line_total = quantity * product.price - ერთ SELECT-ში, product JOIN-ით """
+        return self.select_related('product').annotate(
+            line_total=models.ExpressionWrapper(F('quantity') * F('product__price'), output_field=money_field()),
+        )
+
+    def apply_deltas(self, cart_id, deltas):
+        """
+        {product_id: delta} -> კალათის რაოდენობების ცვლილება მუდმივი რაოდენობის query-ით:
+          + დადებითი: INSERT ... ON CONFLICT (cart_id, product_id) DO UPDATE SET quantity = quantity + excluded.quantity
+          - უარყოფითი: UPDATE ... SET quantity = MAX(quantity + delta, 0), შემდეგ 0-იანების DELETE
+        bulk_create(update_conflicts=True) მხოლოდ excluded-ით ანაცვლებს და F() ზრდას ვერ გამოხატავს,
+        ამიტომ upsert raw SQL-ია (SQLite 3.24+ / PostgreSQL სინტაქსი).
+        """
+        increments = [(product_id, delta) for product_id, delta in deltas.items() if delta > 0]
+        decrements = {product_id: delta for product_id, delta in deltas.items() if delta < 0}
+
+        with transaction.atomic(using=self.db):
+            if increments:
+                meta = self.model._meta
+                connection = connections[self.db]
+                qn = connection.ops.quote_name
+                table = qn(meta.db_table)
+                cart, product, quantity = (qn(meta.get_field(name).column) for name in ('cart', 'product', 'quantity'))
+                placeholders = ', '.join(['(%s, %s, %s)'] * len(increments))
+                params = [value for product_id, delta in increments for value in (cart_id, product_id, delta)]
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'INSERT INTO {table} ({cart}, {product}, {quantity}) VALUES {placeholders} '
+                        f'ON CONFLICT ({cart}, {product}) DO UPDATE SET {quantity} = {table}.{quantity} + excluded.{quantity}',
+                        params,
+                    )
+            if decrements:
+                delta = Case(*[When(product_id=product_id, then=Value(value)) for product_id, value in decrements.items()],
+                             output_field=IntegerField())
+                items = self.model._default_manager.using(self.db).filter(cart_id=cart_id, product_id__in=decrements)
+                items.update(quantity=Greatest(F('quantity') + delta, Value(0)))
+                items.filter(quantity=0).delete()
+
+
+class CartQuerySet(models.QuerySet):
+    def with_totals(self):
+        """
+        items_total = SUM(quantity * price) GROUP BY cart + items prefetch line_total-ით.
+        კალათის პასუხი = 2 query, ნივთების რაოდენობის მიუხედავად.
+        """
+        item_model = self.model._meta.get_field('items').related_model
+        return self.annotate(
+            items_total=Coalesce(Sum(F('items__quantity') * F('items__product__price'), output_field=money_field()),
+                                 Value(0), output_field=money_field()),
+        ).prefetch_related(
+            Prefetch('items', queryset=item_model.objects.with_subtotals()),
+        )
@@ -0,0 +1,33 @@
+from rest_framework.renderers import JSONRenderer
+
+from .profiling import phase
+
+try:
+    import orjson
+except ImportError:  # orjson არასავალდებულოა - მის გარეშე stdlib json მუშაობს
+    orjson = None
+
+
+# ----------------------------------------------------
+# 1. JSON Renderer (orjson, თუ დაყენებულია)
+# ----------------------------------------------------
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer-ის იდენტური ბაიტები orjson-ით: კომპაქტური, UTF-8 (UNICODE_JSON),
+    \\u2028/\\u2029 escape-ით. Decimal/datetime/UUID და სხვა DRF-ის encoder-ს გადაეცემა,
+    ამიტომ მათი ფორმატი არ იცვლება. indent-იანი (Browsable API) ან ASCII რეჟიმი - stdlib json.
+    """
+    orjson_options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with phase('render'):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if (orjson is None or data is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        encoder = self.encoder_class()
+        ret = orjson.dumps(data, default=encoder.default, option=self.orjson_options)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import CartItem, Product, StockHold
+
+# ჯავშნის ხანგრძლივობა კალათის ბოლო ცვლილებიდან
+DEFAULT_HOLD_SECONDS = 15 * 60
+
+
+def hold_expiry(now=None):
+    seconds = getattr(settings, 'STOCK_HOLD_SECONDS', DEFAULT_HOLD_SECONDS)
+    return (now or timezone.now()) + timedelta(seconds=seconds)
+
+
+# ----------------------------------------------------
+# 1. გასაყიდად ხელმისაწვდომი მარაგი (stock - აქტიური ჯავშნები)
+# ----------------------------------------------------
+
+def active_holds(exclude_cart=None, now=None):
+    """
+    კორელირებული SUM(quantity) პროდუქტზე (OuterRef('pk')) - აქტიური ჯავშნები, exclude_cart-ის
+    საკუთარის გარდა. store_stockhold_active_idx-ით მხოლოდ ინდექსიდან იკითხება; ჯავშნის გარეშე - 0.
+    """
+    holds = StockHold.objects.filter(product_id=OuterRef('pk'), expires_at__gt=now or timezone.now())
+    if exclude_cart is not None:
+        holds = holds.exclude(cart_id=exclude_cart)
+    total = holds.order_by().values('product_id').annotate(total=Sum('quantity')).values('total')
+    return Coalesce(Subquery(total, output_field=IntegerField()), Value(0))
+
+
+def available_stock(product_ids, exclude_cart=None, now=None):
+    """
+    {product_id: stock - აქტიური ჯავშნები} ერთი query-ით (მიუწვდომელი პროდუქტები გამოტოვებულია).
+    ყოველთვის primary-დან: ჯავშნები და checkout-ის მარაგი იქ იწერება, ReplicaReadMixin-იანი
+    view-დან (availability) კი Product replica-ზე წავიდოდა, ჩამორჩენილ ასლზე.
+    """
+    return dict(Product.objects.using(DEFAULT_DB_ALIAS).filter(pk__in=product_ids, is_available=True)
+                .annotate(available=F('stock') - active_holds(exclude_cart, now))
+                .values_list('pk', 'available'))
+
+
+# ----------------------------------------------------
+# 2. კალათის ჯავშნები
+# ----------------------------------------------------
+
+def cart_targets(cart_id, deltas):
+    """ {product_id: delta} -> {product_id: კალათის ახალი რაოდენობა} (ერთი query) """
+    current = dict(CartItem.objects.filter(cart_id=cart_id, product_id__in=deltas)
+                   .values_list('product_id', 'quantity'))
+    return {product_id: max(current.get(product_id, 0) + delta, 0) for product_id, delta in deltas.items()}
+
+
+def reserve(cart_id, targets, now=None):
+    """
+    targets - {product_id: კალათის ახალი რაოდენობა}. ტრანზაქციაში უნდა გამოიძახო, კალათის
+    ცვლილებამდე: ზრდისას რაოდენობა მოწმდება სხვა კალათების აქტიურ ჯავშნებთან (პროდუქტები
+    იკეტება id-ის რიგით; SQLite-ზე ჩამწერს BEGIN IMMEDIATE ასერიალებს).
+    აბრუნებს მარაგის გარეშე დარჩენილ პროდუქტებს - მაშინ არაფერი იწერება; თორემ ჯავშნები
+    upsert-ით ახლდება, 0-იანები იშლება და კალათის ყველა ჯავშანს ვადა უგრძელდება.
+    """
+    now = now or timezone.now()
+    current = dict(CartItem.objects.filter(cart_id=cart_id, product_id__in=targets)
+                   .values_list('product_id', 'quantity'))
+    increased = {product_id: quantity for product_id, quantity in targets.items()
+                 if quantity > current.get(product_id, 0)}
+    if increased:
+        list(Product.objects.select_for_update().filter(pk__in=increased).order_by('pk').values_list('pk'))
+        available = available_stock(increased, exclude_cart=cart_id, now=now)
+        short = sorted(product_id for product_id, quantity in increased.items()
+                       if available.get(product_id, 0) < quantity)
+        if short:
+            return short
+
+    expires_at = hold_expiry(now)
+    holds = [StockHold(cart_id=cart_id, product_id=product_id, quantity=quantity, expires_at=expires_at)
+             for product_id, quantity in targets.items() if quantity > 0]
+    StockHold.objects.bulk_create(holds, update_conflicts=True, unique_fields=['cart', 'product'],
+                                  update_fields=['quantity', 'expires_at'])
+    released = [product_id for product_id, quantity in targets.items() if quantity <= 0]
+    if released:
+        StockHold.objects.filter(cart_id=cart_id, product_id__in=released).delete()
+    StockHold.objects.filter(cart_id=cart_id).exclude(product_id__in=targets).update(expires_at=expires_at)
+    return []
+
+
+def release(cart_id, product_ids=None):
+    """ კალათის (ან მისი ცალკეული ხაზების) ჯავშნების მოხსნა """
+    holds = StockHold.objects.filter(cart_id=cart_id)
+    if product_ids is not None:
+        holds = holds.filter(product_id__in=product_ids)
+    return holds.delete()[0]
+
+
+# ----------------------------------------------------
+# 3. ვადაგასული ჯავშნების გასუფთავება (batch-ებად)
+# ----------------------------------------------------
+
+def sweep_expired_holds(batch_size=1000, now=None):
+    """
+    DELETE ... WHERE id IN (SELECT id ... WHERE expires_at <= now LIMIT batch_size) ციკლში -
+    expiry ინდექსით, მოკლე ჩაწერებით. ვადაგასული ჯავშანი ისედაც არ ითვლება (active_holds),
+    ამიტომ გასუფთავება მხოლოდ ცხრილს ინახავს კომპაქტურს.
+    """
+    now = now or timezone.now()
+    released = 0
+    while True:
+        batch = list(StockHold.objects.filter(expires_at__lte=now).order_by('expires_at')
+                     .values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return released
+        released += StockHold.objects.filter(pk__in=batch).delete()[0]
+        if len(batch) < batch_size:
+            return released
@@ -0,0 +1,183 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .cache import last_catalog_write
+
+# ----------------------------------------------------
+# 1. მოთხოვნის მდგომარეობა (replica-ზე კითხვა / primary-ზე მიბმა)
+# ----------------------------------------------------
+
+# კატალოგის მოდელები - მხოლოდ ეს იკითხება replica-დან; Cart/Order და დანარჩენი ყოველთვის primary-ზეა
+REPLICA_MODELS = {'store.category', 'store.product', 'store.productimage', 'store.productlisting'}
+
+
+class _RoutingState:
+    def __init__(self):
+        self.replica_reads = False
+        self.pinned = False
+        # ერთი მოთხოვნის ყველა წაკითხვა ერთ replica-ზე (ETag და გვერდი ერთი ასლიდან)
+        self.replica = None
+
+
+_state = ContextVar('store_db_routing', default=None)
+
+
+@contextmanager
+def routing_scope():
+    """ ერთი მოთხოვნის საზღვრები (ReplicaPinningMiddleware) - მიბმა მოთხოვნის ბოლოს ქრება """
+    token = _state.set(_RoutingState())
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def within_replica_lag():
+    """
+    კატალოგის ბოლო ჩაწერიდან (bump_catalog) STORE_REPLICA_MAX_LAG წამი ჯერ არ გასულა - replica
+    შეიძლება ჯერ ძველ მონაცემს აბრუნებდეს. ამ ფანჯარაში კითხვა primary-ზეა, რომ ქეშის ახალი
+    ვერსიის გასაღები (და ETag) ჩამორჩენილი ასლით არ შეივსოს.
+    """
+    max_lag = getattr(settings, 'STORE_REPLICA_MAX_LAG', 5)
+    if max_lag <= 0 or not getattr(settings, 'STORE_READ_REPLICAS', ()):
+        return False
+    last_write = last_catalog_write()
+    return last_write is not None and time.time() - last_write < max_lag
+
+
+@contextmanager
+def replica_reads():
+    """
+    კატალოგის წაკითხვის view-ები (ReplicaReadMixin); routing_scope-ის გარეთ და ბოლო ჩაწერიდან
+    replica-ს ჩამორჩენის ფანჯარაში (within_replica_lag) არაფერს აკეთებს - კითხვა primary-ზეა.
+    """
+    state = _state.get()
+    if state is None or within_replica_lag():
+        yield
+        return
+    previous, state.replica_reads = state.replica_reads, True
+    try:
+        yield
+    finally:
+        state.replica_reads = previous
+
+
+class ReplicaPinningMiddleware:
+    # ASGI-ზე async view-ები ნაკადში არ გადადის (sync-only middleware მთელ ჯაჭვს sync-ად აქცევს)
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with routing_scope():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with routing_scope():
+            return await self.get_response(request)
+
+
+class ReplicaReadMixin:
+    """ GET/HEAD/OPTIONS - კატალოგის მოდელები replica-დან (ჩაწერის შემდეგ კი იმავე მოთხოვნაში - primary-დან) """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+
+# ----------------------------------------------------
+# 2. Replica-ს ჯანმრთელობა
+# ----------------------------------------------------
+
+_health = {}
+_health_lock = threading.Lock()
+
+
+def replica_is_healthy(alias):
+    """ შედეგი STORE_REPLICA_HEALTH_TTL წამით ინახება - ყოველ query-ზე კავშირი არ მოწმდება """
+    ttl = getattr(settings, 'STORE_REPLICA_HEALTH_TTL', 30)
+    now = time.monotonic()
+    cached = _health.get(alias)
+    if cached is not None and now - cached[1] < ttl:
+        return cached[0]
+    try:
+        connection = connections[alias]
+        connection.ensure_connection()
+        healthy = connection.is_usable()
+    except Exception:
+        healthy = False
+    with _health_lock:
+        _health[alias] = (healthy, now)
+    return healthy
+
+
+def reset_replica_health():
+    with _health_lock:
+        _health.clear()
+
+
+# ----------------------------------------------------
+# 3. Database Router
+# ----------------------------------------------------
+
+class ReplicaRouter:
+    """
+    კატალოგის წაკითხვა (ReplicaReadMixin-იან view-ებში) - STORE_READ_REPLICAS-ზე round-robin-ით
+    (ერთი replica მთელ მოთხოვნაზე), გაუმართავი replica გამოიტოვება, ყველა გაუმართავისას - primary. ნებისმიერი ჩაწერა მოთხოვნას
+    primary-ზე მიაბამს (read-your-writes), კატალოგის ჩაწერიდან STORE_REPLICA_MAX_LAG წამში კი ყველა
+    მოთხოვნა primary-დან კითხულობს. წაკითხვის სხვა ყველა შემთხვევა primary-ზეა.
+    """
+
+    def __init__(self):
+        self._counter = itertools.count()
+
+    @staticmethod
+    def replicas():
+        return list(getattr(settings, 'STORE_READ_REPLICAS', ()))
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica_reads or state.pinned or model._meta.label_lower not in REPLICA_MODELS:
+            return DEFAULT_DB_ALIAS
+        if state.replica is None:
+            state.replica = self.choose_replica()
+        return state.replica
+
+    def choose_replica(self):
+        replicas = self.replicas()
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        start = next(self._counter)
+        for offset in range(len(replicas)):
+            alias = replicas[(start + offset) % len(replicas)]
+            if replica_is_healthy(alias):
+                return alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica primary-ის ასლია - ობიექტები ერთმანეთთან დაკავშირებადია
+        aliases = {DEFAULT_DB_ALIAS, *self.replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
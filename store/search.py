@@ -0,0 +1,129 @@
+import re
+
+from django.db import connections
+from django.db.models import F, Lookup, TextField
+from rest_framework.filters import SearchFilter
+
+
+# ----------------------------------------------------
+# 1. SQLite FTS5 ინდექსი Product-ისთვის
+# ----------------------------------------------------
+
+FTS_TABLE = 'store_product_fts'
+
+# unicode61 ტოკენაიზერი ქართულ ასოებს (Lo კატეგორია) სიტყვის ნაწილად თვლის;
+# prefix='2 3' - ავტოშევსების (prefix*) მოთხოვნებისთვის წინასწარ აგებული ინდექსი
+FTS_CREATE_SQL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    name, description,
+    content='store_product', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+)
+"""
+
+# ტრიგერები ინდექსს Product-თან სინქრონში ტოვებს, bulk_create/update()-ის ჩათვლით
+FTS_TRIGGERS_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON store_product BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON store_product BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, description ON store_product BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+# bm25 წონები: სახელში დამთხვევა აღწერაზე 10-ჯერ მეტს იწონის (FTS5-ის მუდმივი 'rank' კონფიგურაცია)
+RANK_FUNCTION = 'bm25(10.0, 1.0)'
+
+
+def install_fts(connection, rebuild=False):
+    """
+    ქმნის FTS ცხრილს და ტრიგერებს (idempotent). SQLite-ის table remake (AlterField/AddField)
+    ძველ ცხრილთან ერთად ტრიგერებსაც შლის, ამიტომ ეს post_migrate-ზეც ეშვება.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(FTS_CREATE_SQL)
+        for sql in FTS_TRIGGERS_SQL:
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', %s)", [RANK_FUNCTION])
+        if rebuild:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+_fts_tables = {}
+
+
+def fts_available(alias):
+    """ ცხრილის არსებობა ერთხელ მოწმდება ყოველი ბაზისთვის (alias + NAME) """
+    connection = connections[alias]
+    if connection.vendor != 'sqlite':
+        return False
+    key = (alias, str(connection.settings_dict['NAME']))
+    if key not in _fts_tables:
+        _fts_tables[key] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_tables[key]
+
+
+def build_match_query(text):
+    """
+    მომხმარებლის ტექსტი -> FTS5 MATCH გამოსახულება. ყოველი სიტყვა prefix-ძებნაა
+    ("სავარძ"* პოულობს "სავარძელი"-ს); სიტყვები AND-ით ერთიანდება.
+    Python-ის \\w ქართულ ასოებს ემთხვევა, casefold() კი მთავრულს მხედრულად აქცევს.
+    """
+    terms = re.findall(r'\w+', text.casefold())
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+class FTSDocumentField(TextField):
+    """
+    FTS5-ის ფარული სვეტი (ცხრილის სახელით) - მასზე MATCH ეძებს ყველა სვეტში.
+    გამოიყენება unmanaged ProductSearchIndex მოდელში, რომ JOIN Django-მ ააგოს.
+    """
+
+
+@FTSDocumentField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', (*lhs_params, *rhs_params)
+
+
+# ----------------------------------------------------
+# 2. DRF Filter Backend
+# ----------------------------------------------------
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    ?search= -> FTS5 MATCH + bm25 რანჟირება. თუ ბაზა SQLite არ არის (ან FTS ცხრილი
+    არ არსებობს) - DRF-ის ჩვეულებრივი icontains SearchFilter.
+    """
+    rank_annotation = 'search_rank'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        match = build_match_query(text)
+        if not match or not fts_available(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        # INNER JOIN store_product_fts ON rowid = id WHERE store_product_fts MATCH ...
+        # rank (bm25): რაც უფრო მცირეა, მით უფრო რელევანტურია
+        return (queryset.filter(search_index__document__match=match)
+                .annotate(**{self.rank_annotation: F('search_index__rank')})
+                .order_by(self.rank_annotation))
@@ -1,27 +1,68 @@
 from rest_framework import serializers
+from datetime import timedelta
 from decimal import Decimal
+from django.utils import timezone
 # აუცილებელი მოდელები
-from .models import Category, Product, ProductImage, Cart, Order, CartItem, OrderItem
+from .models import Category, Product, ProductImage, Cart, Order, CartItem, OrderItem, UserOrderStats
 # CustomUser-ის იმპორტი Cart/Order სერიალიზაციისთვის
 from users.models import CustomUser
+from .images import build_srcset
+from .profiling import ProfiledSerializerMixin
+
+
+# ----------------------------------------------------
+# 0. Sparse Fields Mixin (?fields=id,name,price)
+# ----------------------------------------------------
+
+class SparseFieldsMixin:
+    """
+    ტოვებს მხოლოდ ?fields= პარამეტრში ჩამოთვლილ ველებს (მხოლოდ წაკითხვისას).
+    """
+    sparse_fields_param = 'fields'
+
+    @classmethod
+    def requested_fields(cls, request):
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return None
+        raw = request.query_params.get(cls.sparse_fields_param) or ''
+        # ?fields=,, - ცარიელი არჩევანი იგივეა, რაც პარამეტრის არქონა (ყველა ველი, ყველა JOIN)
+        return {name.strip() for name in raw.split(',') if name.strip()} or None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.requested_fields(self.context.get('request'))
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
 
 
 # ----------------------------------------------------
 # 1. Product Image Serializer (For Product Gallery)
 # ----------------------------------------------------
 
-class ProductImageSerializer(serializers.ModelSerializer):
+class SrcsetMixin:
+    """ srcset სტრიქონები ფორმატების მიხედვით: {'webp': 'url 320w, url 640w', ...} """
+
+    def get_srcset(self, obj):
+        request = self.context.get('request')
+        return build_srcset(obj.variants, request.build_absolute_uri if request else str)
+
+
+class ProductImageSerializer(SrcsetMixin, serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = ProductImage
-        fields = ['image']
+        fields = ['image', 'srcset']
 
 
 # ----------------------------------------------------
 # 2. Product Serializer
 # ----------------------------------------------------
 
-class ProductSerializer(serializers.ModelSerializer):
-    images = ProductImageSerializer(many=True, read_only=True, source='productimage_set')
+class ProductSerializer(ProfiledSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    # related_name='images' (ProductImage.product) - 'productimage_set' არ არსებობს
+    images = ProductImageSerializer(many=True, read_only=True)
     category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all())
     category_name = serializers.CharField(source='category.name', read_only=True)
 
@@ -37,11 +78,13 @@ class ProductSerializer(serializers.ModelSerializer):
 # 3. Category Serializer
 # ----------------------------------------------------
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(ProfiledSerializerMixin, SrcsetMixin, serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = Category
         fields = [
-            'id', 'name', 'slug', 'description', 'image', 'is_active', 'created_at'
+            'id', 'name', 'slug', 'description', 'image', 'srcset', 'is_active', 'created_at'
         ]
 
 
@@ -49,7 +92,7 @@ class CategorySerializer(serializers.ModelSerializer):
 # 4. Cart Item Serializer
 # ----------------------------------------------------
 
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.name', read_only=True)
     product_price = serializers.DecimalField(source='product.price', max_digits=10, decimal_places=2, read_only=True)
     total_item_price = serializers.SerializerMethodField()
@@ -59,14 +102,52 @@ class CartItemSerializer(serializers.ModelSerializer):
         fields = ['id', 'product', 'product_name', 'product_price', 'quantity', 'total_item_price']
 
     def get_total_item_price(self, item: CartItem):
-        return item.product.price * item.quantity
+        # CartItem.objects.with_subtotals() ანოტაციას იყენებს, თუ არსებობს
+        return item.sub_total
+
+    def validate_quantity(self, value):
+        # 0-იანი ხაზი კალათაში არ ინახება (წაშლა - DELETE, შემცირება - bulk)
+        if value < 1:
+            raise serializers.ValidationError('Quantity must be at least 1.')
+        return value
+
+
+# ----------------------------------------------------
+# 4.1 Cart Item Delta Serializer (მასიური ცვლილება)
+# ----------------------------------------------------
+
+class CartItemDeltaListSerializer(serializers.ListSerializer):
+    def validate(self, attrs):
+        """ ყველა პროდუქტის შემოწმება ერთი query-ით; დუბლიკატები ჯამდება """
+        deltas = {}
+        for item in attrs:
+            deltas[item['product']] = deltas.get(item['product'], 0) + item['quantity']
+        existing = set(Product.objects.filter(pk__in=deltas, is_available=True).values_list('pk', flat=True))
+        missing = sorted(set(deltas) - existing)
+        if missing:
+            raise serializers.ValidationError({'product': f'Invalid or unavailable products: {missing}'})
+        return {product_id: delta for product_id, delta in deltas.items() if delta}
+
+
+class CartItemDeltaSerializer(serializers.Serializer):
+    """ {product, quantity}: quantity დადებითი - დამატება, უარყოფითი - შემცირება """
+    product = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField()
+
+    class Meta:
+        list_serializer_class = CartItemDeltaListSerializer
+
+    def validate_quantity(self, value):
+        if value == 0:
+            raise serializers.ValidationError('Quantity delta must not be zero.')
+        return value
 
 
 # ----------------------------------------------------
 # 5. Cart Serializer
 # ----------------------------------------------------
 
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     items = CartItemSerializer(many=True, read_only=True)
     total_cart_price = serializers.SerializerMethodField()
 
@@ -76,9 +157,8 @@ class CartSerializer(serializers.ModelSerializer):
         read_only_fields = ['user']
 
     def get_total_cart_price(self, cart: Cart):
-        items = cart.items.all()
-        total = sum(item.product.price * item.quantity for item in items)
-        return total
+        # Cart.objects.with_totals() -> SQL-ში დათვლილი ჯამი
+        return cart.total_price
 
 
 # ----------------------------------------------------
@@ -110,7 +190,7 @@ class OrderItemSerializer(serializers.ModelSerializer):
 # 7. Order Serializer: Main (created_at და status ველების კორექტირება)
 # ----------------------------------------------------
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     """
     მთავარი სერიალიზატორი Order-ისთვის (Order History)
     """
@@ -121,4 +201,50 @@ class OrderSerializer(serializers.ModelSerializer):
         model = Order
         # ✅ created_at და status ველები გამოიყენება
         fields = ['id', 'user_username', 'created_at', 'status', 'total_price', 'items']
-        read_only_fields = ['created_at', 'total_price']
\ No newline at end of file
+        read_only_fields = ['created_at', 'total_price']
+
+# ----------------------------------------------------
+# 8. Order Summary Serializer (UserOrderStats)
+# ----------------------------------------------------
+
+class OrderSummarySerializer(serializers.ModelSerializer):
+    """
+    /api/orders/summary/ - წინასწარ დათვლილი აგრეგატები; status_counts - {"PENDING": n, ...}
+    """
+    status_counts = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UserOrderStats
+        fields = ['order_count', 'total_spent', 'last_order_at', 'status_counts']
+
+    def get_status_counts(self, stats: UserOrderStats):
+        return {value: getattr(stats, f'{value.lower()}_count') for value, _ in Order.STATUS_CHOICES}
+
+
+# ----------------------------------------------------
+# 9. Sales Report Query Serializer (ანალიტიკის ?start=&end=...)
+# ----------------------------------------------------
+
+class SalesReportQuerySerializer(serializers.Serializer):
+    """
+    ანალიტიკის endpoint-ების query პარამეტრები. პერიოდი ორივე მხრიდან ჩათვლით;
+    ნაგულისხმევად - ბოლო 30 დღე (TIME_ZONE-ში).
+    """
+    MAX_DAYS = 366 * 2
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    limit = serializers.IntegerField(required=False, default=10, min_value=1, max_value=100)
+    metric = serializers.ChoiceField(choices=['revenue', 'quantity'], required=False, default='revenue')
+    interval = serializers.ChoiceField(choices=['day', 'week', 'month'], required=False, default='day')
+    product = serializers.IntegerField(required=False)
+    category = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault('end', timezone.localdate())
+        attrs.setdefault('start', attrs['end'] - timedelta(days=29))
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError({'start': 'start არ უნდა იყოს end-ის შემდეგ.'})
+        if (attrs['end'] - attrs['start']).days > self.MAX_DAYS:
+            raise serializers.ValidationError({'start': f'პერიოდი არ უნდა აღემატებოდეს {self.MAX_DAYS} დღეს.'})
+        return attrs
@@ -0,0 +1,135 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_catalog
+from .images import schedule_variants
+from .listing import refresh_listings
+from .models import Category, Order, Product, ProductImage
+from .order_stats import record_order, refresh_user_stats, shift_status
+from .outbox import publish
+
+
+# ----------------------------------------------------
+# 1. კატალოგის ქეშის ინვალიდაცია (ვერსიების გაზრდა)
+# ----------------------------------------------------
+
+def _bump_on_commit(*category_ids):
+    # ტრანზაქციის rollback-ისას ქეში არ ინვალიდირდება; commit-ის შემდეგ კი ახალი მონაცემი ჩანს
+    transaction.on_commit(lambda: bump_catalog(category_ids))
+
+
+@receiver(pre_save, sender=Product)
+def remember_previous_category(sender, instance, **kwargs):
+    """ კატეგორიის შეცვლისას ძველი კატეგორიის სიაც უნდა განახლდეს """
+    instance._previous_category_id = None
+    if instance.pk:
+        instance._previous_category_id = (Product.objects.filter(pk=instance.pk)
+                                          .values_list('category_id', flat=True).first())
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product(sender, instance, **kwargs):
+    _bump_on_commit(instance.category_id, getattr(instance, '_previous_category_id', None))
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def invalidate_product_image(sender, instance, **kwargs):
+    # გალერეა პროდუქტის პასუხის ნაწილია - updated_at-ის განახლება ETag-საც ცვლის
+    Product.objects.filter(pk=instance.product_id).update(updated_at=timezone.now())
+    category_id = Product.objects.filter(pk=instance.product_id).values_list('category_id', flat=True).first()
+    _bump_on_commit(category_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    _bump_on_commit(instance.pk)
+
+
+# ----------------------------------------------------
+# 2. სურათის ვარიანტები ატვირთვისას (ფონურ pool-ში)
+# ----------------------------------------------------
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_save, sender=Category)
+def build_image_variants(sender, instance, **kwargs):
+    schedule_variants(instance)
+
+
+# ----------------------------------------------------
+# 3. ProductListing-ის ინკრემენტული განახლება (იმავე ტრანზაქციაში)
+# ----------------------------------------------------
+
+@receiver(post_save, sender=Product)
+def refresh_product_listing(sender, instance, **kwargs):
+    refresh_listings(Product.objects.filter(pk=instance.pk))
+
+
+def _cascade_from(origin, *models):
+    """ post_delete-ის origin (ობიექტი ან queryset) - წაშლა models-იდან კასკადით მოდის? """
+    model = getattr(origin, 'model', type(origin))
+    return isinstance(model, type) and issubclass(model, models)
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def refresh_image_listing(sender, instance, origin=None, **kwargs):
+    # პირველი სურათი ბარათის ნაწილია. პროდუქტის/კატეგორიის კასკადური წაშლისას ბარათი უკვე
+    # წაშლილია - upsert მას ხელახლა ჩასვამდა და commit FOREIGN KEY-ზე ჩავარდებოდა
+    if _cascade_from(origin, Product, Category):
+        return
+    refresh_listings(Product.objects.filter(pk=instance.product_id))
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_listings(sender, instance, created, **kwargs):
+    # category_name ყველა ბარათშია
+    if not created:
+        refresh_listings(Product.objects.filter(category_id=instance.pk))
+
+
+# ----------------------------------------------------
+# 4. UserOrderStats-ის ინკრემენტული განახლება (იმავე ტრანზაქციაში)
+# ----------------------------------------------------
+
+@receiver(pre_save, sender=Order)
+def remember_previous_order(sender, instance, **kwargs):
+    """ სტატუსის ცვლილება ძველი მნიშვნელობის გარეშე მრიცხველებზე ვერ აისახება """
+    instance._previous_order = None
+    if instance.pk:
+        instance._previous_order = (Order.objects.filter(pk=instance.pk)
+                                    .values_list('user_id', 'status', 'total_price').first())
+
+
+@receiver(post_save, sender=Order)
+def update_order_stats(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_order', None)
+    if created or previous is None:
+        record_order(instance)
+    elif previous[0] == instance.user_id and previous[2] == instance.total_price:
+        shift_status([instance.pk], previous[1], instance.status)
+    else:
+        # მფლობელის ან თანხის შეცვლა იშვიათია (ადმინი) - ზუსტი გადათვლა ორივე მომხმარებელზე
+        refresh_user_stats([previous[0], instance.user_id])
+
+
+@receiver(post_delete, sender=Order)
+def remove_order_stats(sender, instance, **kwargs):
+    # ბოლო შეკვეთის თარიღი კლებით ვერ აღდგება
+    refresh_user_stats([instance.user_id])
+
+
+# ----------------------------------------------------
+# 5. გაყიდვების rollup-ები: გაუქმება/აღდგენა (store.handlers.update_sales_rollups)
+# ----------------------------------------------------
+
+@receiver(post_save, sender=Order)
+def publish_sales_change(sender, instance, created, **kwargs):
+    # ახალ შეკვეთას place_order აქვეყნებს (order.created); აქ - მხოლოდ CANCELED-ში შესვლა ან გამოსვლა
+    previous = getattr(instance, '_previous_order', None)
+    if not created and previous and previous[1] != instance.status and 'CANCELED' in (previous[1], instance.status):
+        publish('order.updated', {'order_id': instance.pk})
@@ -0,0 +1,94 @@
+import importlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------
+# 1. მსუბუქი ლოკალური Task Queue (broker-ის გარეშე)
+# ----------------------------------------------------
+
+_registry = {}
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=getattr(settings, 'STORE_TASK_WORKERS', 4),
+                                       thread_name_prefix='store-tasks')
+    return _executor
+
+
+def wait_for_tasks():
+    """ ფონური task-ების დასრულების მოლოდინი (benchmark-ები დროებითი ბაზის წაშლამდე) """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def _execute(task, args, kwargs):
+    close_old_connections()
+    try:
+        return task.func(*args, **kwargs)
+    except Exception:
+        logger.exception('Task %s failed', task.name)
+    finally:
+        close_old_connections()
+
+
+class Task:
+    """
+    Celery-ს მსგავსი ინტერფეისი: task(...) - სინქრონული გამოძახება, task.delay(...) - ფონური.
+    STORE_TASKS_EAGER=True (ტესტები) - delay() მაშინვე სრულდება, როგორც CELERY_TASK_ALWAYS_EAGER.
+    """
+
+    def __init__(self, func, name):
+        self.func = func
+        self.name = name
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __repr__(self):
+        return f'<Task {self.name}>'
+
+    def delay(self, *args, **kwargs):
+        if getattr(settings, 'STORE_TASKS_EAGER', False):
+            return self.func(*args, **kwargs)
+        # ტრანზაქციის შიგნით გამოძახებისას - მხოლოდ commit-ის შემდეგ (rollback-ისას არასდროს)
+        transaction.on_commit(lambda: _get_executor().submit(_execute, self, args, kwargs))
+        return None
+
+
+def task(func=None, *, name=None):
+    """ @task ან @task(name='...'); სახელი ნაგულისხმევად 'module.function' (CELERY_BEAT_SCHEDULE-ის ფორმატი) """
+    def decorator(fn):
+        registered = Task(fn, name or f'{fn.__module__}.{fn.__name__}')
+        _registry[registered.name] = registered
+        _register_with_celery(registered)
+        return registered
+
+    return decorator(func) if func is not None else decorator
+
+
+def _register_with_celery(registered):
+    """ თუ Celery დაყენებულია, იგივე ფუნქცია იგივე სახელით მის worker/beat-საც მიეწოდება """
+    try:
+        from celery import shared_task
+    except ImportError:
+        return
+    shared_task(name=registered.name)(registered.func)
+
+
+def get_task(name):
+    """ 'store.tasks.auto_update_order_status' -> Task (მოდული საჭიროებისამებრ იტვირთება) """
+    if name not in _registry:
+        importlib.import_module(name.rsplit('.', 1)[0])
+    return _registry[name]
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Subquery
+from django.utils import timezone
+
+from .models import Order
+from .order_stats import shift_status
+from .reservations import sweep_expired_holds
+from .taskqueue import task
+
+
+# ----------------------------------------------------
+# 1. შეკვეთის სტატუსის ავტომატური განახლება (set-based)
+# ----------------------------------------------------
+
+# (საწყისი სტატუსი, ახალი სტატუსი, შეკვეთის ასაკი created_at-დან)
+DEFAULT_STATUS_SCHEDULE = [
+    ('PENDING', 'PROCESSING', timedelta(days=1)),
+    ('PROCESSING', 'SHIPPED', timedelta(days=3)),
+    ('SHIPPED', 'DELIVERED', timedelta(days=7)),
+]
+
+
+def advance_orders(source, target, cutoff, batch_size, now=None):
+    """
+    UPDATE store_order SET status = target WHERE id IN (
+        SELECT id FROM store_order WHERE status = source AND created_at < cutoff LIMIT batch_size)
+    ციკლში, სანამ ჩანაწერები არ ამოიწურება. ყოველი batch ცალკე, მოკლე ჩაწერაა -
+    ბაზა დიდხანს არ იკეტება. (status, created_at) ინდექსი ქვე-query-ს ემსახურება.
+    იმავე ტრანზაქციაში, Order-ის UPDATE-მდე, UserOrderStats-ის მრიცხველები იმავე batch-ით გადაინაცვლებს.
+    """
+    now = now or timezone.now()
+    moved = 0
+    while True:
+        # pk - დეტერმინისტული რიგი: ორივე UPDATE ერთსა და იმავე batch-ს ირჩევს
+        batch = (Order.objects.filter(status=source, created_at__lt=cutoff)
+                 .order_by('created_at', 'pk').values('pk')[:batch_size])
+        with transaction.atomic(savepoint=False):
+            shift_status(Subquery(batch), source, target)
+            updated = Order.objects.filter(pk__in=Subquery(batch)).update(status=target, updated_at=now)
+        moved += updated
+        if updated < batch_size:
+            return moved
+
+
+@task
+def auto_update_order_status(batch_size=None):
+    """
+    PENDING -> PROCESSING -> SHIPPED -> DELIVERED ასაკის მიხედვით. გადასვლები ბოლოდან იწყება,
+    რომ ერთ გაშვებაში შეკვეთა მხოლოდ ერთი საფეხურით წავიდეს წინ.
+    """
+    batch_size = batch_size or getattr(settings, 'ORDER_STATUS_BATCH_SIZE', 500)
+    schedule = getattr(settings, 'ORDER_STATUS_SCHEDULE', DEFAULT_STATUS_SCHEDULE)
+    now = timezone.now()
+    return {
+        f'{source}->{target}': advance_orders(source, target, now - age, batch_size, now=now)
+        for source, target, age in reversed(schedule)
+    }
+
+
+# ----------------------------------------------------
+# 2. Outbox-ის დამუშავება (email, ანალიტიკა)
+# ----------------------------------------------------
+
+@task
+def drain_outbox(batch_size=None):
+    """ store.outbox-ის მოვლენების დამუშავება batch-ებად (იხ. store.handlers) """
+    from .outbox import drain
+
+    return drain(batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 100))
+
+
+# ----------------------------------------------------
+# 3. ვადაგასული მარაგის ჯავშნების გასუფთავება
+# ----------------------------------------------------
+
+@task
+def release_expired_holds(batch_size=None):
+    """ store.reservations-ის ვადაგასული ჯავშნები batch-ებად (expires_at ინდექსით) """
+    return sweep_expired_holds(batch_size or getattr(settings, 'STOCK_HOLD_SWEEP_BATCH_SIZE', 1000))
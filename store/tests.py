@@ -1,3 +1,1751 @@
-from django.test import TestCase
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import OperationalError, connection, connections
+from django.db.models import Count, F, Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .cache import bump_catalog, get_cache
+from .images import generate_variants
+from .checkout import InsufficientStock, place_order
+from .models import (Cart, CartItem, Category, Order, OrderItem, OutboxEvent, Product, ProductImage,
+                     ProductListing, SalesRollup, StockHold, UserOrderStats)
+
+
+class CatalogCacheIsolation:
+    """
+    კატალოგის ქეში (LocMem) ტესტებს შორის იწმინდება: TestCase-ში on_commit-ის bump-ები არ
+    ეშვება, SQLite კი rollback-ის შემდეგ pk-ებს თავიდან იყენებს - სხვა ტესტის გვერდი დაბრუნდებოდა.
+    """
+    def setUp(self):
+        super().setUp()
+        get_cache().clear()
+
+
+class StoreTestCase(CatalogCacheIsolation, TestCase):
+    pass
+
+
+class StoreTransactionTestCase(CatalogCacheIsolation, TransactionTestCase):
+    pass
+
+
+def create_catalog(count, categories=3, images_per_product=2):
+    """ ტესტური კატალოგის შექმნა bulk insert-ებით """
+    cats = Category.objects.bulk_create(
+        Category(name=f'Category {i}', slug=f'category-{i}') for i in range(categories)
+    )
+    products = Product.objects.bulk_create(
+        Product(category=cats[i % categories], name=f'Product {i}', slug=f'product-{i}',
+                description='Test product', price=Decimal('100.00') + i, stock=10,
+                color='red' if i % 2 else 'blue', material='wood')
+        for i in range(count)
+    )
+    ProductImage.objects.bulk_create(
+        ProductImage(product=product, image=f'product_images/p{product.pk}-{n}.jpg')
+        for product in products for n in range(images_per_product)
+    )
+    # bulk_create სიგნალებს არ აგზავნის - კატალოგის ქეში ხელით ინვალიდირდება
+    bump_catalog()
+    return products
+
+
+# ----------------------------------------------------
+# 1. Product List - Query Budget (N+1-ის დაცვა)
+# ----------------------------------------------------
+
+class ProductListQueryBudgetTests(StoreTestCase):
+    # products + images prefetch (category JOIN-ით მოდის); სიის ETag query-ს არ სვამს
+    QUERY_BUDGET = 2
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+
+    def assert_within_budget(self, count, url='/api/products/'):
+        create_catalog(count)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(ctx.captured_queries), self.QUERY_BUDGET,
+                             '\n'.join(q['sql'] for q in ctx.captured_queries))
+        return response
+
+    def test_budget_10_products(self):
+        self.assert_within_budget(10)
+
+    def test_budget_100_products(self):
+        self.assert_within_budget(100)
+
+    def test_budget_1000_products(self):
+        self.assert_within_budget(1000)
+
+    def test_images_and_category_name_are_serialized(self):
+        response = self.assert_within_budget(10)
+        product = response.json()['results'][0]
+        self.assertEqual(len(product['images']), 2)
+        self.assertTrue(product['category_name'].startswith('Category'))
+
+    def test_sparse_fields_skip_unneeded_joins(self):
+        create_catalog(20)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/products/?fields=id,name,price')
+        # ერთი SELECT JOIN-ის გარეშე
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('JOIN', ctx.captured_queries[-1]['sql'])
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'name', 'price'})
+
+    @override_settings(STORE_FAST_SERIALIZERS=False)
+    def test_empty_field_selection_means_all_fields(self):
+        response = self.assert_within_budget(20, url='/api/products/?fields=,,')
+        product = response.json()['results'][0]
+        self.assertIn('images', product)
+        self.assertTrue(product['category_name'].startswith('Category'))
+
+
+# ----------------------------------------------------
+# 2. Keyset Pagination
+# ----------------------------------------------------
+
+class KeysetPaginationTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        create_catalog(45, images_per_product=0)
+
+    def walk(self, url):
+        ids = []
+        while url:
+            body = self.client.get(url).json()
+            ids.extend(product['id'] for product in body['results'])
+            url = body['next']
+        return ids
+
+    def test_walks_whole_catalog_without_duplicates(self):
+        ids = self.walk('/api/products/?page_size=10')
+        expected = list(Product.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_inserts_do_not_shift_following_pages(self):
+        first = self.client.get('/api/products/?page_size=10').json()
+        Product.objects.create(category=Category.objects.first(), name='New', description='',
+                               price=Decimal('1.00'), slug='new')
+        second = self.client.get(first['next']).json()
+        seen = {p['id'] for p in first['results']}
+        self.assertFalse(seen & {p['id'] for p in second['results']})
+        self.assertEqual(len(second['results']), 10)
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get('/api/products/?page_size=10').json()
+        second = self.client.get(first['next']).json()
+        back = self.client.get(second['previous']).json()
+        self.assertEqual([p['id'] for p in back['results']], [p['id'] for p in first['results']])
+
+    def test_respects_ordering_param(self):
+        ids = self.walk('/api/products/?page_size=7&ordering=price')
+        expected = list(Product.objects.order_by('price', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/products/?cursor=garbage').status_code, 404)
+
+    def test_cursor_predicate_seeks_into_index(self):
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+
+        from .pagination import KeysetCursorPagination
+
+        queryset = Product.objects.filter(is_available=True).order_by('-created_at', '-id')
+        first = self.client.get('/api/products/?page_size=10').json()
+        paginator = KeysetCursorPagination()
+        page, _, _ = paginator._page_queryset(queryset, Request(APIRequestFactory().get(first['next'])))
+        sql, params = page.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        # OR-ჯაჭვი მარტო SCAN-ს იძლევა - კურსორის პოზიციაზე ინდექსით ხტომა (SEARCH) უნდა იყოს
+        self.assertIn('SEARCH store_product USING INDEX store_product_newest_idx (created_at<?)', plan)
+
+
+# ----------------------------------------------------
+# 3. Full-text Search (FTS5)
+# ----------------------------------------------------
+
+class FullTextSearchTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.create(name='ავეჯი', slug='aveji')
+            self.sofa = Product.objects.create(category=category, name='ტყავის დივანი', slug='sofa',
+                                               description='რბილი და კომფორტული', price=Decimal('900.00'))
+            self.chair = Product.objects.create(category=category, name='ხის სკამი', slug='chair',
+                                                description='კარგად ერწყმის დივანს', price=Decimal('90.00'))
+            self.table = Product.objects.create(category=category, name='მუხის მაგიდა', slug='table',
+                                                description='სამზარეულოს მაგიდა', price=Decimal('300.00'))
+
+    def search(self, term, **params):
+        response = self.client.get('/api/products/', {'search': term, **params})
+        self.assertEqual(response.status_code, 200)
+        return [product['id'] for product in response.json()['results']]
+
+    def test_prefix_match_on_georgian_words(self):
+        self.assertEqual(self.search('მაგი'), [self.table.id])
+
+    def test_name_matches_rank_above_description_matches(self):
+        self.assertEqual(self.search('დივან'), [self.sofa.id, self.chair.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        Product.objects.filter(pk=self.table.pk).update(name='ოფისის მაგიდა')
+        self.assertEqual(self.search('ოფისის'), [self.table.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sofa.delete()
+        self.assertEqual(self.search('დივან'), [self.chair.id])
+
+    def test_search_results_paginate_by_rank(self):
+        first = self.client.get('/api/products/', {'search': 'დივან', 'page_size': 1}).json()
+        second = self.client.get(first['next']).json()
+        self.assertEqual([p['id'] for p in first['results'] + second['results']],
+                         [self.sofa.id, self.chair.id])
+
+
+# ----------------------------------------------------
+# 4. Checkout (პირობითი მარაგის ჩამოჭრა)
+# ----------------------------------------------------
+
+def create_buyer(username, products, quantity=1):
+    user = get_user_model().objects.create_user(username=username)
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.bulk_create(CartItem(cart=cart, product=product, quantity=quantity) for product in products)
+    return user
+
+
+class CheckoutTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.products = create_catalog(20, images_per_product=0)
+
+    def test_checkout_creates_order_and_decrements_stock(self):
+        user = create_buyer('buyer', self.products[:2], quantity=3)
+        self.client.force_authenticate(user)
+        response = self.client.post('/api/orders/', {'shipping_address': 'Tbilisi'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['items']), 2)
+        self.assertEqual(response.json()['status'], 'PENDING')
+        self.assertEqual(Product.objects.get(pk=self.products[0].pk).stock, 7)
+        self.assertFalse(CartItem.objects.filter(cart__user=user).exists())
+
+    def test_insufficient_stock_fails_whole_order(self):
+        Product.objects.filter(pk=self.products[1].pk).update(stock=1)
+        user = create_buyer('buyer', self.products[:2], quantity=2)
+        self.client.force_authenticate(user)
+        response = self.client.post('/api/orders/')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['products'], [self.products[1].pk])
+        self.assertEqual(Product.objects.get(pk=self.products[0].pk).stock, 10)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(CartItem.objects.filter(cart__user=user).count(), 2)
+
+    def test_empty_cart(self):
+        user = create_buyer('buyer', [])
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.post('/api/orders/').status_code, 400)
+
+    def test_query_count_does_not_grow_with_cart_size(self):
+        small, large = create_buyer('small', self.products[:1]), create_buyer('large', self.products[1:20])
+        with CaptureQueriesContext(connection) as small_ctx:
+            place_order(small)
+        with CaptureQueriesContext(connection) as large_ctx:
+            place_order(large)
+        self.assertEqual(len(small_ctx.captured_queries), len(large_ctx.captured_queries))
+
+
+# outbox-ის drain იმავე ნაკადში - ფონური task-ები TransactionTestCase-ის flush-ს არ ეჯახება
+@override_settings(STORE_TASKS_EAGER=True)
+class ConcurrentCheckoutTests(StoreTransactionTestCase):
+    def test_concurrent_checkouts_never_oversell(self):
+        category = Category.objects.create(name='Scarce', slug='scarce')
+        sofa = Product.objects.create(category=category, name='Sofa', slug='sofa', description='',
+                                      price=Decimal('500.00'), stock=5)
+        buyers = [create_buyer(f'buyer{i}', [sofa]) for i in range(12)]
+
+        def checkout(user):
+            try:
+                place_order(user)
+            except (InsufficientStock, OperationalError):
+                pass
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=checkout, args=(user,)) for user in buyers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        sold = OrderItem.objects.aggregate(total=Sum('quantity'))['total'] or 0
+        sofa.refresh_from_db()
+        self.assertGreaterEqual(sofa.stock, 0)
+        self.assertEqual(sold + sofa.stock, 5)
+
+
+# ----------------------------------------------------
+# 5. Cart Totals (SQL aggregate)
+# ----------------------------------------------------
+
+class CartTotalsTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.products = create_catalog(30, images_per_product=0)
+
+    def test_cart_response_is_constant_queries(self):
+        counts = []
+        for n, size in enumerate((1, 25)):
+            user = create_buyer(f'buyer{n}', self.products[:size], quantity=2)
+            cart = Cart.objects.get(user=user)
+            self.client.force_authenticate(user)
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(f'/api/carts/{cart.pk}/')
+            counts.append(len(ctx.captured_queries))
+            expected = sum(p.price * 2 for p in self.products[:size])
+            self.assertEqual(Decimal(str(response.json()['total_cart_price'])), expected)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_line_subtotals(self):
+        user = create_buyer('buyer', self.products[:3], quantity=4)
+        cart = Cart.objects.get(user=user)
+        self.client.force_authenticate(user)
+        items = self.client.get(f'/api/carts/{cart.pk}/items/').json()
+        self.assertEqual(sorted(Decimal(str(item['total_item_price'])) for item in items),
+                         sorted(p.price * 4 for p in self.products[:3]))
+
+    def test_total_price_property_without_annotation(self):
+        user = create_buyer('buyer', self.products[:2])
+        cart = Cart.objects.get(user=user)
+        self.assertEqual(cart.total_price, self.products[0].price + self.products[1].price)
+        self.assertEqual(Cart.objects.with_totals().get(pk=cart.pk).total_price, cart.total_price)
+
+
+# ----------------------------------------------------
+# 6. Catalog Cache (ვერსიებით ინვალიდაცია)
+# ----------------------------------------------------
+
+class CatalogCacheTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.products = create_catalog(6, categories=2, images_per_product=1)
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get('/api/products/?ordering=price&color=red')
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get('/api/products/?color=red&ordering=price')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        # ETag კატალოგის ვერსიებიდანაა - ქეშის hit-ი ბაზას საერთოდ არ ეხება
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(first.json(), second.json())
+
+    def test_product_save_invalidates_lists_and_its_category(self):
+        product = self.products[0]
+        category_url = f'/api/products/?category={product.category_id}'
+        other_url = f'/api/products/?category={self.products[1].category_id}'
+        for url in ('/api/products/', category_url, other_url):
+            self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            product.name = 'Renamed'
+            product.save()
+        self.assertEqual(self.client.get('/api/products/')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(category_url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(other_url)['X-Cache'], 'HIT')
+        names = [p['name'] for p in self.client.get('/api/products/').json()['results']]
+        self.assertIn('Renamed', names)
+
+    def test_category_detail_and_stats(self):
+        category = Category.objects.first()
+        self.client.get(f'/api/categories/{category.pk}/')
+        self.assertEqual(self.client.get(f'/api/categories/{category.pk}/')['X-Cache'], 'HIT')
+        admin = get_user_model().objects.create_user(username='admin', is_staff=True)
+        self.client.force_authenticate(admin)
+        stats = self.client.get('/api/catalog/cache-stats/').json()
+        self.assertGreaterEqual(stats['hits'], 1)
+        self.assertGreaterEqual(stats['misses'], 1)
+
+
+# ----------------------------------------------------
+# 7. Conditional GET (ETag / Last-Modified)
+# ----------------------------------------------------
+
+class ConditionalGetTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.products = create_catalog(5, categories=1, images_per_product=1)
+
+    def test_list_etag_short_circuits_before_serialization(self):
+        first = self.client.get('/api/products/')
+        self.assertIn('ETag', first)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_list_validators_see_deletes_and_unavailable_products(self):
+        first = self.client.get('/api/products/')
+        # MAX(updated_at) წაშლაზე არ იცვლება - სიას Last-Modified არ აქვს
+        self.assertNotIn('Last-Modified', first)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products[-1].delete()
+        second = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(len(second.json()['results']), 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products[0].is_available = False
+            self.products[0].save()
+        third = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=second['ETag'])
+        self.assertEqual(third.status_code, 200)
+        self.assertEqual(len(third.json()['results']), 3)
+
+    def test_etag_changes_with_product_or_category_updates(self):
+        etag = self.client.get('/api/products/')['ETag']
+        category = Category.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            category.name = 'Renamed'
+            category.save()
+        self.assertEqual(self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        detail = self.client.get(f'/api/products/{self.products[0].pk}/')
+        self.assertEqual(self.client.get(f'/api/products/{self.products[0].pk}/',
+                                         HTTP_IF_NONE_MATCH=detail['ETag']).status_code, 304)
+        ProductImage.objects.create(product=self.products[0], image='product_images/new.jpg')
+        self.assertEqual(self.client.get(f'/api/products/{self.products[0].pk}/',
+                                         HTTP_IF_NONE_MATCH=detail['ETag']).status_code, 200)
+
+    @override_settings(STORE_TASKS_EAGER=True)
+    def test_checkout_stock_update_changes_validators(self):
+        first = self.client.get('/api/products/')
+        buyer = create_buyer('etag-buyer', self.products[:1], quantity=2)
+        with self.captureOnCommitCallbacks(execute=True):
+            place_order(buyer, 'Tbilisi')
+        second = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        stock = {row['id']: row['stock'] for row in second.json()['results']}
+        self.assertEqual(stock[self.products[0].pk], 8)
+
+        # ვერსიის გაზრდა თავისთავად (updated_at-ის გარეშე) ETag-ს ცვლის
+        bump_catalog()
+        self.assertEqual(self.client.get('/api/products/', HTTP_IF_NONE_MATCH=second['ETag']).status_code, 200)
+
+    def test_if_modified_since_on_category_detail(self):
+        category = Category.objects.get()
+        response = self.client.get(f'/api/categories/{category.pk}/')
+        self.assertEqual(self.client.get(f'/api/categories/{category.pk}/',
+                                         HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+
+    def test_missing_object_is_still_404(self):
+        self.assertEqual(self.client.get('/api/products/999999/').status_code, 404)
+
+
+# ----------------------------------------------------
+# 8. სურათის ვარიანტები
+# ----------------------------------------------------
+
+class ImageVariantTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media, IMAGE_VARIANT_WIDTHS=(100, 200))
+        override.enable()
+        self.addCleanup(override.disable)
+        self.product = create_catalog(1, categories=1, images_per_product=0)[0]
+
+    def upload(self, width=400, height=300):
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (width, height), 'brown').save(buffer, format='JPEG')
+        return ProductImage.objects.create(
+            product=self.product, image=SimpleUploadedFile('sofa.jpg', buffer.getvalue(), 'image/jpeg'))
+
+    def test_variants_use_content_hash_names_and_feed_srcset(self):
+        image = self.upload()
+        variants = generate_variants(ProductImage, image.pk)
+        self.assertEqual(set(variants['formats']['webp']), {'100', '200'})
+        name = variants['formats']['webp']['100']
+        self.assertRegex(name, r'^product_images/derived/[0-9a-f]{20}-100w\.webp$')
+
+        response = APIClient().get(f'/api/products/{image.product_id}/')
+        srcset = response.json()['images'][0]['srcset']
+        self.assertIn('100w', srcset['webp'])
+        self.assertIn('200w', srcset['jpeg'])
+
+    def test_saved_variants_invalidate_cache_and_etag(self):
+        image = self.upload()
+        client = APIClient()
+        url = f'/api/products/{image.product_id}/'
+        before = client.get(url)
+        self.assertEqual(before.json()['images'][0]['srcset'], {})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            generate_variants(ProductImage, image.pk)
+        after = client.get(url, HTTP_IF_NONE_MATCH=before['ETag'])
+        self.assertEqual((after.status_code, after['X-Cache']), (200, 'MISS'))
+        self.assertIn('100w', after.json()['images'][0]['srcset']['webp'])
+
+    def test_identical_uploads_share_derivatives(self):
+        first, second = self.upload(), self.upload()
+        self.assertEqual(generate_variants(ProductImage, first.pk)['formats'],
+                         generate_variants(ProductImage, second.pk)['formats'])
+        self.assertIsNone(generate_variants(ProductImage, first.pk))  # უკვე აგებულია
+
+    def test_small_images_are_not_upscaled(self):
+        image = self.upload(width=80, height=60)
+        self.assertEqual(set(generate_variants(ProductImage, image.pk)['formats']['jpeg']), {'80'})
+
+
+# ----------------------------------------------------
+# 9. Bulk Import / Export
+# ----------------------------------------------------
+
+class CatalogImportExportTests(StoreTestCase):
+    CSV = (
+        'slug,name,category,description,price,stock,is_available,featured,color,material\n'
+        'sofa,ტყავის დივანი,Category 0,რბილი,900.00,3,true,false,black,leather\n'
+        'chair,Chair,Unknown,desc,10.00,1,true,false,,\n'
+        'table,Table,Category 1,desc,not-a-price,1,true,false,,\n'
+        'product-0,Updated name,Category 1,desc,5.50,,yes,1,white,wood\n'
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        create_catalog(2, categories=2, images_per_product=0)
+        self.admin = get_user_model().objects.create_user(username='admin', is_staff=True)
+
+    def test_import_upserts_and_reports_row_errors(self):
+        self.client.force_authenticate(self.admin)
+        upload = SimpleUploadedFile('feed.csv', self.CSV.encode('utf-8-sig'), 'text/csv')
+        report = self.client.post('/api/products/import/', {'file': upload}, format='multipart').json()
+        self.assertEqual(report['rows'], 4)
+        self.assertEqual(report['upserted'], 2)
+        self.assertEqual([error['row'] for error in report['errors']], [3, 4])
+        self.assertIn('category', report['errors'][0]['errors'])
+        self.assertIn('price', report['errors'][1]['errors'])
+
+        updated = Product.objects.get(slug='product-0')
+        self.assertEqual((updated.name, updated.category.name, updated.stock, updated.featured),
+                         ('Updated name', 'Category 1', 0, True))
+        self.assertEqual(Product.objects.get(slug='sofa').price, Decimal('900.00'))
+        self.assertEqual(Product.objects.count(), 3)
+
+    def test_import_keeps_columns_missing_from_the_file(self):
+        from .catalog_io import import_products, read_rows
+
+        feed = ('slug,name,category,description,price\n'
+                'product-1,Renamed,Category 1,desc,7.00\nnew-one,New,Category 0,desc,3.00\n')
+        report = import_products(read_rows(io.StringIO(feed), 'csv'))
+        self.assertEqual((report.upserted, report.error_count), (2, 0))
+        product = Product.objects.get(slug='product-1')
+        self.assertEqual((product.name, product.price, product.stock, product.color, product.material),
+                         ('Renamed', Decimal('7.00'), 10, 'red', 'wood'))
+        self.assertEqual(Product.objects.get(slug='new-one').stock, Product._meta.get_field('stock').default)
+
+        # JSONL-ში ჩანაწერებს სხვადასხვა სვეტები აქვს
+        base = '"name": "P", "description": "d", "category": "Category 0", "price": "1.00"'
+        lines = ['{"slug": "product-0", %s, "stock": 4}' % base, '{"slug": "product-1", %s, "color": "green"}' % base]
+        import_products(read_rows(io.StringIO('\n'.join(lines)), 'jsonl'))
+        self.assertEqual(list(Product.objects.filter(slug__in=['product-0', 'product-1']).order_by('slug')
+                              .values_list('stock', 'color')), [(4, 'blue'), (10, 'green')])
+
+    def test_import_requires_admin(self):
+        upload = SimpleUploadedFile('feed.csv', self.CSV.encode(), 'text/csv')
+        self.assertEqual(self.client.post('/api/products/import/', {'file': upload}).status_code, 401)
+
+    def test_export_streams_jsonl(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get('/api/products/export/?file_format=jsonl')
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])['category'], 'Category 0')
+
+    def test_export_round_trips_through_import(self):
+        from .catalog_io import export_rows, import_products, read_rows
+
+        exported = ''.join(export_rows(fmt='csv'))
+        report = import_products(read_rows(io.StringIO(exported), 'csv'))
+        self.assertEqual((report.upserted, report.error_count), (2, 0))
+
+
+# ----------------------------------------------------
+# 10. Cart Bulk Mutation
+# ----------------------------------------------------
+
+class CartBulkTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.products = create_catalog(40, images_per_product=0)
+        self.user = create_buyer('buyer', self.products[:2], quantity=2)
+        self.cart = Cart.objects.get(user=self.user)
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/carts/{self.cart.pk}/items/bulk/'
+
+    def quantities(self):
+        return dict(CartItem.objects.filter(cart=self.cart).values_list('product_id', 'quantity'))
+
+    def test_bulk_deltas_upsert_and_return_cart(self):
+        payload = [
+            {'product': self.products[0].pk, 'quantity': 3},
+            {'product': self.products[1].pk, 'quantity': -2},
+            {'product': self.products[2].pk, 'quantity': 1},
+            {'product': self.products[2].pk, 'quantity': 1},
+        ]
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.quantities(), {self.products[0].pk: 5, self.products[2].pk: 2})
+        expected = self.products[0].price * 5 + self.products[2].price * 2
+        self.assertEqual(Decimal(str(response.json()['total_cart_price'])), expected)
+
+    def test_query_count_is_constant(self):
+        payload = [{'product': product.pk, 'quantity': 1} for product in self.products[:30]]
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(self.url, payload[:2], format='json')
+        small = len(ctx.captured_queries)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(self.url, payload, format='json')
+        self.assertEqual(small, len(ctx.captured_queries))
+
+    def test_rejects_unknown_products_and_foreign_carts(self):
+        response = self.client.post(self.url, [{'product': 999999, 'quantity': 1}], format='json')
+        self.assertEqual(response.status_code, 400)
+        other = create_buyer('other', [])
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.post(self.url, [{'product': self.products[0].pk, 'quantity': 1}],
+                                          format='json').status_code, 404)
+
+    def test_single_create_increments_existing_line(self):
+        response = self.client.post(f'/api/carts/{self.cart.pk}/items/',
+                                    {'product': self.products[0].pk, 'quantity': 4}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['quantity'], 6)
+
+    def test_single_create_rejects_non_positive_quantity(self):
+        url = f'/api/carts/{self.cart.pk}/items/'
+        for quantity in (0, -1):
+            response = self.client.post(url, {'product': self.products[5].pk, 'quantity': quantity}, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('quantity', response.json())
+        self.assertNotIn(self.products[5].pk, self.quantities())
+        response = self.client.post(url, {'product': self.products[5].pk}, format='json')
+        self.assertEqual((response.status_code, response.json()['quantity']), (201, 1))
+
+
+# ----------------------------------------------------
+# 11. Tasks (სტატუსის პროგრესი, email)
+# ----------------------------------------------------
+
+@override_settings(STORE_TASKS_EAGER=True)
+class OrderTaskTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = get_user_model().objects.create_user(username='buyer', email='buyer@example.com')
+
+    def make_orders(self, status, days_old, count):
+        orders = Order.objects.bulk_create(Order(user=self.user, status=status) for _ in range(count))
+        Order.objects.filter(pk__in=[o.pk for o in orders]).update(
+            created_at=timezone.now() - timedelta(days=days_old))
+        return orders
+
+    def test_status_progression_moves_one_step_per_run_in_batches(self):
+        from .tasks import auto_update_order_status
+
+        self.make_orders('PENDING', 2, 7)
+        self.make_orders('PROCESSING', 4, 3)
+        self.make_orders('SHIPPED', 8, 2)
+        self.make_orders('PENDING', 0, 4)  # ჯერ ადრეა
+        with CaptureQueriesContext(connection) as ctx:
+            result = auto_update_order_status(batch_size=3)
+        self.assertEqual(result, {'SHIPPED->DELIVERED': 2, 'PROCESSING->SHIPPED': 3, 'PENDING->PROCESSING': 7})
+        self.assertTrue(all(q['sql'].startswith('UPDATE') for q in ctx.captured_queries))
+        counts = dict(Order.objects.values_list('status').annotate(n=Count('pk')))
+        self.assertEqual(counts, {'PENDING': 4, 'PROCESSING': 7, 'SHIPPED': 3, 'DELIVERED': 2})
+
+    def test_checkout_sends_confirmation_email(self):
+        from django.core import mail
+
+        product = create_catalog(1, images_per_product=0)[0]
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, product=product)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.post('/api/orders/').status_code, 201)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['buyer@example.com'])
+        self.assertFalse(OutboxEvent.objects.filter(processed_at__isnull=True).exists())
+
+    def test_scheduler_runs_beat_entries_once(self):
+        from django.core.management import call_command
+
+        self.make_orders('PENDING', 2, 1)
+        out = io.StringIO()
+        call_command('run_scheduled_tasks', '--once', stdout=out)
+        self.assertIn('PENDING->PROCESSING', out.getvalue())
+        self.assertTrue(Order.objects.filter(status='PROCESSING').exists())
+
+
+# ----------------------------------------------------
+# 12. Transactional Outbox
+# ----------------------------------------------------
+
+class OutboxTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        User = get_user_model()
+        self.users = User.objects.bulk_create(
+            User(username=f'buyer{i}', email=f'buyer{i}@example.com') for i in range(3))
+        self.orders = Order.objects.bulk_create(Order(user=user) for user in self.users)
+
+    def publish_orders(self):
+        from .outbox import publish
+
+        for order in self.orders:
+            publish('order.created', {'order_id': order.pk, 'user_id': order.user_id})
+
+    def test_rolled_back_checkout_leaves_no_event(self):
+        product = create_catalog(1, images_per_product=0)[0]
+        buyer = create_buyer('late', [product], quantity=50)
+        with self.assertRaises(InsufficientStock):
+            place_order(buyer)
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_checkout_event_feeds_email_and_analytics(self):
+        from django.core import mail
+
+        from .outbox import drain
+
+        product = create_catalog(1, images_per_product=0)[0]
+        buyer = create_buyer('analytics', [product], quantity=2)
+        buyer.email = 'analytics@example.com'
+        buyer.save()
+        place_order(buyer, 'Tbilisi')
+        self.assertEqual(set(OutboxEvent.objects.filter(topic='order.created').values_list('handler', flat=True)),
+                         {'store.handlers.send_order_confirmations', 'store.handlers.update_sales_rollups'})
+        self.assertFalse(SalesRollup.objects.exists())  # checkout-ი ანალიტიკას არ ელოდება
+
+        self.assertEqual(drain(), {'processed': 2, 'failed': 0})
+        self.assertEqual([m.to for m in mail.outbox], [['analytics@example.com']])
+        self.assertEqual(SalesRollup.objects.get(product=product).quantity, 2)
+
+    def test_batch_sends_all_emails_over_one_connection(self):
+        from unittest import mock
+
+        from django.core import mail
+        from django.core.mail.backends.locmem import EmailBackend
+
+        from .outbox import drain
+
+        self.publish_orders()
+        with mock.patch.object(EmailBackend, 'open', autospec=True, return_value=True) as opened:
+            result = drain(batch_size=10)
+        # order.created-ის ორი handler: email და გაყიდვების rollup-ები
+        self.assertEqual(result, {'processed': 6, 'failed': 0})
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), [u.email for u in self.users])
+        self.assertEqual(drain(), {'processed': 0, 'failed': 0})
+
+    def test_failure_is_retried_with_backoff(self):
+        from unittest import mock
+
+        from django.core.mail.backends.locmem import EmailBackend
+
+        from .outbox import drain
+
+        self.publish_orders()
+        with mock.patch.object(EmailBackend, 'send_messages', side_effect=ConnectionError('smtp down')), \
+                self.assertLogs('store.outbox', 'ERROR'):
+            # rollup-ის handler-ი email-ზე არ არის დამოკიდებული
+            self.assertEqual(drain(), {'processed': 3, 'failed': 3})
+        event = OutboxEvent.objects.filter(handler='store.handlers.send_order_confirmations').first()
+        self.assertEqual(event.attempts, 1)
+        self.assertIn('smtp down', event.last_error)
+        self.assertGreater(event.available_at, timezone.now())
+
+        # backoff-ის გასვლამდე ჩანაწერი აღარ აიღება; შემდეგ - წარმატებით მუშავდება
+        self.assertEqual(drain(), {'processed': 0, 'failed': 0})
+        OutboxEvent.objects.update(available_at=timezone.now())
+        self.assertEqual(drain(), {'processed': 3, 'failed': 0})
+
+
+# ----------------------------------------------------
+# 13. ProductListing (სიის read model)
+# ----------------------------------------------------
+
+class ProductListingTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        from .listing import rebuild_listings
+
+        self.products = create_catalog(25, images_per_product=2)
+        rebuild_listings(chunk_size=10)
+        self.client = APIClient()
+
+    def test_listing_matches_product_list(self):
+        listing = self.client.get('/api/catalog/listing/').json()
+        products = self.client.get('/api/products/').json()
+        self.assertEqual([row['id'] for row in listing['results']], [row['id'] for row in products['results']])
+        first, expected = listing['results'][0], products['results'][0]
+        for field in ('name', 'slug', 'category', 'category_name', 'price', 'color', 'material', 'created_at'):
+            self.assertEqual(first[field], expected[field], field)
+        self.assertTrue(expected['images'][0]['image'].endswith(first['image']))
+
+        second = self.client.get(listing['next']).json()
+        self.assertEqual(len(listing['results']) + len(second['results']), 25)
+        self.assertIsNone(second['next'])
+
+    def test_listing_is_one_query_without_joins(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/catalog/listing/', {'category': self.products[0].category_id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('JOIN', ctx.captured_queries[0]['sql'])
+
+    def test_signals_keep_listing_fresh(self):
+        product = self.products[0]
+        product.refresh_from_db()
+        product.price = Decimal('9.50')
+        product.save()
+        category = product.category
+        category.name = 'Renamed'
+        category.save()
+        ProductImage.objects.filter(product=product).delete()
+
+        row = json.loads(ProductListing.objects.get(pk=product.pk).payload)
+        self.assertEqual(row['price'], '9.50')
+        self.assertEqual(row['category_name'], 'Renamed')
+        self.assertIsNone(row['image'])
+
+        product.is_available = False
+        product.save()
+        ids = [row['id'] for row in self.client.get('/api/catalog/listing/', {'page_size': 100}).json()['results']]
+        self.assertNotIn(product.pk, ids)
+
+    def test_cascade_delete_of_product_with_images_drops_listing(self):
+        product, other = self.products[0], self.products[1]
+        product.delete()
+        Category.objects.filter(pk=other.category_id).delete()
+        # TestCase არ აკომიტებს - FOREIGN KEY-ის შემოწმება ხელით
+        connection.check_constraints()
+        self.assertFalse(ProductListing.objects.filter(product_id__in=[product.pk, other.pk]).exists())
+
+    def test_import_refreshes_listing(self):
+        from .catalog_io import import_products
+
+        rows = [(2, {'slug': 'product-1', 'name': 'Imported', 'description': 'x', 'price': '5.00',
+                      'category': 'Category 0'})]
+        self.assertEqual(import_products(rows).upserted, 1)
+        row = json.loads(ProductListing.objects.get(product__slug='product-1').payload)
+        self.assertEqual((row['name'], row['price'], row['category_name']), ('Imported', '5.00', 'Category 0'))
+
+
+# ----------------------------------------------------
+# 14. სიების სწრაფი სერიალიზაცია (golden: ბაიტ-იდენტური JSON)
+# ----------------------------------------------------
+
+class FastSerializerGoldenTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.products = create_catalog(30, images_per_product=2)
+        first = self.products[0]
+        Product.objects.filter(pk=first.pk).update(name='სავარძელი "ხის"\u2028ახალი', price=Decimal('1234.50'))
+        ProductImage.objects.filter(product=first).update(variants={
+            'source': 'x.jpg', 'formats': {'webp': {'320': 'product_images/derived/a-320w.webp',
+                                                    '640': 'product_images/derived/a-640w.webp'}}})
+        self.client = APIClient()
+
+    def assert_identical(self, path, params=None):
+        responses = []
+        for fast in (False, True):
+            bump_catalog()  # კატალოგის ქეში ორივე გზას ცალ-ცალკე უნდა აჩვენებდეს
+            with override_settings(STORE_FAST_SERIALIZERS=fast):
+                response = self.client.get(path, params or {})
+            self.assertEqual(response.status_code, 200)
+            responses.append(response.content)
+        self.assertEqual(responses[0], responses[1])
+        return json.loads(responses[1])
+
+    def test_product_list_pages_are_identical(self):
+        page = self.assert_identical('/api/products/')
+        self.assertEqual(len(page['results']), 20)
+        self.assert_identical(page['next'])
+        self.assert_identical('/api/products/', {'ordering': '-price', 'page_size': 7})
+        self.assert_identical('/api/products/', {'category': self.products[1].category_id})
+        self.assert_identical('/api/products/', {'fields': 'id,name,price'})
+        self.assert_identical('/api/products/', {'search': 'product'})
+
+    def test_order_list_is_identical(self):
+        user = create_buyer('golden', self.products[:3], quantity=2)
+        place_order(user)
+        CartItem.objects.create(cart=user.cart, product=self.products[5], quantity=3)
+        place_order(user)
+        self.client.force_authenticate(user)
+        page = self.assert_identical('/api/orders/')
+        self.assertEqual([len(order['items']) for order in page['results']], [1, 3])
+
+    def test_fast_list_skips_serializer(self):
+        from unittest import mock
+
+        from .serializers import ProductSerializer
+
+        with override_settings(STORE_FAST_SERIALIZERS=True), CaptureQueriesContext(connection) as ctx, \
+                mock.patch.object(ProductSerializer, 'to_representation', side_effect=AssertionError):
+            self.assertEqual(self.client.get('/api/products/', {'page_size': 50}).status_code, 200)
+        # values() + სურათები
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_renderer_matches_drf_json(self):
+        from rest_framework.renderers import JSONRenderer
+
+        from .renderers import FastJSONRenderer
+
+        data = {'price': Decimal('10.50'), 'when': timezone.now(), 'text': 'ა\u2028b\u2029"', 1: [None, True, 0.1]}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(data, 'application/json; indent=2'),
+                         JSONRenderer().render(data, 'application/json; indent=2'))
+
+    def test_nested_fields_require_a_loader(self):
+        from django.core.exceptions import ImproperlyConfigured
+
+        from .fastpath import FastListMixin
+
+        with self.assertRaisesMessage(ImproperlyConfigured, "['images']"):
+            type('BrokenView', (FastListMixin,), {'fast_fields': [('id', 'id', None), ('images', None, None)]})
+
+
+# ----------------------------------------------------
+# 15. SQLite-ის პროფილი (PRAGMA-ები, BEGIN IMMEDIATE)
+# ----------------------------------------------------
+
+class SQLiteTuningTests(StoreTestCase):
+    def test_pragmas_applied_on_connect(self):
+        from .database import read_pragmas
+
+        values = read_pragmas(connection, ['synchronous', 'busy_timeout', 'cache_size', 'temp_store'])
+        self.assertEqual(values, {'synchronous': 1, 'busy_timeout': 20000, 'cache_size': -64000, 'temp_store': 2})
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def test_file_database_switches_to_wal(self):
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+
+        from .database import read_pragmas
+
+        with tempfile.TemporaryDirectory() as tmp:
+            wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': f'{tmp}/wal.sqlite3'}, alias='wal-check')
+            try:
+                self.assertEqual(read_pragmas(wrapper, ['journal_mode']), {'journal_mode': 'wal'})
+            finally:
+                wrapper.close()
+
+    def test_tracked_database_keeps_its_journal_mode(self):
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+
+        from .database import read_pragmas
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f'{tmp}/tracked.sqlite3'
+            wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': path}, alias='tracked-check')
+            try:
+                with override_settings(SQLITE_KEEP_JOURNAL_MODE=[path]):
+                    self.assertEqual(read_pragmas(wrapper, ['journal_mode', 'busy_timeout']),
+                                     {'journal_mode': 'delete', 'busy_timeout': 20000})
+            finally:
+                wrapper.close()
+
+    def test_default_database_is_not_exempt_from_wal(self):
+        from django.conf import settings
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+
+        from .database import keeps_journal_mode
+
+        # გამონაკლისი opt-in-ია (SQLITE_KEEP_JOURNAL_MODE env) - ნაგულისხმევი db.sqlite3-იც WAL-ზე გადადის
+        self.assertEqual(settings.SQLITE_KEEP_JOURNAL_MODE, [])
+        default = DatabaseWrapper({**connection.settings_dict, 'NAME': settings.BASE_DIR / 'db.sqlite3'},
+                                  alias='default-check')
+        self.assertFalse(keeps_journal_mode(default))
+
+
+# ----------------------------------------------------
+# 16. Read Replica Router (primary + replica SQLite ფაილები)
+# ----------------------------------------------------
+
+class ReadReplicaRoutingTests(StoreTransactionTestCase):
+    """ replica-ები ცალკე SQLite ფაილებია და რეპლიკაცია არ ხდება - ასე ჩანს, რომელმა ბაზამ უპასუხა """
+    replica_aliases = ('replica_a', 'replica_b')
+
+    @classmethod
+    def setUpClass(cls):
+        from django.core.management import call_command
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+
+        super().setUpClass()
+        # settings.DATABASES-ის გარეთ შექმნილი კავშირები (ამ ნაკადში) - ტესტის ბაზების სიას არ ცვლის
+        cls.tmp = tempfile.mkdtemp()
+        paths = {alias: f'{cls.tmp}/{alias}.sqlite3' for alias in cls.replica_aliases}
+        paths['replica_down'] = f'{cls.tmp}/missing/dir/down.sqlite3'
+        for alias, path in paths.items():
+            connections[alias] = DatabaseWrapper({**connections['default'].settings_dict, 'NAME': path}, alias)
+        for alias in cls.replica_aliases:
+            call_command('migrate', database=alias, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        for alias in (*cls.replica_aliases, 'replica_down'):
+            connections[alias].close()
+            del connections[alias]
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        from .routers import reset_replica_health
+
+        reset_replica_health()
+        for alias in self.replica_aliases:
+            category = Category.objects.using(alias).create(name=f'Replica {alias}', slug=alias)
+            Product.objects.using(alias).create(category_id=category.pk, name=f'On {alias}', slug=f'on-{alias}',
+                                                description='', price=Decimal('1.00'))
+        # replica-ების შევსების სიგნალებმა bump_catalog გამოიძახეს - ჩამორჩენის ფანჯარა არ უნდა მოქმედებდეს
+        get_cache().clear()
+        self.client = APIClient()
+
+    def tearDown(self):
+        for alias in self.replica_aliases:
+            Category.objects.using(alias).all().delete()
+
+    def product_names(self):
+        # კატალოგის ქეში არ უნდა უპასუხოს (bump_catalog კი replica-ს ჩამორჩენის ფანჯარას გახსნიდა)
+        get_cache().clear()
+        return [row['name'] for row in self.client.get('/api/products/', {'fields': 'name'}).json()['results']]
+
+    def test_catalog_reads_round_robin_across_replicas(self):
+        with override_settings(STORE_READ_REPLICAS=list(self.replica_aliases)):
+            names = [self.product_names() for _ in range(4)]
+        self.assertEqual(sorted(map(tuple, names)),
+                         [('On replica_a',), ('On replica_a',), ('On replica_b',), ('On replica_b',)])
+
+    def test_unhealthy_replica_is_skipped(self):
+        with override_settings(STORE_READ_REPLICAS=['replica_down', 'replica_a']):
+            self.assertEqual([self.product_names() for _ in range(3)], [['On replica_a']] * 3)
+        with override_settings(STORE_READ_REPLICAS=['replica_down']):
+            self.assertEqual(self.product_names(), [])  # primary ცარიელია
+
+    def test_cart_and_order_stay_on_primary(self):
+        from django.db import router
+
+        from .routers import replica_reads, routing_scope
+
+        with override_settings(STORE_READ_REPLICAS=['replica_a']), routing_scope(), replica_reads():
+            self.assertEqual(router.db_for_read(Product), 'replica_a')
+            self.assertEqual(router.db_for_read(Cart), 'default')
+            self.assertEqual(router.db_for_read(Order), 'default')
+        # view-ის გარეთ (მაგ. management ბრძანებები) - ყოველთვის primary
+        with override_settings(STORE_READ_REPLICAS=['replica_a']):
+            self.assertEqual(router.db_for_read(Product), 'default')
+
+    def test_write_pins_rest_of_request_to_primary(self):
+        from django.db import router
+
+        from .routers import replica_reads, routing_scope
+
+        with override_settings(STORE_READ_REPLICAS=['replica_a']):
+            with routing_scope(), replica_reads():
+                self.assertEqual(router.db_for_read(Product), 'replica_a')
+                category = Category.objects.create(name='Fresh', slug='fresh')
+                self.assertEqual(router.db_for_read(Product), 'default')
+                self.assertTrue(Category.objects.filter(pk=category.pk, name='Fresh').exists())
+            # ახალი მოთხოვნა - მიბმა აღარ მოქმედებს
+            self.assertEqual(self.product_names(), ['On replica_a'])
+
+    def test_availability_reads_stock_and_holds_from_primary(self):
+        category = Category.objects.create(name='Primary', slug='primary')
+        product = Product.objects.create(category=category, name='Held', slug='held', description='',
+                                         price=Decimal('1.00'), stock=7)
+        cart = Cart.objects.create(user=get_user_model().objects.create_user(username='holder'))
+        StockHold.objects.create(cart=cart, product=product, quantity=2,
+                                 expires_at=timezone.now() + timedelta(minutes=5))
+        get_cache().clear()
+
+        with override_settings(STORE_READ_REPLICAS=['replica_a']):
+            response = self.client.get('/api/products/availability/', {'ids': product.pk})
+            # კატალოგის სიები კვლავ replica-დან იკითხება - მხოლოდ availability-ა primary-ზე
+            self.assertEqual(self.product_names(), ['On replica_a'])
+        self.assertEqual(response.json(), {'results': [{'id': product.pk, 'available': 5}]})
+
+    def test_reads_stay_on_primary_within_replica_lag_after_catalog_write(self):
+        from .cache import LAST_WRITE_KEY
+
+        def names_after_write(seconds_ago):
+            bump_catalog()
+            get_cache().set(LAST_WRITE_KEY, time.time() - seconds_ago, timeout=None)
+            return [row['name'] for row in self.client.get('/api/products/', {'fields': 'name'}).json()['results']]
+
+        with override_settings(STORE_READ_REPLICAS=['replica_a'], STORE_REPLICA_MAX_LAG=5):
+            # ახალი ვერსიის ქეში primary-დან ივსება - ჩამორჩენილი replica-დან არა
+            self.assertEqual(names_after_write(0), [])
+            self.assertEqual(names_after_write(10), ['On replica_a'])
+        with override_settings(STORE_READ_REPLICAS=['replica_a'], STORE_REPLICA_MAX_LAG=0):
+            self.assertEqual(names_after_write(0), ['On replica_a'])
+
+
+# ----------------------------------------------------
+# 17. Async (ASGI) Views - იგივე JSON, რაც სინქრონულ endpoint-ებს
+# ----------------------------------------------------
+
+class AsyncViewTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.products = create_catalog(30, images_per_product=2)
+        ProductImage.objects.filter(product=self.products[0]).update(variants={
+            'source': 'x.jpg', 'formats': {'webp': {'320': 'product_images/derived/a-320w.webp'}}})
+        self.client = APIClient()
+
+    def sync_json(self, path, params=None):
+        bump_catalog()
+        response = self.client.get(path, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    async def async_get(self, path, params=None, **headers):
+        from django.test import AsyncClient
+
+        return await AsyncClient().get(path, params or {}, headers=headers)
+
+    def test_views_are_natively_async(self):
+        from .routers import ReplicaPinningMiddleware
+        from .views import AsyncCartDetailView, AsyncCategoryListView, AsyncProductDetailView, AsyncProductListView
+
+        for view in (AsyncProductListView, AsyncProductDetailView, AsyncCategoryListView, AsyncCartDetailView):
+            self.assertTrue(view.view_is_async, view)
+        self.assertTrue(ReplicaPinningMiddleware.async_capable)
+
+    async def test_product_list_matches_sync(self):
+        from asgiref.sync import sync_to_async
+
+        for params in ({}, {'ordering': '-price', 'page_size': 7}, {'category': self.products[1].category_id},
+                       {'fields': 'id,name,price'}, {'color': 'red', 'material': 'wood'}):
+            expected = await sync_to_async(self.sync_json)('/api/products/', params)
+            response = await self.async_get('/api/async/products/', params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['results'], expected['results'], params)
+
+        first = (await self.async_get('/api/async/products/')).json()
+        self.assertTrue(first['next'].startswith('http://testserver/api/async/products/?cursor='))
+        second = (await self.async_get(first['next'])).json()
+        expected = await sync_to_async(self.sync_json)('/api/products/', {'page_size': 40})
+        self.assertEqual(first['results'] + second['results'], expected['results'])
+        self.assertIsNone(second['next'])
+        self.assertEqual((await self.async_get('/api/async/products/', {'category': 'x'})).status_code, 400)
+        self.assertEqual((await self.async_get('/api/async/products/', {'cursor': 'bad'})).status_code, 404)
+
+    def test_product_detail_runs_independent_queries(self):
+        from asgiref.sync import async_to_sync
+
+        product = self.products[0]
+        expected = self.sync_json(f'/api/products/{product.pk}/')
+        with CaptureQueriesContext(connection) as ctx:
+            response = async_to_sync(self.async_get)(f'/api/async/products/{product.pk}/')
+        self.assertEqual(response.json(), expected)
+        # პროდუქტი, კატეგორიის სახელი, სურათები - ერთმანეთზე დამოუკიდებლად (gather)
+        self.assertEqual(len(ctx.captured_queries), 3)
+
+        response = async_to_sync(self.async_get)('/api/async/products/999999/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'detail': 'No Product matches the given query.'})
+
+    async def test_category_list_matches_sync(self):
+        from asgiref.sync import sync_to_async
+
+        for params in ({}, {'ordering': '-created_at'}, {'search': 'category 1'}):
+            expected = await sync_to_async(self.sync_json)('/api/categories/', params)
+            self.assertEqual((await self.async_get('/api/async/categories/', params)).json(), expected, params)
+
+    async def test_cart_retrieve_matches_sync_and_requires_owner(self):
+        from asgiref.sync import sync_to_async
+
+        from users.tokens import ClaimsRefreshToken
+
+        def setup():
+            owner = create_buyer('owner', self.products[:3], quantity=2)
+            create_buyer('other', self.products[3:4])
+            self.client.force_authenticate(owner)
+            return owner.cart.pk, str(ClaimsRefreshToken.for_user(owner).access_token), \
+                str(ClaimsRefreshToken.for_user(get_user_model().objects.get(username='other')).access_token)
+
+        cart_id, token, other_token = await sync_to_async(setup)()
+        expected = await sync_to_async(self.sync_json)(f'/api/carts/{cart_id}/')
+        path = f'/api/async/carts/{cart_id}/'
+
+        response = await self.async_get(path, Authorization=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected)
+        self.assertEqual(Decimal(str(response.json()['total_cart_price'])),
+                         sum(product.price * 2 for product in self.products[:3]))
+
+        response = await self.async_get(path)
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response.headers)
+        self.assertEqual((await self.async_get(path, Authorization='Bearer broken')).status_code, 401)
+        self.assertEqual((await self.async_get(path, Authorization=f'Bearer {other_token}')).status_code, 404)
+
+
+# ----------------------------------------------------
+# 18. Performance Middleware (Server-Timing, Prometheus, N+1, ნელი query-ები)
+# ----------------------------------------------------
+
+@override_settings(STORE_METRICS_TOKEN='s3cret')
+class PerformanceMiddlewareTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        from .profiling import reset_metrics
+
+        reset_metrics()
+        self.products = create_catalog(5, images_per_product=1)
+        self.client = APIClient()
+
+    def metrics(self):
+        response = self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        return response.content.decode()
+
+    @override_settings(STORE_PERF_SAMPLE_RATE=0)
+    def test_unsampled_request_records_wall_time_and_size_only(self):
+        response = self.client.get('/api/products/')
+        self.assertRegex(response['Server-Timing'], r'^total;dur=[\d.]+$')
+        metrics = self.metrics()
+        self.assertIn('store_request_duration_seconds_count{method="GET",view="product-list"} 1', metrics)
+        self.assertIn(f'store_response_size_bytes_sum{{method="GET",view="product-list"}} {len(response.content)}',
+                      metrics)
+        self.assertNotIn('store_request_sql_queries_count{method="GET",view="product-list"}', metrics)
+
+    @override_settings(STORE_PERF_SAMPLE_RATE=1)
+    def test_sampled_request_measures_sql_serializer_and_render(self):
+        bump_catalog()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/api/products/{self.products[0].pk}/')
+        queries = len(ctx.captured_queries)
+        timing = response['Server-Timing']
+        self.assertIn(f'desc="{queries} queries"', timing)
+        self.assertRegex(timing, r'^sql;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+, '
+                                 r'render;dur=[\d.]+, total;dur=[\d.]+$')
+        metrics = self.metrics()
+        labels = '{method="GET",view="product-detail"}'
+        self.assertIn(f'store_request_sql_queries_sum{labels} {queries}', metrics)
+        self.assertIn(f'store_request_serialize_duration_seconds_count{labels} 1', metrics)
+        self.assertIn(f'store_sampled_requests_total{labels} 1', metrics)
+
+    @override_settings(STORE_PERF_SAMPLE_RATE=1, STORE_PERF_DUPLICATE_THRESHOLD=3)
+    def test_repeated_queries_are_reported_as_n_plus_one(self):
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+
+        from .profiling import PerformanceMiddleware, recent_duplicates
+
+        def n_plus_one(request):
+            for product in Product.objects.all():
+                list(product.images.all())
+            return HttpResponse('ok')
+
+        with self.assertLogs('store.profiling', 'WARNING') as logs:
+            PerformanceMiddleware(n_plus_one)(RequestFactory().get('/loop/'))
+        self.assertIn('Possible N+1', logs.output[0])
+        self.assertEqual(recent_duplicates[-1]['queries'][0]['count'], 5)
+        self.assertIn('store_productimage', recent_duplicates[-1]['queries'][0]['sql'])
+
+    @override_settings(STORE_PERF_SAMPLE_RATE=1, STORE_PERF_SLOW_QUERY_MS=0)
+    def test_slow_queries_are_captured_with_query_plan(self):
+        from .profiling import recent_slow_queries
+
+        bump_catalog()
+        with self.assertLogs('store.profiling', 'WARNING'):
+            self.client.get(f'/api/products/{self.products[0].pk}/')
+        selects = [entry for entry in recent_slow_queries if entry['sql'].startswith('SELECT')]
+        self.assertTrue(selects)
+        self.assertTrue(all(entry['view'] == 'GET product-detail' for entry in selects))
+        self.assertTrue(any('store_product' in line for entry in selects for line in entry['plan']))
+
+        admin = get_user_model().objects.create_user(username='admin', is_staff=True)
+        self.client.force_authenticate(admin)
+        report = self.client.get('/api/metrics/slow-queries/').json()
+        self.assertTrue(report['slow_queries'])
+
+    def test_metrics_endpoint_requires_configured_token(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+        self.assertEqual(self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertIn('# TYPE store_request_duration_seconds histogram', self.metrics())
+
+    def test_metrics_endpoint_without_token_is_closed_outside_debug(self):
+        with override_settings(STORE_METRICS_TOKEN=''):
+            self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+            with override_settings(DEBUG=True):
+                self.assertEqual(self.client.get('/api/metrics/').status_code, 200)
+
+    @override_settings(STORE_PERF_SAMPLE_RATE=1)
+    async def test_async_views_are_profiled(self):
+        from django.test import AsyncClient
+
+        response = await AsyncClient().get('/api/async/categories/')
+        self.assertRegex(response['Server-Timing'], r'^sql;dur=[\d.]+;desc="1 queries"')
+
+
+# ----------------------------------------------------
+# 19. Benchmark-ების ნაკრები (fixtures, სცენარები, რეპორტი)
+# ----------------------------------------------------
+
+@override_settings(STORE_TASKS_EAGER=True)
+class BenchmarkSuiteTests(StoreTransactionTestCase):
+    def test_fixture_generator_seeds_every_model(self):
+        from users.models import CustomUser
+
+        from .benchmarks.fixtures import generate_fixtures
+
+        fixtures = generate_fixtures(categories=3, products=12, images_per_product=2, users=4, cart_items=2,
+                                     orders_per_user=3, items_per_order=2)
+        self.assertEqual(len(fixtures['category_ids']), 3)
+        self.assertEqual(len(fixtures['product_ids']), 12)
+        self.assertEqual(ProductImage.objects.count(), 24)
+        self.assertEqual(ProductListing.objects.count(), 12)
+        self.assertEqual(CustomUser.objects.filter(username__startswith='bench-user-').count(), 4)
+        self.assertEqual(CartItem.objects.filter(cart_id__in=[cart for _, cart in fixtures['users']]).count(), 8)
+        self.assertEqual(Order.objects.count(), 12)
+        self.assertEqual(OrderItem.objects.count(), 24)
+        order = Order.objects.annotate(items_sum=Sum(F('items__price') * F('items__quantity'))).first()
+        self.assertEqual(order.total_price, order.items_sum)
+        self.assertEqual(sum(UserOrderStats.objects.values_list('order_count', flat=True)), 12)
+
+    def test_scenarios_produce_comparable_report(self):
+        import copy
+
+        from .benchmarks.fixtures import generate_fixtures
+        from .benchmarks.runner import build_report, compare_reports, issue_tokens, run_scenario
+        from .benchmarks.scenarios import SCENARIOS
+        from .benchmarks.transport import InProcessTransport
+
+        fixtures = generate_fixtures(categories=2, products=10, users=2, orders_per_user=2)
+        tokens = issue_tokens(fixtures)
+        # in-memory ტესტის ბაზაზე ერთი ნაკადი (shared cache ცხრილებს კეტავს); ფაილურ ბაზაზე - --concurrency
+        results = {name: run_scenario(name, InProcessTransport, fixtures, tokens, iterations=3, concurrency=1,
+                                      warmup=0) for name in SCENARIOS}
+        for name, result in results.items():
+            self.assertEqual(result['errors'], 0, name)
+            self.assertGreater(result['queries_per_request'], 0, name)
+            self.assertTrue({'p50_ms', 'p95_ms', 'p99_ms', 'requests_per_sec'} <= set(result), name)
+        self.assertEqual(results['checkout']['steps']['place_order']['runs'], 3)
+        self.assertEqual(Order.objects.count(), 4 + 3)
+
+        report = json.loads(json.dumps(build_report(results, 'inprocess', {'products': 10},
+                                                    {'iterations': 3, 'concurrency': 1})))
+        self.assertEqual(compare_reports(report, report), [])
+        regressed = copy.deepcopy(report)
+        regressed['scenarios']['browse']['steps']['product_list']['queries_per_request'] += 20
+        self.assertEqual([(item['step'], item['metric']) for item in compare_reports(report, regressed)],
+                         [('browse.product_list', 'queries_per_request')])
+
+
+# ----------------------------------------------------
+# 20. შეკვეთების შეჯამება (UserOrderStats, /api/orders/summary/)
+# ----------------------------------------------------
+
+@override_settings(STORE_TASKS_EAGER=True)
+class OrderStatsTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.products = create_catalog(4, images_per_product=0)
+        self.user = create_buyer('buyer', self.products[:2], quantity=1)
+
+    def stats_row(self, user):
+        fields = ['order_count', 'total_spent', 'last_order_at', 'pending_count', 'processing_count',
+                  'shipped_count', 'delivered_count', 'canceled_count']
+        return UserOrderStats.objects.filter(user=user).values(*fields).first()
+
+    def rebuilt_row(self, user):
+        from .order_stats import rebuild_order_stats
+
+        incremental = self.stats_row(user)
+        rebuild_order_stats(chunk_size=1)
+        return incremental, self.stats_row(user)
+
+    def test_checkout_updates_stats_and_summary_is_single_query(self):
+        first = place_order(self.user)
+        CartItem.objects.create(cart=Cart.objects.get(user=self.user), product=self.products[2], quantity=2)
+        second = place_order(self.user)
+
+        self.client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/orders/summary/')
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['order_count'], 2)
+        self.assertEqual(Decimal(body['total_spent']), first.total_price + second.total_price)
+        self.assertEqual(body['status_counts'], {'PENDING': 2, 'PROCESSING': 0, 'SHIPPED': 0,
+                                                 'DELIVERED': 0, 'CANCELED': 0})
+        self.assertIsNotNone(body['last_order_at'])
+
+    def test_summary_without_orders_returns_zeros(self):
+        self.client.force_authenticate(self.user)
+        body = self.client.get('/api/orders/summary/').json()
+        self.assertEqual((body['order_count'], Decimal(body['total_spent']), body['last_order_at']),
+                         (0, Decimal('0'), None))
+        self.assertEqual(set(body['status_counts'].values()), {0})
+        self.assertEqual(APIClient().get('/api/orders/summary/').status_code, 401)
+
+    def test_status_changes_shift_counters_incrementally(self):
+        from .tasks import auto_update_order_status
+
+        order = place_order(self.user)
+        Order.objects.filter(pk=order.pk).update(created_at=timezone.now() - timedelta(days=2))
+        auto_update_order_status(batch_size=1)
+        row = self.stats_row(self.user)
+        self.assertEqual((row['pending_count'], row['processing_count']), (0, 1))
+
+        order.refresh_from_db()
+        order.status = 'CANCELED'
+        order.save()
+        incremental, rebuilt = self.rebuilt_row(self.user)
+        self.assertEqual((incremental['canceled_count'], incremental['total_spent']), (1, Decimal('0')))
+        # created_at ზემოთ UPDATE-ით შეიცვალა (სიგნალის გარეშე) - last_order_at აქ არ შედარდება
+        incremental.pop('last_order_at'), rebuilt.pop('last_order_at')
+        self.assertEqual(incremental, rebuilt)
+
+    def test_delete_and_rebuild_fix_drift(self):
+        from .order_stats import rebuild_order_stats
+
+        order = place_order(self.user)
+        UserOrderStats.objects.filter(user=self.user).update(order_count=99, pending_count=0)
+        self.assertEqual(rebuild_order_stats(chunk_size=1), 1)
+        self.assertEqual((self.stats_row(self.user)['order_count'], self.stats_row(self.user)['pending_count']), (1, 1))
+
+        order.delete()
+        self.assertFalse(UserOrderStats.objects.filter(user=self.user).exists())
+
+
+# ----------------------------------------------------
+# 21. გაყიდვების rollup-ები და ანალიტიკის endpoint-ები
+# ----------------------------------------------------
+
+@override_settings(STORE_TASKS_EAGER=True)
+class SalesRollupTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.products = create_catalog(4, categories=2, images_per_product=0)
+        self.admin = get_user_model().objects.create_user(username='admin', is_staff=True)
+
+    def buy(self, username, lines):
+        user = get_user_model().objects.filter(username=username).first() \
+            or get_user_model().objects.create_user(username=username)
+        cart, _ = Cart.objects.get_or_create(user=user)
+        CartItem.objects.bulk_create(CartItem(cart=cart, product=self.products[n], quantity=q) for n, q in lines)
+        with self.captureOnCommitCallbacks(execute=True):
+            return place_order(user)
+
+    def buckets(self):
+        return set(SalesRollup.objects.values_list('date', 'product_id', 'category_id', 'quantity', 'revenue',
+                                                   'order_count'))
+
+    def test_orders_update_rollups_incrementally_and_match_rebuild(self):
+        from .analytics import rebuild_rollups
+
+        self.buy('alice', [(0, 2), (1, 1)])
+        order = self.buy('bob', [(0, 1)])
+        today = timezone.localdate()
+        self.assertEqual(SalesRollup.objects.get(date=today, product=self.products[0]).quantity, 3)
+        self.assertEqual(SalesRollup.objects.get(date=today, product=self.products[0]).order_count, 2)
+
+        # გაუქმება rollup-იდან აკლდება (order.updated)
+        with self.captureOnCommitCallbacks(execute=True):
+            order.status = 'CANCELED'
+            order.save()
+        incremental = self.buckets()
+        self.assertEqual(SalesRollup.objects.get(date=today, product=self.products[0]).quantity, 2)
+
+        SalesRollup.objects.all().delete()
+        self.assertEqual(rebuild_rollups(chunk_days=1), 2)
+        self.assertEqual(self.buckets(), incremental)
+
+    def test_refresh_is_idempotent(self):
+        from .analytics import refresh_rollups
+
+        order = self.buy('alice', [(2, 4)])
+        before = self.buckets()
+        refresh_rollups([order.pk])
+        refresh_rollups([order.pk])
+        self.assertEqual(self.buckets(), before)
+
+    def test_reports_read_only_rollups(self):
+        self.buy('alice', [(0, 1), (1, 5)])
+        self.buy('bob', [(1, 1), (3, 2)])
+        self.client.force_authenticate(self.admin)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/analytics/top-products/', {'limit': 2, 'metric': 'quantity'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn('store_salesrollup', ctx.captured_queries[0]['sql'])
+        self.assertNotIn('store_orderitem', ctx.captured_queries[0]['sql'])
+        results = response.json()['results']
+        self.assertEqual([(row['product_id'], row['quantity']) for row in results], [(self.products[1].pk, 6),
+                                                                                     (self.products[3].pk, 2)])
+        self.assertEqual(results[0]['revenue'], f'{self.products[1].price * 6:.2f}')
+
+        categories = self.client.get('/api/analytics/revenue-by-category/').json()['results']
+        total = sum(Decimal(row['revenue']) for row in categories)
+        self.assertEqual(total, Order.objects.aggregate(total=Sum('total_price'))['total'])
+
+        series = self.client.get('/api/analytics/timeseries/', {'interval': 'month'}).json()['results']
+        self.assertEqual(len(series), 1)
+        self.assertEqual(Decimal(series[0]['revenue']), total)
+        self.assertEqual(series[0]['quantity'], 9)
+
+    def test_admin_only_and_validation(self):
+        user = get_user_model().objects.create_user(username='buyer')
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get('/api/analytics/top-products/').status_code, 403)
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.get('/api/analytics/timeseries/',
+                                         {'start': '2026-02-01', 'end': '2026-01-01'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/analytics/top-products/', {'metric': 'price'}).status_code, 400)
+
+
+# ----------------------------------------------------
+# 22. Facet-ები (?facets=1 - ერთი GROUP BY)
+# ----------------------------------------------------
+
+class FacetTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.products = create_catalog(12, categories=3, images_per_product=0)
+        Product.objects.filter(pk__in=[p.pk for p in self.products[:4]]).update(material='oak')
+        Product.objects.filter(pk=self.products[0].pk).update(price=Decimal('99.99'))
+        Product.objects.filter(pk=self.products[1].pk).update(price=Decimal('1500'))
+        bump_catalog()
+
+    def facets(self, **params):
+        response = self.client.get('/api/products/', {'facets': '1', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_counts_for_whole_catalog(self):
+        facets = self.facets()['facets']
+        self.assertEqual(sum(option['count'] for option in facets['category']), 12)
+        self.assertEqual({option['label'] for option in facets['category']}, {'Category 0', 'Category 1', 'Category 2'})
+        self.assertEqual(facets['color'], [{'value': 'blue', 'count': 6}, {'value': 'red', 'count': 6}])
+        self.assertEqual(facets['material'], [{'value': 'wood', 'count': 8}, {'value': 'oak', 'count': 4}])
+        self.assertEqual([bucket['count'] for bucket in facets['price']], [1, 10, 0, 0, 1])
+        self.assertEqual((facets['price'][0]['min'], facets['price'][-1]['max']), ('0.00', None))
+        self.assertNotIn('facets', self.client.get('/api/products/').json())
+
+    def test_counts_are_disjunctive_for_selected_filters(self):
+        body = self.facets(color='red', material='oak')
+        self.assertEqual({product['color'] for product in body['results']}, {'red'})
+        self.assertEqual(len(body['results']), 2)
+        facets = body['facets']
+        # ფერის facet-ი material=oak-ით, მაგრამ ფერის ფილტრის გარეშე
+        self.assertEqual(facets['color'], [{'value': 'blue', 'count': 2}, {'value': 'red', 'count': 2}])
+        self.assertEqual(facets['material'], [{'value': 'wood', 'count': 4}, {'value': 'oak', 'count': 2}])
+        self.assertEqual(sum(option['count'] for option in facets['category']), 2)
+
+    def test_price_buckets_ignore_the_price_range(self):
+        body = self.facets(price_min='100', price_max='105', color='red')
+        self.assertEqual(sorted(product['price'] for product in body['results']), ['103.00', '105.00'])
+        facets = body['facets']
+        # ფასის bucket-ები color=red-ით, მაგრამ ფასის დიაპაზონის გარეშე
+        self.assertEqual([bucket['count'] for bucket in facets['price']], [0, 5, 0, 0, 1])
+        # დანარჩენი facet-ები კი დიაპაზონით ითვლება
+        self.assertEqual(facets['color'], [{'value': 'blue', 'count': 2}, {'value': 'red', 'count': 2}])
+        self.assertEqual(sum(option['count'] for option in facets['category']), 2)
+
+    def test_single_grouped_query_from_covering_index(self):
+        from .facets import facet_counts
+
+        queryset = Product.objects.filter(is_available=True)
+        with CaptureQueriesContext(connection) as ctx:
+            facet_counts(queryset, {'color': 'red'}, (Decimal('100'), None))
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn('GROUP BY', ctx.captured_queries[0]['sql'])
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + ctx.captured_queries[0]['sql'])
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('COVERING INDEX store_product_facets_idx', plan)
+
+
+# ----------------------------------------------------
+# 23. ProductFilter + სორტირება ინდექსით (EXPLAIN QUERY PLAN)
+# ----------------------------------------------------
+
+class ProductFilterTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.products = create_catalog(12, categories=2, images_per_product=0)
+        Product.objects.filter(pk__in=[p.pk for p in self.products[:3]]).update(featured=True)
+        Product.objects.filter(pk__in=[p.pk for p in self.products[:2]]).update(stock=0)
+
+    def ids(self, **params):
+        response = self.client.get('/api/products/', {'page_size': 100, **params})
+        self.assertEqual(response.status_code, 200)
+        return [product['id'] for product in response.json()['results']]
+
+    def test_price_range_stock_and_featured(self):
+        prices = {p.pk: p.price for p in self.products}
+        self.assertEqual(set(self.ids(price_min='103', price_max='106.50')),
+                         {pk for pk, price in prices.items() if Decimal('103') <= price <= Decimal('106.50')})
+        self.assertEqual(set(self.ids(in_stock='true')), {p.pk for p in self.products[2:]})
+        self.assertEqual(set(self.ids(in_stock='false')), {p.pk for p in self.products[:2]})
+        self.assertEqual(set(self.ids(featured='true', in_stock='true')), {self.products[2].pk})
+        ordered = self.ids(ordering='-price', price_max='105')
+        self.assertEqual(ordered, sorted(ordered, key=prices.get, reverse=True))
+        self.assertEqual(self.client.get('/api/products/', {'price_min': 'cheap'}).status_code, 400)
+
+    def page_query_plan(self, params):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get('/api/products/', params).status_code, 200)
+        pages = [q['sql'] for q in ctx.captured_queries
+                 if q['sql'].startswith('SELECT') and 'FROM "store_product"' in q['sql'] and 'LIMIT' in q['sql']]
+        self.assertEqual(len(pages), 1, params)
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + pages[0])
+            return ' | '.join(str(row[-1]) for row in cursor.fetchall())
+
+    def test_common_filter_and_sort_combinations_use_an_index(self):
+        category = self.products[0].category_id
+        combinations = [
+            {},
+            {'ordering': 'price'},
+            {'ordering': '-price'},
+            {'ordering': 'name'},
+            {'category': category},
+            {'category': category, 'ordering': 'price'},
+            {'price_min': '101', 'price_max': '110', 'ordering': 'price'},
+            {'category': category, 'price_min': '101', 'ordering': '-price'},
+            {'featured': 'true'},
+            {'in_stock': 'true'},
+        ]
+        for params in combinations:
+            plan = self.page_query_plan(params)
+            self.assertIn('USING INDEX', plan, params)
+            self.assertNotIn('USE TEMP B-TREE', plan, params)
+
+
+# ----------------------------------------------------
+# 24. მარაგის ჯავშნები (StockHold, TTL, sweeper)
+# ----------------------------------------------------
+
+class StockHoldTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.product = create_catalog(1, images_per_product=0)[0]  # stock=10
+        User = get_user_model()
+        self.alice, self.bob = User.objects.create_user(username='alice'), User.objects.create_user(username='bob')
+        self.alice_cart = Cart.objects.create(user=self.alice)
+        self.bob_cart = Cart.objects.create(user=self.bob)
+
+    def add(self, user, cart, quantity):
+        self.client.force_authenticate(user)
+        return self.client.post(f'/api/carts/{cart.pk}/items/', {'product': self.product.pk, 'quantity': quantity})
+
+    def test_add_to_cart_holds_stock_for_other_carts(self):
+        self.assertEqual(self.add(self.alice, self.alice_cart, 8).status_code, 201)
+        hold = StockHold.objects.get(cart=self.alice_cart)
+        self.assertEqual(hold.quantity, 8)
+        self.assertGreater(hold.expires_at, timezone.now())
+
+        response = self.add(self.bob, self.bob_cart, 3)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json(), {'error': 'მარაგი არასაკმარისია.', 'products': [self.product.pk]})
+        self.assertFalse(CartItem.objects.filter(cart=self.bob_cart).exists())
+        self.assertEqual(self.add(self.bob, self.bob_cart, 2).status_code, 201)
+
+        # ვადაგასული ჯავშანი აღარ ითვლება - sweeper-ის გაშვებამდეც
+        StockHold.objects.filter(cart=self.alice_cart).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.add(self.bob, self.bob_cart, 6).status_code, 201)
+        self.assertEqual(StockHold.objects.get(cart=self.bob_cart).quantity, 8)
+
+    def test_update_delete_and_bulk_adjust_holds(self):
+        self.add(self.alice, self.alice_cart, 2)
+        item = CartItem.objects.get(cart=self.alice_cart)
+        url = f'/api/carts/{self.alice_cart.pk}/items/'
+        self.assertEqual(self.client.patch(f'{url}{item.pk}/', {'quantity': 11}).status_code, 409)
+        self.assertEqual(self.client.patch(f'{url}{item.pk}/', {'quantity': 5}).status_code, 200)
+        self.assertEqual(StockHold.objects.get(cart=self.alice_cart).quantity, 5)
+
+        response = self.client.post(f'{url}bulk/', [{'product': self.product.pk, 'quantity': -3}], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(StockHold.objects.get(cart=self.alice_cart).quantity, 2)
+
+        self.assertEqual(self.client.delete(f'{url}{item.pk}/').status_code, 204)
+        self.assertFalse(StockHold.objects.exists())
+
+    def test_checkout_respects_other_holds_and_consumes_own(self):
+        self.add(self.alice, self.alice_cart, 8)
+        # hold-ის გარეშე დამატებული ხაზი (მაგ. ფუნქციის ჩართვამდე) - სხვისი ჯავშანი მაინც დაცულია
+        CartItem.objects.create(cart=self.bob_cart, product=self.product, quantity=3)
+        with self.assertRaises(InsufficientStock) as raised:
+            place_order(self.bob)
+        self.assertEqual(raised.exception.product_ids, [self.product.pk])
+
+        place_order(self.alice)
+        self.assertEqual(Product.objects.get(pk=self.product.pk).stock, 2)
+        self.assertFalse(StockHold.objects.filter(cart=self.alice_cart).exists())
+
+    def test_available_stock_is_one_indexed_aggregate(self):
+        from .reservations import available_stock
+
+        self.add(self.alice, self.alice_cart, 4)
+        self.add(self.bob, self.bob_cart, 1)
+        with CaptureQueriesContext(connection) as ctx:
+            available = available_stock([self.product.pk])
+        self.assertEqual(available, {self.product.pk: 5})
+        self.assertEqual(len(ctx.captured_queries), 1)
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + ctx.captured_queries[0]['sql'])
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('COVERING INDEX store_stockhold_active_idx', plan)
+        self.assertEqual(available_stock([self.product.pk], exclude_cart=self.alice_cart.pk), {self.product.pk: 9})
+
+        response = self.client.get('/api/products/availability/', {'ids': f'{self.product.pk},999999'})
+        self.assertEqual(response.json(), {'results': [{'id': self.product.pk, 'available': 5}]})
+        self.assertEqual(self.client.get('/api/products/availability/', {'ids': 'x'}).status_code, 400)
+
+    def test_sweeper_releases_only_expired_holds_in_batches(self):
+        from .tasks import release_expired_holds
+
+        products = Product.objects.bulk_create(
+            Product(category=self.product.category, name=f'Extra {n}', slug=f'extra-{n}', description='', price=1)
+            for n in range(5))
+        past, future = timezone.now() - timedelta(minutes=1), timezone.now() + timedelta(minutes=10)
+        StockHold.objects.bulk_create(
+            StockHold(cart=self.alice_cart, product=product, quantity=1, expires_at=past) for product in products)
+        StockHold.objects.create(cart=self.bob_cart, product=self.product, quantity=1, expires_at=future)
+        self.assertEqual(release_expired_holds(batch_size=2), 5)
+        self.assertEqual(list(StockHold.objects.values_list('cart_id', flat=True)), [self.bob_cart.pk])
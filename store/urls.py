@@ -3,7 +3,7 @@
 from django.urls import path, include
 # ✅ import-ს დავუმატეთ SimpleRouter და NestedDefaultRouter
 from rest_framework_nested.routers import NestedDefaultRouter, SimpleRouter
-from . import views
+from . import profiling, views
 
 # 1. მთავარი Router-ის ინიციალიზაცია
 router = SimpleRouter()
@@ -26,4 +26,26 @@ urlpatterns = [
     # 3. Category URL-ები (წაიშალა 'api/')
     path('categories/', views.CategoryListAPIView.as_view(), name='category-list'),
     path('categories/<int:id>/', views.CategoryDetailAPIView.as_view(), name='category-detail'),
-]
\ No newline at end of file
+
+    # 4. პროდუქტების სიის სწრაფი გზა (ProductListing)
+    path('catalog/listing/', views.ProductListingAPIView.as_view(), name='product-listing'),
+
+    # 5. კატალოგის ქეშის სტატისტიკა (ადმინი)
+    path('catalog/cache-stats/', views.CatalogCacheStatsAPIView.as_view(), name='catalog-cache-stats'),
+
+    # 6. Async (ASGI) ვერსიები - კატალოგი და კალათა (store.async_api)
+    path('async/products/', views.AsyncProductListView.as_view(), name='async-product-list'),
+    path('async/products/<int:pk>/', views.AsyncProductDetailView.as_view(), name='async-product-detail'),
+    path('async/categories/', views.AsyncCategoryListView.as_view(), name='async-category-list'),
+    path('async/carts/<int:pk>/', views.AsyncCartDetailView.as_view(), name='async-cart-detail'),
+
+    # 7. წარმადობის მეტრიკები (Prometheus) და ნელი/განმეორებული query-ები (ადმინი)
+    path('metrics/', profiling.metrics_view, name='metrics'),
+    path('metrics/slow-queries/', views.SlowQueryReportAPIView.as_view(), name='metrics-slow-queries'),
+
+    # 8. გაყიდვების ანალიტიკა (ადმინი, დღიური rollup-ებიდან)
+    path('analytics/top-products/', views.TopProductsAPIView.as_view(), name='analytics-top-products'),
+    path('analytics/revenue-by-category/', views.RevenueByCategoryAPIView.as_view(),
+         name='analytics-revenue-by-category'),
+    path('analytics/timeseries/', views.SalesTimeseriesAPIView.as_view(), name='analytics-timeseries'),
+]
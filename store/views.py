@@ -1,28 +1,65 @@
+import asyncio
+
 from django.shortcuts import render
 from rest_framework import generics, viewsets, mixins
+from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter, OrderingFilter
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import APIException
 
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db import transaction  # ✅ აუცილებელი იმპორტი Order-ის ლოგიკისთვის
-from decimal import Decimal  # ✅ აუცილებელი იმპორტი ფასის კალკულაციისთვის
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+
+from users.authentication import ADMIN_AUTHENTICATION_CLASSES
 
 # მოდელები
-from .models import Category, Product, Cart, Order, CartItem, OrderItem, ProductImage
+from .models import Category, Product, ProductListing, Cart, Order, CartItem, OrderItem, ProductImage, UserOrderStats
 # სერიალიზატორები
 from .serializers import CategorySerializer, ProductSerializer, CartSerializer, OrderSerializer, \
-    CartItemSerializer  # ✅ OrderItemSerializer-ის იმპორტი Order-ის გამოტანისთვის
+    CartItemSerializer, CartItemDeltaSerializer, OrderSummarySerializer, SalesReportQuerySerializer  # ✅ OrderItemSerializer-ის იმპორტი Order-ის გამოტანისთვის
+from .querysets import money_field, optimize_for_serializer
+from .pagination import KeysetCursorPagination, ListingCursorPagination
+from .search import FullTextSearchFilter
+from .checkout import place_order, CartNotFound, EmptyCart, InsufficientStock
+from .reservations import available_stock, cart_targets, release, reserve
+from .cache import CatalogCacheMixin, cache_stats
+from .conditional import ConditionalGetMixin
+from .catalog_io import FORMATS, export_rows, import_products, open_text, read_rows
+from .listing import render_page
+from .fastpath import FastListMixin, datetime_str, decimal_str
+from .facets import FacetedListMixin
+from .filters import ProductFilter
+from .routers import ReplicaReadMixin
+from .images import build_srcset
+from .async_api import AsyncAPIView, AsyncAuthenticatedAPIView
+from .profiling import recent_duplicates, recent_slow_queries
+from .analytics import revenue_by_category, sales_timeseries, top_products
+
+
+def product_images(product_ids):
+    return (ProductImage.objects.filter(product_id__in=product_ids).order_by('pk')
+            .values_list('product_id', 'image', 'variants'))
+
+
+def image_record(image, variants, build):
+    """ ProductImageSerializer / CategorySerializer-ის ['image', 'srcset'] """
+    return {'image': build(default_storage.url(image)) if image else None, 'srcset': build_srcset(variants, build)}
 
 
 # ----------------------------------------------------
 # 1. Category Views (ListCreateAPIView, RetrieveAPIView)
 # ----------------------------------------------------
 
-class CategoryListAPIView(generics.ListCreateAPIView):
+class CategoryListAPIView(ReplicaReadMixin, ConditionalGetMixin, CatalogCacheMixin, generics.ListCreateAPIView):
     """ კატეგორიების სიის ჩვენება და ახლის შექმნა """
+    cache_scope = 'categories'
     queryset = Category.objects.filter(is_active=True)
     serializer_class = CategorySerializer
     filter_backends = [SearchFilter, OrderingFilter]
@@ -30,8 +67,10 @@ class CategoryListAPIView(generics.ListCreateAPIView):
     ordering_fields = ['name', 'created_at']
 
 
-class CategoryDetailAPIView(generics.RetrieveAPIView):
+class CategoryDetailAPIView(ReplicaReadMixin, ConditionalGetMixin, CatalogCacheMixin, generics.RetrieveAPIView):
     """ კონკრეტული კატეგორიის დეტალების ჩვენება """
+    cache_scope = 'category'
+    cache_category_kwarg = 'id'
     queryset = Category.objects.filter(is_active=True)
     serializer_class = CategorySerializer
     lookup_field = 'id'
@@ -41,14 +80,121 @@ class CategoryDetailAPIView(generics.RetrieveAPIView):
 # 2. Product ViewSet (სრული CRUD)
 # ----------------------------------------------------
 
-class ProductViewSet(viewsets.ModelViewSet):
-    """ პროდუქტების სრული ViewSet-ი (CRUD - GET, POST, PUT, DELETE) """
+class ProductViewSet(ReplicaReadMixin, ConditionalGetMixin, CatalogCacheMixin, FacetedListMixin, FastListMixin,
+                     viewsets.ModelViewSet):
+    """ პროდუქტების სრული ViewSet-ი (CRUD - GET, POST, PUT, DELETE); ?facets=1 - facet-ების მრიცხველები """
+    cache_scope = 'products'
+    # category_name პასუხშია - კატეგორიის ცვლილებაც ETag-ს ცვლის
+    timestamp_fields = ('updated_at', 'category__updated_at')
     queryset = Product.objects.filter(is_available=True)
     serializer_class = ProductSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['category', 'color', 'material']
+    pagination_class = KeysetCursorPagination
+    # ?search= -> SQLite FTS5 (bm25 რანჟირება, prefix ძებნა); სხვა ბაზებზე - icontains
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
+    filterset_class = ProductFilter
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'price', 'created_at']
+    # სიის სწრაფი გზა (store.fastpath) - ProductSerializer-ის ველები იმავე რიგით
+    fast_fields = [
+        ('id', 'id', None), ('name', 'name', None), ('slug', 'slug', None),
+        ('category', 'category_id', None), ('category_name', 'category__name', None),
+        ('description', 'description', None), ('price', 'price', decimal_str), ('stock', 'stock', None),
+        ('is_available', 'is_available', None), ('featured', 'featured', None), ('color', 'color', None),
+        ('material', 'material', None), ('images', None, None),
+        ('created_at', 'created_at', datetime_str), ('updated_at', 'updated_at', datetime_str),
+    ]
+    fast_loaders = {'images': 'load_images'}
+
+    def load_images(self, parent_ids, request):
+        """ images: ProductImageSerializer-ის ['image', 'srcset'] ერთი query-ით """
+        images = {}
+        for product_id, image, variants in product_images(parent_ids):
+            images.setdefault(product_id, []).append(image_record(image, variants, request.build_absolute_uri))
+        return images
+
+    def get_queryset(self):
+        """JOIN/prefetch-ები გამოითვლება სერიალიზატორის (და ?fields=-ის) ველებიდან - N+1-ის გარეშე"""
+        serializer_class = self.get_serializer_class()
+        fields = serializer_class.requested_fields(self.request)
+        return optimize_for_serializer(super().get_queryset(), serializer_class, fields=fields)
+
+    @action(detail=False, methods=['get'], url_path='availability')
+    def availability(self, request):
+        """
+        GET /api/products/availability/?ids=1,2,3 - გასაყიდად ხელმისაწვდომი რაოდენობა
+        (stock - აქტიური ჯავშნები) ერთი query-ით; ქეშირდება არა - ჯავშნები წამებში იცვლება.
+        """
+        raw = [value.strip() for value in request.query_params.get('ids', '').split(',') if value.strip()]
+        if not raw or len(raw) > 100 or not all(value.isdigit() for value in raw):
+            return Response({"error": "ids - 1-დან 100-მდე რიცხვი მძიმით."}, status=status.HTTP_400_BAD_REQUEST)
+        available = available_stock({int(value) for value in raw})
+        return Response({'results': [{'id': pk, 'available': max(count, 0)} for pk, count in sorted(available.items())]})
+
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[IsAdminUser],
+            authentication_classes=ADMIN_AUTHENTICATION_CLASSES)
+    def import_products(self, request):
+        """ POST /api/products/import/ - CSV/JSONL ფაილის (file) მასიური upsert, შეცდომები ხაზების მიხედვით """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "ფაილი (file) აუცილებელია."}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.query_params.get('file_format') or ('jsonl' if upload.name.endswith('.jsonl') else 'csv')
+        if fmt not in FORMATS:
+            return Response({"error": f"ფორმატი უნდა იყოს: {', '.join(FORMATS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        report = import_products(read_rows(open_text(upload), fmt))
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[IsAdminUser],
+            authentication_classes=ADMIN_AUTHENTICATION_CLASSES)
+    def export_products(self, request):
+        """ GET /api/products/export/?file_format=csv|jsonl - ნაკადური ექსპორტი """
+        fmt = request.query_params.get('file_format', 'csv')
+        if fmt not in FORMATS:
+            return Response({"error": f"ფორმატი უნდა იყოს: {', '.join(FORMATS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        content_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+        response = StreamingHttpResponse(export_rows(fmt=fmt), content_type=f'{content_type}; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="products.{fmt}"'
+        return response
+
+
+class ProductListingAPIView(ReplicaReadMixin, generics.GenericAPIView):
+    """
+    GET /api/catalog/listing/?category=<id> - სიის სწრაფი გზა: ProductListing-ის წინასწარ
+    სერიალიზებული ბარათები პირდაპირ ერთდება (ერთი query, სერიალიზატორის გარეშე).
+    """
+    queryset = ProductListing.objects.filter(is_available=True)
+    pagination_class = ListingCursorPagination
+
+    def get(self, request):
+        queryset = self.get_queryset().only('product_id', 'created_at', 'payload')
+        category = request.query_params.get('category')
+        if category is not None:
+            if not category.isdigit():
+                return Response({"error": "category უნდა იყოს რიცხვი."}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(category_id=int(category))
+        page = self.paginate_queryset(queryset)
+        body = render_page([listing.payload for listing in page],
+                           self.paginator.get_next_link(), self.paginator.get_previous_link())
+        return HttpResponse(body, content_type='application/json')
+
+
+class CatalogCacheStatsAPIView(generics.GenericAPIView):
+    """ კატალოგის ქეშის hit/miss მრიცხველები (მხოლოდ ადმინისთვის) """
+    authentication_classes = ADMIN_AUTHENTICATION_CLASSES
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats())
+
+
+class SlowQueryReportAPIView(generics.GenericAPIView):
+    """ store.profiling-ის ბოლო ნელი query-ები (EXPLAIN-ით) და N+1 შემთხვევები (მხოლოდ ადმინისთვის) """
+    authentication_classes = ADMIN_AUTHENTICATION_CLASSES
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({'slow_queries': list(recent_slow_queries), 'duplicates': list(recent_duplicates)})
 
 
 # ----------------------------------------------------
@@ -61,17 +207,18 @@ class CartViewSet(viewsets.ModelViewSet):
     serializer_class = CartSerializer
 
     def get_queryset(self):
-        return Cart.objects.filter(user=self.request.user)
+        return Cart.objects.filter(user_id=self.request.user.pk).with_totals()
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.pk)
 
 
 # ----------------------------------------------------
 # 4. Order ViewSet (შეკვეთის შექმნის ლოგიკა) ✅ გამოსწორებულია!
 # ----------------------------------------------------
 
-class OrderViewSet(mixins.ListModelMixin,
+class OrderViewSet(FastListMixin,
+                   mixins.ListModelMixin,
                    mixins.RetrieveModelMixin,
                    mixins.CreateModelMixin,
                    viewsets.GenericViewSet):  # ვიყენებთ GenericViewSet + mixins-ს, რადგან Update/Delete არ გვჭირდება
@@ -81,107 +228,331 @@ class OrderViewSet(mixins.ListModelMixin,
     queryset = Order.objects.select_related('user').prefetch_related('items__product').all()
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetCursorPagination
+    # სიის სწრაფი გზა (store.fastpath) - OrderSerializer-ის ველები იმავე რიგით
+    fast_fields = [
+        ('id', 'id', None), ('user_username', 'user__username', None),
+        ('created_at', 'created_at', datetime_str), ('status', 'status', None),
+        ('total_price', 'total_price', decimal_str), ('items', None, None),
+    ]
+    fast_loaders = {'items': 'load_items'}
+
+    def load_items(self, parent_ids, request):
+        """ items: OrderItemSerializer-ის ველები; total_item_price Decimal რჩება (renderer-ი float-ად წერს) """
+        items = {}
+        rows = (OrderItem.objects.filter(order_id__in=parent_ids).order_by('pk')
+                .values_list('order_id', 'id', 'product_id', 'product__name', 'price', 'quantity'))
+        for order_id, item_id, product_id, product_name, price, quantity in rows:
+            items.setdefault(order_id, []).append({
+                'id': item_id, 'product': product_id, 'product_name': product_name,
+                'product_price': decimal_str(price), 'quantity': quantity, 'total_item_price': price * quantity,
+            })
+        return items
 
     def get_queryset(self):
         """ფილტრი: მომხმარებელს შეუძლია მხოლოდ საკუთარი შეკვეთების ნახვა"""
-        user = self.request.user
-        return Order.objects.filter(user=user).select_related('user').prefetch_related('items__product')
+        return (Order.objects.filter(user_id=self.request.user.pk)
+                .select_related('user').prefetch_related('items__product'))
 
     def create(self, request, *args, **kwargs):
         """
         ქმნის შეკვეთას მომხმარებლის ამჟამინდელი კალათის საფუძველზე.
+        მარაგი იჭრება პირობითი UPDATE-ით (იხ. store.checkout.place_order) - overselling-ის გარეშე.
         """
-        user = request.user
-
-        # 1. მომხმარებლის კალათის მიღება
         try:
-            cart = Cart.objects.prefetch_related('items__product').get(user=user)
-        except Cart.DoesNotExist:
+            order = place_order(request.user, shipping_address=request.data.get('shipping_address', ''))
+        except CartNotFound:
             return Response({"error": "კალათა ვერ მოიძებნა."},
                             status=status.HTTP_404_NOT_FOUND)
-
-        # 2. კალათაში არსებული ნივთების შემოწმება
-        if not cart.items.exists():
+        except EmptyCart:
             return Response({"error": "კალათა ცარიელია, შეკვეთა ვერ შეიქმნება."},
                             status=status.HTTP_400_BAD_REQUEST)
+        except InsufficientStock as exc:
+            return Response({"error": "მარაგი არასაკმარისია.", "products": exc.product_ids},
+                            status=status.HTTP_409_CONFLICT)
 
-            # store/views.py - OrderViewSet-ის create მეთოდში (საბოლოო ვერსია)
-
-            # 3. ტრანზაქციის დაწყება (თუ რამე შეცდომა მოხდა, ყველაფერი უკან დაბრუნდება)
-            with transaction.atomic():
-
-                # 4. შეკვეთის შექმნა (ჩავანაცვლეთ payment_status-ით status)
-                order = Order.objects.create(user=user, status='P')
-
-                order_items = []
-                total_price = Decimal(0)
-
-                for item in cart.items.all():
-                    # 5. OrderItem-ის შექმნა CartItem-ის საფუძველზე
-                    order_item = OrderItem(
-                        order=order,
-                        product=item.product,
-                        quantity=item.quantity,
-                        price=item.product.price
-                    )
-                    order_items.append(order_item)
-
-                    # 6. მთლიანი ფასის გამოთვლა
-                    total_price += item.product.price * item.quantity
-
-                    # 7. ✅ მარაგის განახლება (Stock Management) - გააქტიურებულია
-                    product = item.product
-                    product.stock -= item.quantity  # stock – მარაგის რაოდენობა
-                    product.save()  # შეინახავს პროდუქტს ახალი მარაგით
-
-                # 8. OrderItem-ების მასიური შენახვა
-                OrderItem.objects.bulk_create(order_items)
-
-                # ... (დანარჩენი ლოგიკა, როგორიცაა კალათის გასუფთავება) ...
-            # 9. Order-ის მთლიანი ფასის და სტატუსის განახლება
-            order.total_price = total_price
-            order.save()
-
-            # 10. კალათის დაცლა
-            cart.items.all().delete()
-
-            # 11. პასუხის დაბრუნება
+        # პასუხისთვის შეკვეთა prefetch-ით (მუდმივი რაოდენობის query)
+        order = self.get_queryset().get(pk=order.pk)
         serializer = self.get_serializer(order)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['get'], url_path='summary')
+    def summary(self, request):
+        """
+        შეკვეთების ისტორიის შეჯამება UserOrderStats-იდან - ერთი ჩანაწერი pk-ით, შეკვეთების
+        რაოდენობის მიუხედავად. შეკვეთების გარეშე მომხმარებელს ნულები უბრუნდება.
+        """
+        stats = UserOrderStats.objects.filter(user_id=request.user.pk).first() \
+            or UserOrderStats(user_id=request.user.pk)
+        return Response(OrderSummarySerializer(stats).data)
+
 
 # ----------------------------------------------------
 # 5. Cart Item ViewSet (Nested Route)
 # ----------------------------------------------------
 
+class StockConflict(APIException):
+    """ 409 - იგივე ფორმა, რაც checkout-ის InsufficientStock-ს: {"error": ..., "products": [...]} """
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'მარაგი არასაკმარისია.'
+
+    def __init__(self, product_ids):
+        super().__init__()
+        # APIException detail-ს სტრიქონებად აქცევს - id-ები რიცხვებად რჩება
+        self.detail = {"error": self.default_detail, "products": product_ids}
+
+
 class CartItemViewSet(mixins.CreateModelMixin,
                       mixins.RetrieveModelMixin,
                       mixins.UpdateModelMixin,
                       mixins.DestroyModelMixin,
                       mixins.ListModelMixin,
                       GenericViewSet):
+    """
+    კალათის ხაზები; რაოდენობის ყოველი ზრდა მარაგს დროებით ჯავშნის (store.reservations) -
+    სხვა კალათების აქტიური ჯავშნების გამო მარაგი თუ არ ყოფნის, პასუხი 409-ია და კალათა არ იცვლება.
+    """
     permission_classes = [IsAuthenticated]
     serializer_class = CartItemSerializer
 
     # ფილტრავს მხოლოდ მიმდინარე კალათის შიგთავსს URL-ის მიხედვით
     def get_queryset(self):
         cart_id = self.kwargs.get('cart_pk')
-        return CartItem.objects.filter(cart_id=cart_id)
+        return CartItem.objects.filter(cart_id=cart_id).with_subtotals()
+
+    def apply_with_holds(self, cart_id, deltas):
+        """ ჯავშანი + კალათის ცვლილება ერთ ტრანზაქციაში """
+        with transaction.atomic():
+            short = reserve(cart_id, cart_targets(cart_id, deltas))
+            if short:
+                raise StockConflict(short)
+            CartItem.objects.apply_deltas(cart_id, deltas)
 
     # ლოგიკა: პროდუქტის დამატება/განახლება
     def perform_create(self, serializer):
         cart_id = self.kwargs.get('cart_pk')
-        product_id = serializer.validated_data.get('product')
-        quantity = serializer.validated_data.get('quantity')
+        product = serializer.validated_data.get('product')
+        quantity = serializer.validated_data.get('quantity', 1)
+
+        # ერთი upsert (ON CONFLICT ... quantity = quantity + N) - get/save-ის race-ის გარეშე
+        self.apply_with_holds(cart_id, {product.pk: quantity})
+        serializer.instance = self.get_queryset().get(product=product)
+
+    def perform_update(self, serializer):
+        item = serializer.instance
+        product = serializer.validated_data.get('product', item.product)
+        quantity = serializer.validated_data.get('quantity', item.quantity)
+        with transaction.atomic():
+            targets = {product.pk: quantity}
+            if product.pk != item.product_id:
+                targets[item.product_id] = 0
+            short = reserve(item.cart_id, targets)
+            if short:
+                raise StockConflict(short)
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            release(instance.cart_id, [instance.product_id])
+            instance.delete()
+
+    # POST /api/carts/{cart_pk}/items/bulk/ - [{product, quantity}, ...]
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, cart_pk=None):
+        """ რამდენიმე პროდუქტის დამატება/შემცირება ერთ მოთხოვნაში; აბრუნებს განახლებულ კალათას """
+        carts = Cart.objects.filter(pk=cart_pk, user_id=request.user.pk)
+        if not carts.exists():
+            return Response({"error": "კალათა ვერ მოიძებნა."}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = CartItemDeltaSerializer(data=request.data, many=True, allow_empty=False)
+        serializer.is_valid(raise_exception=True)
+        self.apply_with_holds(cart_pk, serializer.validated_data)
+
+        cart = carts.with_totals().get()
+        return Response(CartSerializer(cart, context=self.get_serializer_context()).data)
 
-        # ვცდილობთ მოვძებნოთ უკვე არსებული CartItem ამ პროდუქტით
-        try:
-            cart_item = CartItem.objects.get(cart_id=cart_id, product=product_id)
-            # თუ არსებობს, ვზრდით რაოდენობას
-            cart_item.quantity += quantity
-            cart_item.save()
-            # ვაბრუნებთ განახლებულ ობიექტს
-            serializer.instance = cart_item
-        except CartItem.DoesNotExist:
-            # თუ არ არსებობს, ვქმნით ახალ CartItem-ს
-            serializer.save(cart_id=cart_id)
\ No newline at end of file
+# ----------------------------------------------------
+# 6. Async (ASGI) Views - კატალოგი და კალათა
+# ----------------------------------------------------
+
+def _ordering(request, allowed, default):
+    """ ?ordering=-price,name (OrderingFilter-ის მსგავსად, უცნობი ველები იგნორირდება) """
+    terms = [term.strip() for term in request.query_params.get('ordering', '').split(',')]
+    terms = [term for term in terms if term and term.lstrip('-') in allowed]
+    return terms or default
+
+
+def _product_fields(request):
+    """ ProductViewSet.fast_fields, ?fields=-ით შეზღუდული """
+    requested = ProductSerializer.requested_fields(request)
+    return [field for field in ProductViewSet.fast_fields if requested is None or field[0] in requested]
+
+
+class AsyncProductListView(AsyncAPIView):
+    """
+    GET /api/async/products/ - ProductViewSet.list-ის async ვარიანტი (values() + keyset პაგინაცია,
+    ?category= / ?color= / ?material= / ?ordering= / ?fields=). პასუხი ბაიტ-იდენტურია;
+    FTS ძებნა (?search=) მხოლოდ სინქრონულ endpoint-ზეა.
+    """
+    pagination_class = KeysetCursorPagination
+
+    async def get(self, request):
+        queryset = Product.objects.filter(is_available=True)
+        category = request.query_params.get('category')
+        if category:
+            if not category.isdigit():
+                return self.render({"error": "category უნდა იყოს რიცხვი."}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(category_id=int(category))
+        for name in ('color', 'material'):
+            if request.query_params.get(name):
+                queryset = queryset.filter(**{name: request.query_params[name]})
+        queryset = queryset.order_by(*_ordering(request, ProductViewSet.ordering_fields, Product._meta.ordering))
+
+        fields = _product_fields(request)
+        paginator = self.pagination_class()
+        columns = ['id'] + [lookup for _, lookup, _ in fields if lookup]
+        columns += [name.lstrip('-') for name in paginator.get_ordering(queryset)]
+        rows = await paginator.apaginate_queryset(queryset.values(*dict.fromkeys(columns)), request)
+
+        images = {}
+        if rows and any(name == 'images' for name, _, _ in fields):
+            async for product_id, image, variants in product_images([row['id'] for row in rows]):
+                images.setdefault(product_id, []).append(image_record(image, variants, request.build_absolute_uri))
+        return self.render({
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'results': [_product_record(row, fields, images.get(row['id'], [])) for row in rows],
+        })
+
+
+class AsyncProductDetailView(AsyncAPIView):
+    """
+    GET /api/async/products/<pk>/ - პროდუქტი, კატეგორიის სახელი და სურათები სამი დამოუკიდებელი
+    query-ით, asyncio.gather-ით ერთდროულად (JOIN-ის და prefetch-ის ნაცვლად).
+    """
+
+    async def get(self, request, pk):
+        fields = _product_fields(request)
+        columns = ['id'] + [lookup for _, lookup, _ in fields if lookup and lookup != 'category__name']
+        product, category_name, images = await asyncio.gather(
+            Product.objects.filter(pk=pk, is_available=True).values(*dict.fromkeys(columns)).afirst(),
+            Category.objects.filter(products__pk=pk).values_list('name', flat=True).afirst(),
+            self.images(request, pk),
+        )
+        if product is None:
+            raise Http404('No Product matches the given query.')
+        product['category__name'] = category_name
+        return self.render(_product_record(product, fields, images))
+
+    @staticmethod
+    async def images(request, pk):
+        return [image_record(image, variants, request.build_absolute_uri)
+                async for _, image, variants in product_images([pk])]
+
+
+def _product_record(row, fields, images):
+    record = {}
+    for name, lookup, convert in fields:
+        if lookup is None:
+            record[name] = images
+            continue
+        value = row[lookup]
+        record[name] = convert(value) if convert is not None and value is not None else value
+    return record
+
+
+class AsyncCategoryListView(AsyncAPIView):
+    """ GET /api/async/categories/ - CategoryListAPIView-ის async ვარიანტი (?search=, ?ordering=) """
+
+    async def get(self, request):
+        queryset = Category.objects.filter(is_active=True)
+        for term in request.query_params.get('search', '').replace(',', ' ').split():
+            queryset = queryset.filter(Q(name__icontains=term) | Q(description__icontains=term))
+        queryset = queryset.order_by(*_ordering(request, CategoryListAPIView.ordering_fields, Category._meta.ordering))
+        build = request.build_absolute_uri
+        return self.render([
+            {
+                'id': category['id'], 'name': category['name'], 'slug': category['slug'],
+                'description': category['description'],
+                **image_record(category['image'], category['variants'], build),
+                'is_active': category['is_active'], 'created_at': datetime_str(category['created_at']),
+            }
+            async for category in queryset.values('id', 'name', 'slug', 'description', 'image', 'variants',
+                                                  'is_active', 'created_at')
+        ])
+
+
+class AsyncCartDetailView(AsyncAuthenticatedAPIView):
+    """
+    GET /api/async/carts/<pk>/ - CartViewSet.retrieve-ის async ვარიანტი: კალათა, ნივთები და
+    ჯამი (aaggregate) ერთდროულად; სხვისი კალათა - 404.
+    """
+
+    async def get(self, request, pk):
+        carts = Cart.objects.filter(pk=pk, user_id=request.user.pk)
+        cart, items, totals = await asyncio.gather(
+            carts.values('id', 'user_id', 'created_at').afirst(),
+            self.items(carts),
+            CartItem.objects.filter(cart__in=carts).aaggregate(
+                total=Coalesce(Sum(F('quantity') * F('product__price'), output_field=money_field()),
+                               Value(0), output_field=money_field())),
+        )
+        if cart is None:
+            raise Http404('No Cart matches the given query.')
+        return self.render({
+            'id': cart['id'], 'user': cart['user_id'], 'created_at': datetime_str(cart['created_at']),
+            'items': items, 'total_cart_price': totals['total'],
+        })
+
+    @staticmethod
+    async def items(carts):
+        rows = (CartItem.objects.filter(cart__in=carts).order_by('pk')
+                .values_list('id', 'product_id', 'product__name', 'product__price', 'quantity'))
+        return [
+            {'id': item_id, 'product': product_id, 'product_name': name, 'product_price': decimal_str(price),
+             'quantity': quantity, 'total_item_price': price * quantity}
+            async for item_id, product_id, name, price, quantity in rows
+        ]
+
+
+# ----------------------------------------------------
+# 7. გაყიდვების ანალიტიკა (მხოლოდ ადმინი, SalesRollup-იდან)
+# ----------------------------------------------------
+
+class SalesReportAPIView(generics.GenericAPIView):
+    """
+    საერთო: ?start=&end= (YYYY-MM-DD, ჩათვლით) ვალიდაცია და პასუხის ფორმა. ანგარიში მხოლოდ
+    დღიურ bucket-ებს კითხულობს (store.analytics) - OrderItem-ის ისტორია არ სკანირდება.
+    report - store.analytics-ის ფუნქცია (start, end, **report_params).
+    """
+    authentication_classes = ADMIN_AUTHENTICATION_CLASSES
+    permission_classes = [IsAdminUser]
+    report = None
+    report_params = ()
+
+    def get(self, request):
+        assert self.report is not None, f"'{self.__class__.__name__}' should set the `report` attribute."
+        query = SalesReportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        options = {name: params[name] for name in self.report_params if name in params}
+        rows = self.report(params['start'], params['end'], **options)
+        for row in rows:
+            row['revenue'] = decimal_str(row['revenue'])
+        return Response({'start': params['start'], 'end': params['end'], 'results': rows})
+
+
+class TopProductsAPIView(SalesReportAPIView):
+    """ top-N პროდუქტი: ?limit=10&metric=revenue|quantity """
+    report = staticmethod(top_products)
+    report_params = ('limit', 'metric')
+
+
+class RevenueByCategoryAPIView(SalesReportAPIView):
+    report = staticmethod(revenue_by_category)
+
+
+class SalesTimeseriesAPIView(SalesReportAPIView):
+    """ ?interval=day|week|month, არასავალდებულო ?product= ან ?category= """
+    report = staticmethod(sales_timeseries)
+    report_params = ('interval', 'product', 'category')
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+
+from .models import CustomUser
+
+
+# ----------------------------------------------------
+# 1. სრული პროფილის მოკლევადიანი ქეში
+# ----------------------------------------------------
+
+PROFILE_KEY = 'users:profile:{}'
+
+
+def get_cache():
+    return caches[getattr(settings, 'USER_PROFILE_CACHE_ALIAS', 'default')]
+
+
+def get_profile(user_id):
+    """ CustomUser ქეშიდან (USER_PROFILE_CACHE_TIMEOUT წამი), წინააღმდეგ შემთხვევაში - ერთი query """
+    cache = get_cache()
+    key = PROFILE_KEY.format(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = CustomUser.objects.filter(pk=user_id, is_active=True).first()
+        if user is not None:
+            cache.set(key, user, timeout=getattr(settings, 'USER_PROFILE_CACHE_TIMEOUT', 60))
+    return user
+
+
+def invalidate_profile(user_id):
+    get_cache().delete(PROFILE_KEY.format(user_id))
+
+
+# ----------------------------------------------------
+# 2. Stateless ავტორიზაცია (მომხმარებელი ტოკენის claim-ებიდან)
+# ----------------------------------------------------
+
+class ClaimsTokenUser(TokenUser):
+    """
+    SIMPLE_JWT['TOKEN_USER_CLASS'] - JWTStatelessUserAuthentication ყოველ მოთხოვნაზე CustomUser-ს აღარ კითხულობს.
+    id / username / is_staff - ტოკენიდან (users.tokens.ClaimsRefreshToken); ნებისმიერი სხვა ატრიბუტი
+    (email, phone, ...) - CustomUser-იდან get_profile()-ით, მხოლოდ საჭიროებისას.
+    ტოკენი ვადის ამოწურვამდე (ACCESS_TOKEN_LIFETIME) მოქმედია დეაქტივირებულ მომხმარებელზეც.
+    """
+
+    @cached_property
+    def username(self):
+        return self.token['username'] if 'username' in self.token else self.profile_attr('username')
+
+    @cached_property
+    def is_staff(self):
+        # claim-ების გარეშე გაცემული (ძველი) ტოკენები - პროფილიდან
+        return self.token['is_staff'] if 'is_staff' in self.token else self.profile_attr('is_staff')
+
+    @cached_property
+    def profile(self):
+        return get_profile(self.id)
+
+    def profile_attr(self, attr):
+        profile = self.profile
+        if profile is None:
+            # მომხმარებელი წაშლილი ან დეაქტივირებულია - NoneType-ის შეცდომის ნაცვლად
+            raise AttributeError(attr)
+        return getattr(profile, attr)
+
+    def __str__(self):
+        return self.username
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return self.profile_attr(attr)
+
+
+# ----------------------------------------------------
+# 3. ადმინის endpoint-ები (მომხმარებელი ბაზიდან)
+# ----------------------------------------------------
+
+# ClaimsTokenUser-ის is_staff ტოკენშია - ჩამორთმეული უფლება ACCESS_TOKEN_LIFETIME-მდე ძალაში
+# დარჩებოდა. IsAdminUser-იანი view-ები მომხმარებელს (is_staff, is_active) ყოველ მოთხოვნაზე ბაზიდან კითხულობენ.
+ADMIN_AUTHENTICATION_CLASSES = [JWTAuthentication]
+
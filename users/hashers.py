@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.contrib.auth.hashers import ScryptPasswordHasher
+
+
+# ----------------------------------------------------
+# scrypt პარამეტრები settings-იდან
+# ----------------------------------------------------
+
+class TunableScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    Django-ს scrypt (N=2^14, r=8, p=5) ~5-ჯერ ითვლის ერთსა და იმავე მეხსიერებაზე. აქ ნაგულისხმევია
+    N=2^15, r=8, p=1 (32 MiB, მეხსიერებით უფრო მძიმე და CPU-თი ~2-ჯერ იაფი).
+    პარამეტრები ჰეშშია ჩაწერილი, ამიტომ მათი შეცვლისას ძველი ჰეშები შესვლისას ავტომატურად გადაიჰეშება.
+    """
+
+    @property
+    def work_factor(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_WORK_FACTOR', 2 ** 15)
+
+    @property
+    def block_size(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_BLOCK_SIZE', 8)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_PARALLELISM', 1)
+
+    @property
+    def maxmem(self):
+        # OpenSSL-ის ნაგულისხმევი ლიმიტი (32 MiB) N=2^15-ს არ ატევს
+        return 256 * self.work_factor * self.block_size * self.parallelism
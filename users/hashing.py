@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+from .models import CustomUser
+
+
+# ----------------------------------------------------
+# 1. შეზღუდული hashing pool
+# ----------------------------------------------------
+
+class HashingBusy(Exception):
+    """ pool-ი და რიგი სავსეა ან ჰეშირებამ დრო ამოწურა - მოთხოვნა 503-ით ბრუნდება """
+
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+def _get_pool():
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            workers = getattr(settings, 'PASSWORD_HASH_WORKERS', 2)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+            # შესრულებადი + რიგში მდგომი ამოცანები; ზედმეტი მაშინვე უარყოფილია
+            _slots = threading.BoundedSemaphore(workers + getattr(settings, 'PASSWORD_HASH_QUEUE', 8))
+    return _executor, _slots
+
+
+def run_hashing(func, *args):
+    """
+    scrypt/argon2/PBKDF2 GIL-ს ათავისუფლებს, ამიტომ ნაკადების pool საკმარისია: ერთდროულად
+    მაქსიმუმ PASSWORD_HASH_WORKERS ბირთვი იწვის ჰეშირებაზე და კატალოგის მოთხოვნებს CPU რჩებათ.
+    """
+    executor, slots = _get_pool()
+    if not slots.acquire(blocking=False):
+        raise HashingBusy()
+    try:
+        future = executor.submit(func, *args)
+    except BaseException:
+        slots.release()
+        raise
+    # სლოტი თავისუფლდება ამოცანის დასრულებისას (timeout-ის შემდეგაც კი ის pool-ს იკავებს)
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=getattr(settings, 'PASSWORD_HASH_TIMEOUT', 5))
+    except FutureTimeout:
+        raise HashingBusy()
+
+
+# ----------------------------------------------------
+# 2. ავტორიზაცია და რეგისტრაცია pool-ის გავლით
+# ----------------------------------------------------
+
+def hash_password(raw_password):
+    return run_hashing(make_password, raw_password)
+
+
+def authenticate_credentials(username, password):
+    """
+    ModelBackend.authenticate-ის ეკვივალენტი: მომხმარებლის SELECT მოთხოვნის ნაკადში, შემოწმება pool-ში.
+    PASSWORD_HASHERS-ის პირველ hasher-ზე (Argon2/scrypt) გადაჰეშვა შესვლისას ხდება - Django-ს
+    check_password(setter)-ის მსგავსად, ოღონდ ჰეში pool-ში ითვლება და შენახვა აქ.
+    """
+    user = CustomUser._default_manager.filter(**{CustomUser.USERNAME_FIELD: username}).first()
+    if user is None:
+        # არარსებული მომხმარებელი - იგივე დრო, რომ username-ების გამოცნობა არ მოხდეს
+        hash_password(password)
+        return None
+
+    is_correct, must_update = run_hashing(verify_password, password, user.password)
+    if not is_correct or not user.is_active:
+        return None
+    if must_update:
+        user.password = hash_password(password)
+        user.save(update_fields=['password'])
+    return user
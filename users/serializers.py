@@ -2,6 +2,7 @@
 
 from rest_framework import serializers
 from .models import CustomUser
+from .hashing import hash_password
 
 # ----------------------------------------------------
 # CustomUser-ის სერიალიზატორი (რეგისტრაციისთვის)
@@ -26,14 +27,16 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return data
 
     def create(self, validated_data):
-        user = CustomUser.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=validated_data['password'],
+        # ჰეში შეზღუდულ pool-ში (users.hashing) - create_user()-ის make_password მოთხოვნის ნაკადს აღარ იკავებს
+        user = CustomUser(
+            username=CustomUser.normalize_username(validated_data['username']),
+            email=CustomUser.objects.normalize_email(validated_data['email']),
             first_name=validated_data.get('first_name', ''),
             last_name=validated_data.get('last_name', ''),
             phone=validated_data.get('phone', ''),
             address=validated_data.get('address', ''),
             birth_date=validated_data.get('birth_date', None)
         )
-        return user
\ No newline at end of file
+        user.password = hash_password(validated_data['password'])
+        user.save()
+        return user
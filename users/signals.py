@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_profile
+from .models import CustomUser
+
+
+# ----------------------------------------------------
+# პროფილის ქეშის ინვალიდაცია
+# ----------------------------------------------------
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    invalidate_profile(instance.pk)
@@ -1,3 +1,171 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
-# Create your tests here.
+from .authentication import ClaimsTokenUser
+from .models import CustomUser
+from .tokens import ClaimsRefreshToken
+
+
+# ----------------------------------------------------
+# 1. Stateless JWT (ClaimsTokenUser)
+# ----------------------------------------------------
+
+class ClaimsTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create(username='nino', email='nino@example.com', is_staff=True)
+        self.client = APIClient()
+
+    def authenticate(self, token_class=ClaimsRefreshToken):
+        access = token_class.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return access
+
+    def test_access_token_carries_profile_claims(self):
+        access = self.authenticate()
+        self.assertEqual((access['username'], access['is_staff']), ('nino', True))
+
+    def test_cart_and_order_requests_skip_user_lookup(self):
+        self.authenticate()
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get('/api/carts/').status_code, 200)
+            self.assertEqual(self.client.get('/api/orders/').status_code, 200)
+        self.assertFalse([q for q in ctx.captured_queries
+                          if 'users_customuser' in q['sql'] and 'JOIN' not in q['sql']])
+        self.assertEqual(self.client.post('/api/carts/').status_code, 201)
+        self.assertTrue(self.user.cart)
+
+    def test_admin_endpoints_check_staff_in_database(self):
+        self.authenticate()
+        for path in ('/api/catalog/cache-stats/', '/api/analytics/top-products/', '/api/products/export/'):
+            self.assertEqual(self.client.get(path).status_code, 200, path)
+        # ტოკენში is_staff=True რჩება, ბაზაში კი უფლება უკვე ჩამორთმეულია
+        self.user.is_staff = False
+        self.user.save()
+        for path in ('/api/catalog/cache-stats/', '/api/analytics/top-products/', '/api/products/export/'):
+            self.assertEqual(self.client.get(path).status_code, 403, path)
+
+    def test_missing_profile_raises_attribute_error(self):
+        token_user = ClaimsTokenUser(AccessToken.for_user(self.user))
+        self.user.delete()
+        with self.assertRaisesMessage(AttributeError, 'email'):
+            token_user.email
+        self.assertFalse(hasattr(token_user, 'phone'))
+
+    def test_profile_attributes_are_loaded_once_and_invalidated_on_save(self):
+        token_user = ClaimsTokenUser(AccessToken.for_user(self.user))
+        with self.assertNumQueries(1):
+            self.assertEqual(token_user.email, 'nino@example.com')
+            self.assertEqual(ClaimsTokenUser(AccessToken.for_user(self.user)).email, 'nino@example.com')
+        self.user.email = 'new@example.com'
+        self.user.save()
+        self.assertEqual(ClaimsTokenUser(AccessToken.for_user(self.user)).email, 'new@example.com')
+
+    def test_tokens_without_claims_fall_back_to_profile(self):
+        token_user = ClaimsTokenUser(RefreshToken.for_user(self.user).access_token)
+        self.assertEqual((token_user.username, token_user.is_staff), ('nino', True))
+
+
+# ----------------------------------------------------
+# 2. Login pipeline (hashing pool, rehash, throttling)
+# ----------------------------------------------------
+
+# ტესტებში იაფი scrypt - ლოგიკა იგივეა, პარამეტრები ჰეშშია
+@override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2 ** 10)
+class LoginPipelineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def create_legacy_user(self, username='giorgi', password='secret-pass'):
+        from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+        legacy = PBKDF2PasswordHasher().encode(password, 'legacysalt', iterations=1000)
+        return CustomUser.objects.create(username=username, email=f'{username}@example.com', password=legacy)
+
+    def login(self, username='giorgi', password='secret-pass', **extra):
+        return self.client.post('/api/login/', {'username': username, 'password': password}, **extra)
+
+    def test_login_rehashes_legacy_password_to_preferred_hasher(self):
+        from django.contrib.auth.hashers import get_hasher
+
+        user = self.create_legacy_user()
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user_id'], user.pk)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith(get_hasher().algorithm + '$'))
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(self.login(password='wrong').status_code, 401)
+
+    def test_registration_hashes_with_preferred_hasher(self):
+        from django.contrib.auth.hashers import get_hasher
+
+        response = self.client.post('/api/register/', {'username': 'ana', 'email': 'Ana@Example.COM',
+                                                        'password': 'long-password'})
+        self.assertEqual(response.status_code, 201)
+        user = CustomUser.objects.get(username='ana')
+        self.assertTrue(user.password.startswith(get_hasher().algorithm + '$'))
+        self.assertEqual(user.email, 'Ana@example.com')
+        self.assertEqual(self.login('ana', 'long-password').status_code, 200)
+
+    def test_username_throttle_sheds_attempts_before_hashing(self):
+        from unittest import mock
+
+        self.create_legacy_user()
+        for _ in range(5):
+            self.assertEqual(self.login(password='wrong').status_code, 401)
+        with mock.patch('users.views.authenticate_credentials') as authenticate:
+            response = self.login(password='wrong', REMOTE_ADDR='10.0.0.9')
+        self.assertEqual(response.status_code, 429)
+        authenticate.assert_not_called()
+        # სხვა ანგარიში იმავე IP-დან ჯერ კიდევ დაშვებულია
+        self.assertEqual(self.login(username='other').status_code, 401)
+
+    def test_ip_throttle_limits_credential_spraying(self):
+        for n in range(20):
+            self.assertEqual(self.login(username=f'user{n}').status_code, 401)
+        self.assertEqual(self.login(username='user-next').status_code, 429)
+
+    def test_full_hashing_pool_returns_503(self):
+        from unittest import mock
+
+        from .hashing import HashingBusy
+
+        self.create_legacy_user()
+        with mock.patch('users.hashing.run_hashing', side_effect=HashingBusy):
+            response = self.login()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_pool_rejects_when_slots_are_exhausted(self):
+        import threading
+
+        from . import hashing
+        from .hashing import HashingBusy, run_hashing
+
+        started, release = threading.Event(), threading.Event()
+
+        def slow_hash():
+            started.set()
+            release.wait()
+
+        with override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=0):
+            hashing._executor = hashing._slots = None
+            try:
+                blocker = threading.Thread(target=run_hashing, args=(slow_hash,))
+                blocker.start()
+                started.wait()
+                with self.assertRaises(HashingBusy):
+                    run_hashing(len, 'x')
+                release.set()
+                blocker.join()
+                self.assertEqual(run_hashing(len, 'xy'), 2)
+            finally:
+                release.set()
+                hashing._executor.shutdown(wait=True)
+                hashing._executor = hashing._slots = None
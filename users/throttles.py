@@ -0,0 +1,28 @@
+from rest_framework.throttling import AnonRateThrottle, SimpleRateThrottle
+
+
+# ----------------------------------------------------
+# Login/რეგისტრაციის throttling (ჰეშირებამდე, ქეშის მრიცხველებით)
+# ----------------------------------------------------
+
+class LoginIPThrottle(AnonRateThrottle):
+    """ მცდელობები ერთი IP-დან (X-Forwarded-For - NUM_PROXIES-ის მიხედვით) """
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginUsernameThrottle(SimpleRateThrottle):
+    """ მცდელობები ერთ ანგარიშზე - IP-ების როტაციით brute-force-იც ჩერდება """
+    scope = 'login_username'
+
+    def get_cache_key(self, request, view):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not username:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': str(username).strip().lower()}
+
+
+class RegisterIPThrottle(LoginIPThrottle):
+    scope = 'register_ip'
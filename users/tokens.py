@@ -0,0 +1,18 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+# ----------------------------------------------------
+# JWT ტოკენი მომხმარებლის claim-ებით
+# ----------------------------------------------------
+
+# access ტოკენი refresh-ის claim-ებს აკოპირებს - ClaimsTokenUser მათ ბაზის გარეშე კითხულობს
+PROFILE_CLAIMS = ('username', 'is_staff')
+
+
+class ClaimsRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in PROFILE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
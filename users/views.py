@@ -2,11 +2,18 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from django.contrib.auth import authenticate
 from .serializers import UserRegistrationSerializer
 from .models import CustomUser
+from .tokens import ClaimsRefreshToken
+from .hashing import HashingBusy, authenticate_credentials
+from .throttles import LoginIPThrottle, LoginUsernameThrottle, RegisterIPThrottle
+
+
+def hashing_busy_response():
+    # ჰეშირების pool-ი გადატვირთულია - კლიენტმა მოგვიანებით სცადოს
+    return Response({'error': 'Server is busy, please retry.'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '1'})
 
 
 # ----------------------------------------------------
@@ -14,14 +21,18 @@ from .models import CustomUser
 # ----------------------------------------------------
 class RegisterAPIView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [RegisterIPThrottle]
 
     def post(self, request):
         serializer = UserRegistrationSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.save()
+            try:
+                user = serializer.save()
+            except HashingBusy:
+                return hashing_busy_response()
 
             # ავტომატური ავტორიზაცია (JWT ტოკენების გენერაცია)
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             return Response({
                 'message': 'Registration successful. User created.',
                 'refresh': str(refresh),
@@ -37,15 +48,23 @@ class RegisterAPIView(APIView):
 # ----------------------------------------------------
 class LoginAPIView(APIView):
     permission_classes = [AllowAny]
+    # throttle-ები initial()-ში მოწმდება - ზედმეტი მცდელობა ჰეშირებამდე ჩერდება (429)
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
 
     def post(self, request):
         username = request.data.get('username')
         password = request.data.get('password')
+        if not username or not password:
+            return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
-        user = authenticate(username=username, password=password)
+        # პაროლის შემოწმება შეზღუდულ hashing pool-ში (users.hashing)
+        try:
+            user = authenticate_credentials(username, password)
+        except HashingBusy:
+            return hashing_busy_response()
 
         if user is not None:
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             return Response({
                 'message': 'Login successful.',
                 'refresh': str(refresh),